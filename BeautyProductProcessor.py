@@ -68,8 +68,11 @@ class BeautyProductProcessor(ProductProcessor):
     P50_CLOSENESS_MATCH_SCORE = 0.11
     P33_CLOSENESS_MATCH_SCORE = 0.06
 
-    def __init__(self):
+    def __init__(self, early_exit=False):
         """
         Initialize the base `ProductProcessor` with beauty-specific weights.
+
+        Args:
+            early_exit (bool): Passed through to `ProductProcessor`.
         """
-        super().__init__()
+        super().__init__(early_exit)
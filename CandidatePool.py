@@ -0,0 +1,168 @@
+"""
+Array-backed candidate pool for item-level price/score estimation.
+
+`CandidatePool` holds an item's candidate products as parallel NumPy arrays
+(`total_price`, `postage_price`, `buy_price`, `accuracy_score`) so that the
+threshold sweep in `ItemProcessor.set_item_info` can work on index arrays
+instead of re-filtering, re-sorting and patching lists of `Product` objects.
+
+Rows `0 .. size-1` are the item's products, in `item.products` order. Synthetic
+"temp" anchor products created by `ItemCalculator.calculate_price_and_score_pool`
+are appended as extra rows and never written back. Working sets are index arrays
+into the pool; a product that appears several times in a working set is simply a
+repeated index.
+
+Prices patched during the sweep are copied back onto the products with
+`write_back`, so callers see exactly what the list-based functions would have left
+behind.
+"""
+
+import numpy as np
+
+
+def round_prices(values):
+    """
+    Vectorized `round(value, 2)` that matches Python's rounding exactly.
+
+    `np.rint(values * 100) / 100` already produces the same float as `round` for the
+    chosen cent; the two can only disagree on which cent to pick when `values * 100`
+    lies within float error of a half cent, so those rare entries are re-rounded
+    with Python's `round`.
+    """
+    scaled = values * 100
+    rounded = np.rint(scaled) / 100
+    near_half = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6
+    for index in np.flatnonzero(near_half):
+        rounded[index] = round(float(values[index]), 2)
+    return rounded
+
+
+class CandidatePool:
+
+    def __init__(self, products):
+        self.products = products
+        self.size = len(products)
+        self.total_price = np.array([p.total_price for p in products], dtype=float)
+        self.postage_price = np.array([p.postage_price for p in products], dtype=float)
+        self.buy_price = np.array([p.buy_price for p in products], dtype=float)
+        self.accuracy_score = np.array([p.accuracy_score for p in products], dtype=float)
+        self.patched = False
+
+
+    def thresholds(self, scores):
+        """
+        Index arrays of the products with accuracy >= each score, ordered by
+        total price (ties in `item.products` order), i.e. the pool equivalent of
+        `ItemProcessor.create_accuracy`. One stable price sort serves every score.
+        """
+        price_order = np.argsort(self.total_price[:self.size], kind="stable")
+        accuracies = self.accuracy_score[price_order]
+        return [price_order[accuracies >= score] for score in scores]
+
+
+    def add_row(self, total_price, postage_price, accuracy_score):
+        """
+        Appends a synthetic product (buy price 0, like a fresh `Product`) and
+        returns its row index.
+        """
+        self.total_price = np.append(self.total_price, total_price)
+        self.postage_price = np.append(self.postage_price, postage_price)
+        self.buy_price = np.append(self.buy_price, 0.0)
+        self.accuracy_score = np.append(self.accuracy_score, accuracy_score)
+        return len(self.total_price) - 1
+
+
+    def patch(self, rows, avg_postage_price):
+        """
+        Impute zero postage with `avg_postage_price` and recompute buy/total price
+        for `rows`, exactly like the per-product loop in `set_item_attributes`.
+        """
+        postage_price = self.postage_price[rows]
+        postage_price[postage_price == 0] = avg_postage_price
+        buy_price = round_prices(self.total_price[rows] - postage_price)
+        self.postage_price[rows] = postage_price
+        self.buy_price[rows] = buy_price
+        self.total_price[rows] = round_prices(buy_price + postage_price)
+        self.patched = True
+
+
+    def write_back(self):
+        """
+        Copy patched prices back onto the item's products (synthetic rows are dropped).
+        """
+        if not self.patched:
+            return
+        for product, total_price, postage_price, buy_price in zip(
+            self.products,
+            self.total_price[:self.size].tolist(),
+            self.postage_price[:self.size].tolist(),
+            self.buy_price[:self.size].tolist(),
+        ):
+            product.total_price = total_price
+            product.postage_price = postage_price
+            product.buy_price = buy_price
+
+
+def benchmark(sizes=(10, 40, 200), items_per_size=200, seed=0):
+    """
+    Runs `ItemProcessor.set_item_info_from_pool` and `set_item_info_from_lists` on the
+    same synthetic items, checks that item and product fields come out identical and
+    times both.
+
+    Returns:
+        dict[int, dict]: Per candidate count, the mismatches and seconds of each path.
+    """
+    import random
+    import time
+    from Item import Item
+    from Product import Product
+    from ItemProcessor import ItemProcessor
+
+    fields = ("sell_price", "accuracy_score", "postage_price", "num_products", "total_price", "buyer_protection_fee")
+    rng = random.Random(seed)
+    item_processor = ItemProcessor.__new__(ItemProcessor)
+    report = {}
+    for size in sizes:
+        items = []
+        for _ in range(items_per_size):
+            item = Item("item", "brand", "variant", 1, measurements=[[50, "ml"]])
+            item.products = [
+                Product(
+                    "product", "web_url",
+                    total_price=round(rng.uniform(5, 60), 2),
+                    postage_price=rng.choice([0, 0, 1.55, 2.7, round(rng.uniform(0, 3), 3)]),
+                    accuracy_score=rng.choice([0, 100, round(rng.uniform(0, 100), 2)]),
+                )
+                for _ in range(size)
+            ]
+            items.append(item)
+        pool_items = [item.copy() for item in items]
+        list_items = [item.copy() for item in items]
+
+        start = time.perf_counter()
+        for item in pool_items:
+            item_processor.set_item_info_from_pool(item)
+        pool_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for item in list_items:
+            item_processor.set_item_info_from_lists(item)
+        list_seconds = time.perf_counter() - start
+
+        mismatches = 0
+        for pool_item, list_item in zip(pool_items, list_items):
+            same = all(getattr(pool_item, f) == getattr(list_item, f) for f in fields) and all(
+                (p.total_price, p.postage_price, p.buy_price) == (q.total_price, q.postage_price, q.buy_price)
+                for p, q in zip(pool_item.products, list_item.products)
+            )
+            mismatches += not same
+        report[size] = {"mismatches": mismatches, "pool_seconds": pool_seconds, "list_seconds": list_seconds}
+    return report
+
+
+if __name__ == "__main__":
+    for size, result in benchmark().items():
+        print(
+            f"{size} candidates: lists {result['list_seconds']:.3f}s, pool {result['pool_seconds']:.3f}s, "
+            f"{result['mismatches']} mismatches"
+        )
@@ -0,0 +1,210 @@
+"""
+Columnar export of the stored job lots for offline analysis.
+
+`ColumnarExporter` streams ./Operations/all_job_lots.pkl (one job lot at a time,
+via `FileHandler.iter_objects`) into three flat tables:
+
+    job_lots   lot_row, every `JobLot` field except `items`
+    items      lot_row, item_row, every `Item` field except `products`
+    products   item_row, product_row, every `Product` field
+
+`lot_row`/`item_row`/`product_row` are positions in the export (a lot id can
+appear several times in the history, once per stored version), so the tables
+join on them.
+
+Output goes to ./Extracted_Info/Export/ as Parquet if `pyarrow` is installed
+(one row group per chunk) and as CSV otherwise (one file per table, appended a
+chunk at a time). Rows are buffered `CHUNK_ROWS` at a time per table, so memory
+stays bounded whatever the size of the history.
+
+Column types follow the dataclass annotations: `float` fields are float64 (old
+pickles hold ints and NumPy floats there), `int` fields are int64, everything
+else (and the lot `id`) is a string. Lists (an item's `measurements`) are
+written as JSON. Attributes that are no longer dataclass fields are not
+exported; fields missing from old objects are empty.
+"""
+
+import csv
+import dataclasses
+import json
+import os
+from FileHandler import FileHandler
+from JobLot import JobLot
+from Item import Item
+from Product import Product
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+class ColumnarExporter:
+
+    SOURCE_PATH = "./Operations/all_job_lots.pkl"
+    OUTPUT_DIR = "./Extracted_Info/Export"
+
+    # Rows buffered per table before a chunk is written.
+    CHUNK_ROWS = 50_000
+
+    # Exported as strings whatever their annotation (eBay ids are "v1|...|0").
+    STRING_FIELDS = {"id"}
+
+    TABLES = {
+        "job_lots": (["lot_row"], JobLot, ("items",)),
+        "items": (["lot_row", "item_row"], Item, ("products",)),
+        "products": (["item_row", "product_row"], Product, ()),
+    }
+
+    def __init__(self, file_handler=None, output_dir=OUTPUT_DIR):
+        """
+        Args:
+            file_handler (FileHandler | None): Source of the stored job lots
+                (e.g. `SqliteFileHandler`); defaults to the pickle streams.
+            output_dir (str): Directory the tables are written to.
+        """
+        self.file_handler = file_handler or FileHandler()
+        self.output_dir = output_dir
+
+
+    @property
+    def format(self):
+        return "parquet" if pyarrow is not None else "csv"
+
+
+    def export(self, source=SOURCE_PATH, format=None):
+        """
+        Export every job lot in `source` into the three tables.
+
+        Args:
+            source (str): Stored job lots to export.
+            format (str | None): "parquet" or "csv"; defaults to Parquet when
+                `pyarrow` is available.
+
+        Returns:
+            dict[str, tuple[str, int]]: Path and row count of each table.
+        """
+        format = format or self.format
+        if format == "parquet" and pyarrow is None:
+            raise ValueError("Parquet export needs pyarrow; use format='csv'")
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        writers = {name: TableWriter(self.output_path(name, format), *self.columns(name), format) for name in self.TABLES}
+        try:
+            item_row = product_row = 0
+            for lot_row, job_lot in enumerate(self.file_handler.iter_objects(source)):
+                writers["job_lots"].add([lot_row], job_lot)
+                for item in getattr(job_lot, "items", None) or []:
+                    writers["items"].add([lot_row, item_row], item)
+                    for product in getattr(item, "products", None) or []:
+                        writers["products"].add([item_row, product_row], product)
+                        product_row += 1
+                    item_row += 1
+        finally:
+            for writer in writers.values():
+                writer.close()
+        return {name: (writer.path, writer.rows) for name, writer in writers.items()}
+
+
+    def output_path(self, name, format):
+        return os.path.join(self.output_dir, f"{name}.{format}")
+
+
+    def columns(self, name):
+        """
+        Returns:
+            tuple[list[str], list[str], list[str]]: Key column names, field names
+            and the kind ("float", "int" or "string") of every column.
+        """
+        keys, cls, exclude = self.TABLES[name]
+        fields = [field for field in dataclasses.fields(cls) if field.name not in exclude]
+        kinds = ["int"] * len(keys) + [
+            "string" if field.name in self.STRING_FIELDS
+            else "float" if field.type is float
+            else "int" if field.type is int
+            else "string"
+            for field in fields
+        ]
+        return keys, [field.name for field in fields], kinds
+
+
+class TableWriter:
+    """
+    Buffers the rows of one table and writes them a chunk at a time.
+    """
+
+    def __init__(self, path, keys, fields, kinds, format):
+        self.path = path
+        self.fields = fields
+        self.names = keys + fields
+        self.kinds = kinds
+        self.format = format
+        self.chunk = [[] for _ in self.names]
+        self.rows = 0
+        self.writer = None
+        self.file = None
+        if format == "parquet":
+            types = {"float": pyarrow.float64(), "int": pyarrow.int64(), "string": pyarrow.string()}
+            self.schema = pyarrow.schema([(name, types[kind]) for name, kind in zip(self.names, kinds)])
+            self.writer = pyarrow.parquet.ParquetWriter(path, self.schema)
+        else:
+            self.file = open(path, "w", newline="", encoding="utf-8")
+            self.writer = csv.writer(self.file)
+            self.writer.writerow(self.names)
+
+
+    def add(self, keys, obj):
+        values = keys + [getattr(obj, name, None) for name in self.fields]
+        for column, kind, value in zip(self.chunk, self.kinds, values):
+            column.append(self.convert(kind, value))
+        self.rows += 1
+        if len(self.chunk[0]) >= ColumnarExporter.CHUNK_ROWS:
+            self.flush()
+
+
+    @staticmethod
+    def convert(kind, value):
+        if value is None:
+            return None
+        if kind == "float":
+            return float(value) if isinstance(value, (int, float)) else None
+        if kind == "int":
+            return int(value) if isinstance(value, (int, float)) and float(value).is_integer() else None
+        if isinstance(value, str):
+            return value
+        if isinstance(value, (list, dict)):
+            try:
+                return json.dumps(value)
+            except TypeError:
+                pass
+        return str(value)
+
+
+    def flush(self):
+        if not self.chunk[0]:
+            return
+        if self.format == "parquet":
+            self.writer.write_table(pyarrow.Table.from_arrays(self.chunk, schema=self.schema))
+        else:
+            self.writer.writerows(zip(*self.chunk))
+        self.chunk = [[] for _ in self.names]
+
+
+    def close(self):
+        self.flush()
+        if self.format == "parquet":
+            self.writer.close()
+        else:
+            self.file.close()
+
+
+if __name__ == "__main__":
+    import time
+
+    exporter = ColumnarExporter()
+    start = time.perf_counter()
+    tables = exporter.export()
+    print(f"Exported as {exporter.format} in {time.perf_counter() - start:.2f}s")
+    for name, (path, rows) in tables.items():
+        print(f"{name}: {rows} rows -> {path} ({os.path.getsize(path) / 1e6:.2f} MB)")
@@ -24,7 +24,8 @@ Assumptions / dependencies
 - `JobLotsCreator` provides:
     * file_handler.refresh_working_job_lots()
     * check_job_lot_exists(id) -> bool
-    * write(job_lot) -> None
+    * write(job_lot) -> None (buffered)
+    * flush() -> None (commits buffered lots at the end of a run)
     * lot_processor.process(job_lot) -> None
     * item_name_extractor.extract_items_from_image(path) -> list[Item]
 - `CustomJobLotsCreatorInfo.create_with_uninitialized_items()` returns a list
@@ -55,11 +56,17 @@ class CustomJobLotsCreator(JobLotsCreator):
     - Deduplicate against stored lots by id.
     - Extract items from images to form ad-hoc custom lots.
     """
-    def __init__(self):
+    def __init__(self, file_handler=None):
         """
         Initialize the base creator and attach the predefined lots provider.
+
+        Parameters
+        ----------
+        file_handler : FileHandler | None
+            Storage backend (e.g. `SqliteFileHandler`); defaults to the pickle
+            files.
         """
-        super().__init__()
+        super().__init__(file_handler)
         self.info = CustomJobLotsCreatorInfo()
 
     def create(self):
@@ -81,6 +88,7 @@ class CustomJobLotsCreator(JobLotsCreator):
             self.lot_processor.process(lot)
             updated_job_lots.append(lot)
             super().write(lot)
+        self.flush()
 
         return updated_job_lots
     
@@ -105,6 +113,7 @@ class CustomJobLotsCreator(JobLotsCreator):
             for image in searches:
                 self.create_custom_from_img(image, n)
                 n += 1
+            self.flush()
 
     def create_custom_from_img(self, image_path, item_id):
         """
@@ -10,19 +10,42 @@ This module defines `EbayJobLotsCreator`, which:
 - Computes lot-level metrics (via `LotProcessor`),
 - Persists resulting job lots using methods inherited from `JobLotsCreator`.
 
+`create` handles one search strictly in sequence. `create_pipeline` runs many
+searches as a staged streaming pipeline (see `Pipeline`): discover -> fetch
+details/image -> extract items -> price items -> persist, each stage with its own
+concurrency limit and bounded queue, so different lots can be in different stages
+at once.
+
+Both take `incremental=True` to discover only the lots listed since the last run
+of the same search (see `discover_new`): listings are requested newest first,
+from the search's saved watermark on, and paged through until it is reached, so
+a repeat run does work proportional to the new listings rather than to `limit`.
+
 Expected collaborators / interfaces
 -----------------------------------
 JobLotsCreator
     - check_job_lot_exists(id) -> bool
-    - write(job_lot) -> None
+    - write(job_lot) -> None  (buffered)
+    - flush() -> None  (commits buffered lots and writes the report; called at
+      the end of every run)
     - file_handler.refresh_working_job_lots() -> None (used by create_custom)
+    - file_handler.get_search_watermarks() / update_search_watermarks(dict):
+      newest listing date discovered per search (used by incremental runs)
 JobLot
     - __init__(source: str, id: str, name: str, web_url: str)
-    - attributes set here: buy_price, description, items
+    - attributes set here: buy_price, description, items, search
 LotProcessor
     - process(jobLot) -> None  (mutates jobLot with computed fields)
+PriceIndex
+    - lookup(item) / add_item(item): local history of scored listings; items
+      with enough recent matches are priced without an eBay search
+SearchMissCache
+    - is_miss(key) / record(item): items whose recent full search found no
+      usable listings skip the fallback searches; `print_report()` is called by
+      `flush`
 EbayRequestHandler
-    - get_lots(query_param_str) -> dict
+    - iter_lots(query_param_str, filters=None, page_size, max_results) ->
+      iterator of dict (paginated search results)
     - get_lot_from_id(item_id) -> dict
     - get_lot_description(item_id) -> str
 CurrencyConverter
@@ -41,6 +64,7 @@ Notes & caveats
 """
 
 import re
+import threading
 import requests
 from JobLot import JobLot
 from LotProcessor import LotProcessor
@@ -48,6 +72,9 @@ from EbayRequestHandler import EbayRequestHandler
 from CurrencyConverter import CurrencyConverter
 from ItemNameExtractor import ItemNameExtractor
 from JobLotsCreator import JobLotsCreator
+from PriceIndex import PriceIndex
+from SearchMissCache import SearchMissCache
+from Pipeline import Pipeline, Stage
 from PIL import Image # type: ignore
 from io import BytesIO
 
@@ -64,17 +91,45 @@ class EbayJobLotsCreator(JobLotsCreator):
     - Write to storage via inherited `write`.
     """
 
-    def __init__(self):
+    # Listings per request when paging through new listings (the Browse API
+    # allows up to 200), and a cap on the listings of one incremental search.
+    NEW_LOTS_PAGE_SIZE = 50
+    MAX_NEW_LOTS = 1000
+
+    def __init__(self, file_handler=None):
         """
         Initialize external dependencies used during lot creation.
+
+        Parameters
+        ----------
+        file_handler : FileHandler | None
+            Storage backend (e.g. `SqliteFileHandler`); defaults to the pickle
+            files.
         """
-        super().__init__()
+        super().__init__(file_handler)
         self.ebay_request_handler = EbayRequestHandler()
         self.currency_converter = CurrencyConverter()
         self.item_name_extractor = ItemNameExtractor()
-        self.lot_processor = LotProcessor()
+        # Items priced recently enough are estimated from the stored history, and
+        # items that recently found nothing are not searched for again in full.
+        self.search_miss_cache = SearchMissCache(self.file_handler)
+        self.price_index = PriceIndex(self.file_handler)
+        self.lot_processor = self.create_lot_processor()
+        # `create_pipeline` prices lots on several threads. Each thread gets its
+        # own `LotProcessor` (see `worker_lot_processor`); only the price index
+        # and search miss cache, which lock their own state, are shared.
+        self.worker_state = threading.local()
+        # Serializes reads/writes of the pickle store between pipeline stages.
+        self.store_lock = threading.Lock()
+        # Newest listing date discovered per search this run; saved once the
+        # run's lots are flushed.
+        self.pending_watermarks = {}
+        # itemId -> (search, listing date) of lots `create_pipeline` discovered
+        # but has not persisted yet; a lot still here when the run ends was
+        # dropped by a failing stage.
+        self.unpersisted_lots = {}
 
-    def create(self, search, limit = 10):
+    def create(self, search, limit = 10, incremental=False):
         """
         Create lots from an eBay search query.
 
@@ -83,14 +138,162 @@ class EbayJobLotsCreator(JobLotsCreator):
         search : str
             Search term passed to the eBay Browse API (e.g., "job lot iphone").
         limit : int, default=10
-            Maximum number of item summaries to request.
+            Maximum number of item summaries to request (with `incremental`,
+            only on the first run of `search`).
+        incremental : bool, default=False
+            Only discover lots listed since the last run of `search` (see
+            `discover_new`).
 
         Side Effects
         ------------
-        - For each unseen lot, builds and processes a `JobLot` and writes it.
+        - For each unseen lot, builds and processes a `JobLot` and writes it;
+          the batch is flushed to disk when the search is done.
+        - With `incremental`, the search's watermark is advanced after the flush.
+        """
+        lots = self.discover_new(search, limit) if incremental else self.discover(search, limit)
+        for lot in lots:
+            lot = self.process(lot)
+            super().write(lot)
+        self.flush()
+        self.save_watermarks()
+
+    def discover(self, search, limit=10):
+        """
+        Search eBay and return the raw payloads of lots not stored yet.
+
+        Parameters
+        ----------
+        search : str
+            Search term passed to the eBay Browse API.
+        limit : int, default=10
+            Maximum number of item summaries to request.
+
+        Returns
+        -------
+        iterator of dict
+            Raw lot payloads whose id/prices are not in the stored job lots,
+            yielded as their result page arrives.
+        """
+        # Streamed page by page, so `limit` may exceed the Browse API's page size.
+        lots = self.ebay_request_handler.iter_lots(f"q={search}", page_size=min(limit, 200), max_results=limit)
+        return self.filter_new(lots, search)
+
+    def discover_new(self, search, limit=10):
+        """
+        Search eBay for lots listed since the last run of `search` and yield
+        the raw payloads of those not stored yet, as their result page arrives.
+
+        Listings are requested newest first (`sort=newlyListed`). With a saved
+        watermark for `search` (the creation date of the newest listing seen by
+        an earlier run), only listings started since then are requested
+        (`itemStartDate` filter), `NEW_LOTS_PAGE_SIZE` at a time, and paging
+        (`EbayRequestHandler.iter_lots`) stops at the first listing older than
+        the watermark, at the last page, or after `MAX_NEW_LOTS` listings.
+        Without one, the newest `limit` listings are taken.
+
+        Once the listings are used up, the newest date seen is kept in
+        `pending_watermarks`; it is only saved by `save_watermarks` once the
+        run's lots are stored, so lots of a failed run, or lots a failing
+        `create_pipeline` stage dropped, are discovered again. A search that is
+        not read to the end (e.g. a page request failed) leaves no watermark. If
+        `MAX_NEW_LOTS` stopped the paging before the watermark was reached, the
+        watermark is not advanced either: the listings between it and the
+        oldest one taken were never seen, and the next run requests them again
+        (lots already stored are filtered out).
+
+        Parameters
+        ----------
+        search : str
+            Search term passed to the eBay Browse API.
+        limit : int, default=10
+            Listings to take on the first run of `search`.
+
+        Returns
+        -------
+        iterator of dict
+            Raw lot payloads, newest first, whose id/prices are not in the
+            stored job lots.
+        """
+        return self.filter_new(self.new_listings(search, limit), search)
+
+    def new_listings(self, search, limit):
+        """
+        Generator behind `discover_new`: the raw listings of `search` since its
+        watermark, each once, and the watermark bookkeeping once they run out.
+        """
+        watermark = self.file_handler.get_search_watermarks().get(search)
+        seen_ids = set()
+        newest = None
+        capped = False
+        if watermark is None:
+            listings = self.ebay_request_handler.iter_lots(f"q={search}&sort=newlyListed", page_size=min(limit, 200), max_results=limit)
+        else:
+            listings = self.ebay_request_handler.iter_lots(
+                f"q={search}&sort=newlyListed",
+                filters=f"itemStartDate:[{watermark}..]",
+                page_size=self.NEW_LOTS_PAGE_SIZE,
+                max_results=self.MAX_NEW_LOTS,
+            )
+        consumed = 0
+        for lot in listings:
+            listed = self.listing_date(lot)
+            if watermark is not None and listed is not None and listed < watermark:
+                break
+            consumed += 1
+            # Listings shift down while paging; each is taken once.
+            if lot.get('itemId') in seen_ids:
+                continue
+            seen_ids.add(lot.get('itemId'))
+            if listed is not None and listed > (newest or ""):
+                newest = listed
+            yield lot
+        else:
+            # Paging ended without reaching the watermark: if that was the cap,
+            # there may be new listings older than those taken.
+            capped = watermark is not None and consumed >= self.MAX_NEW_LOTS
+
+        if capped:
+            print(f"{search}: stopped after {self.MAX_NEW_LOTS} listings; watermark kept at {watermark}")
+        elif newest is not None and newest > (watermark or ""):
+            with self.store_lock:
+                self.pending_watermarks[search] = max(newest, self.pending_watermarks.get(search, ""))
+        print(f"{search}: {len(seen_ids)} listings since {watermark or 'the first run'}")
+
+    @staticmethod
+    def listing_date(lot):
+        """
+        Creation date of a raw listing (ISO 8601 UTC, so dates compare as
+        strings), falling back to its origin date; None if neither is given.
+        """
+        return lot.get('itemCreationDate') or lot.get('itemOriginDate')
+
+    def save_watermarks(self):
+        """
+        Save the watermarks advanced by `discover_new` this run.
+
+        A search with lots in `unpersisted_lots` (dropped by a failing pipeline
+        stage) is only advanced to the oldest of their listing dates, so the
+        next run discovers them again; it is not advanced at all if one of them
+        has no date.
+        """
+        with self.store_lock:
+            watermarks, self.pending_watermarks = self.pending_watermarks, {}
+            unpersisted, self.unpersisted_lots = self.unpersisted_lots, {}
+        for search, listed in unpersisted.values():
+            if search not in watermarks:
+                continue
+            if listed is None:
+                del watermarks[search]
+            else:
+                watermarks[search] = min(watermarks[search], listed)
+        self.file_handler.update_search_watermarks(watermarks)
+
+    def filter_new(self, lots, search):
+        """
+        Yield the raw lot payloads of `lots` whose id/prices are not in the
+        stored job lots, tagged with the `search` they were found by. Lazy, so a
+        streamed search's lots move on while later pages are still requested.
         """
-        response_data = self.ebay_request_handler.get_lots(f"q={search}&limit={limit}")
-        lots = response_data.get('itemSummaries')
         for lot in lots:
             id = str(lot.get('itemId'))
             price = lot.get('price', {}).get('value')
@@ -101,10 +304,92 @@ class EbayJobLotsCreator(JobLotsCreator):
             listing_price = self.currency_converter.convert(price, currency) if price and currency else "Price not available"
             postage_price = self.currency_converter.convert(postage_price, postage_currency) if postage_price and postage_currency else "Postage not available"
 
-            if super().check_job_lot_exists(id, listing_price, postage_price):
-                continue
-            lot = self.process(lot)
-            super().write(lot)
+            # The store may be written concurrently by `create_pipeline`'s persist stage.
+            with self.store_lock:
+                exists = super().check_job_lot_exists(id, listing_price, postage_price)
+            if not exists:
+                # Remembered on the job lot (`JobLot.search`) by `fetch_details`.
+                lot['search'] = search
+                yield lot
+
+    def create_pipeline(self, searches, limit=10, report_interval=None, incremental=False):
+        """
+        Run several searches as a staged streaming pipeline.
+
+        Stages (each with its own thread count and bounded input queue):
+            discover -> fetch details -> extract items -> price items -> persist
+
+        Lots move on as soon as a stage finishes them, and a search's lots as
+        soon as their result page arrives, so while one lot is being priced the
+        next can already be in vision extraction. A lot found by more than one
+        search is only processed once. Each pricing thread has its own
+        `LotProcessor`. Persisting stays single-threaded
+        because the pickle store is not safe for concurrent writers; lots are
+        committed in batches as they arrive and flushed when the run ends.
+
+        Parameters
+        ----------
+        searches : list[str]
+            Search terms passed to the eBay Browse API.
+        limit : int, default=10
+            Maximum number of item summaries to request per search (with
+            `incremental`, only on the first run of a search).
+        report_interval : float | None
+            If set, print every stage's queue depth and throughput this often.
+        incremental : bool, default=False
+            Only discover lots listed since the last run of each search (see
+            `discover_new`); watermarks are saved after the final flush, held
+            back to any lot a stage failed on (see `save_watermarks`).
+
+        Returns
+        -------
+        Pipeline
+            The finished pipeline, whose `report()` holds the per-stage statistics.
+        """
+        seen_ids = set()
+        seen_lock = threading.Lock()
+
+        def discover(search):
+            lots = self.discover_new(search, limit) if incremental else self.discover(search, limit)
+            for lot in lots:
+                with seen_lock:
+                    if lot.get('itemId') in seen_ids:
+                        continue
+                    seen_ids.add(lot.get('itemId'))
+                with self.store_lock:
+                    self.unpersisted_lots[lot.get('itemId')] = (search, self.listing_date(lot))
+                yield lot
+
+        def price_items(job_lot):
+            return self.price_items(job_lot, self.worker_lot_processor())
+
+        def persist(job_lot):
+            with self.store_lock:
+                super(EbayJobLotsCreator, self).write(job_lot)
+                self.unpersisted_lots.pop(job_lot.id, None)
+            return job_lot
+
+        pipeline = Pipeline([
+            Stage("discover", discover, concurrency=2, fan_out=True),
+            Stage("fetch details", self.fetch_details, concurrency=4),
+            Stage("extract items", self.extract_items, concurrency=2),
+            Stage("price items", price_items, concurrency=2),
+            Stage("persist", persist, concurrency=1),
+        ])
+        pipeline.run(searches, report_interval=report_interval)
+        with self.store_lock:
+            self.flush()
+        self.save_watermarks()
+        pipeline.print_report()
+        return pipeline
+
+    def flush(self):
+        """
+        Commit and report as `JobLotsCreator.flush`, then print the requests the
+        search miss cache saved this run.
+        """
+        super().flush()
+        self.search_miss_cache.print_report()
 
     def create_custom(self, searches):
         """
@@ -127,6 +412,7 @@ class EbayJobLotsCreator(JobLotsCreator):
             links = searches.split(',')
             for link in links:
                 self.create_custom_from_link(link)
+            self.flush()
         else:
             print("No valid eBay links found in the input.")
 
@@ -189,8 +475,23 @@ class EbayJobLotsCreator(JobLotsCreator):
         -------
         - If `value`/`currency` are missing, `listing_price` is set to a string,
           which will cause a TypeError when added to a float; preserved as-is.
-        - Image extension is inferred from URL and sanitized for filename; file
-          is still saved in JPEG format regardless of URL extension.
+        - Image extension is inferred from URL; the file is named after the
+          sanitized item id and is still saved in JPEG format regardless of URL
+          extension.
+        """
+        job_lot, image_path = self.fetch_details(lot)
+        self.extract_items((job_lot, image_path))
+        return self.price_items(job_lot)
+
+    def fetch_details(self, lot):
+        """
+        Steps 1-5 of `process` plus the description: build the `JobLot`, convert
+        prices, download the image and fetch the description.
+
+        Returns
+        -------
+        tuple[JobLot, str]
+            The job lot and the local path of its downloaded image.
         """
         value = lot.get('price', {}).get('value')
         currency = lot.get('price', {}).get('currency')
@@ -217,8 +518,11 @@ class EbayJobLotsCreator(JobLotsCreator):
         ext = ext_match.group(1).lower() if ext_match else "jpeg"
         if ext == "jpg":
             ext = "jpeg"
-        # Sanitize filename: replace non-alphanumeric with underscores.
-        image_path = f"./Operations/Images/{re.sub(r'[^a-zA-Z0-9]', '_', lot.get('title'))}_image.{ext}"
+        # Named after the (sanitized) item id rather than the title: lots are
+        # fetched and extracted concurrently, and titles like "job lot makeup"
+        # repeat, so title-named files could be overwritten by another lot's
+        # image before extraction.
+        image_path = f"./Operations/Images/{re.sub(r'[^a-zA-Z0-9]', '_', str(lot.get('itemId')))}_image.{ext}"
         # Download and persist the image.
         self.download_image(image_path, image)
 
@@ -232,14 +536,58 @@ class EbayJobLotsCreator(JobLotsCreator):
         job_lot.buy_listing_price = round(listing_price + postage_price, 2)
         # Retrieve plain-text description via API.
         job_lot.description = self.ebay_request_handler.get_lot_description(job_lot.id)
+        job_lot.condition = lot.get('condition', 'New')  # eBay listings are typically new items.
+        job_lot.search = lot.get('search')
+        return job_lot, image_path
+
+    def extract_items(self, lot_and_image):
+        """
+        Step 6 of `process`: extract the lot's items from its downloaded image.
+
+        Parameters
+        ----------
+        lot_and_image : tuple[JobLot, str]
+            As returned by `fetch_details`.
+
+        Returns
+        -------
+        JobLot
+        """
+        job_lot, image_path = lot_and_image
         # Extract items from the image (as per current pipeline).
         # job_lot.set_items(self.item_name_extractor.extract_items(job_lot.description))
         job_lot.items = self.item_name_extractor.extract_items(image_path)
+        return job_lot
 
-        job_lot.condition = lot.get('condition', 'New')  # eBay listings are typically new items.
+    def price_items(self, job_lot, lot_processor=None):
+        """
+        Step 7 of `process`: price the items and compute lot-level metrics.
+
+        Parameters
+        ----------
+        job_lot : JobLot
+        lot_processor : LotProcessor | None
+            Defaults to `self.lot_processor`.
+
+        Returns
+        -------
+        JobLot
+        """
         # Compute lot-level metrics (sell price, profit, rating, etc.).
-        self.lot_processor.process(job_lot)
+        (lot_processor or self.lot_processor).process(job_lot)
         return job_lot
+
+    def create_lot_processor(self):
+        return LotProcessor(price_index=self.price_index, search_miss_cache=self.search_miss_cache)
+
+    def worker_lot_processor(self):
+        """
+        The calling thread's own `LotProcessor`, created on first use.
+        """
+        lot_processor = getattr(self.worker_state, "lot_processor", None)
+        if lot_processor is None:
+            lot_processor = self.worker_state.lot_processor = self.create_lot_processor()
+        return lot_processor
     
     def download_image(self, path, image_url):
         """
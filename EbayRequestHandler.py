@@ -23,6 +23,9 @@ Conventions & notes
   eBay's query syntax (e.g., buyingOptions:{FIXED_PRICE}); those curls
   are part of the string and not Python formatting.
 - HTML descriptions are converted to plain text via BeautifulSoup.
+- `iter_lots()`/`iter_items()` stream the results of a search across as many
+  pages as the caller consumes, following each page's `next` link and fetching
+  the next page in the background while the current one is consumed.
 - This module intentionally retains unused imports/variables if present
   in the original source, to avoid changing behavior.
 """
@@ -31,6 +34,7 @@ import os
 import numpy as np
 import base64
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from requests.auth import HTTPBasicAuth
 from bs4 import BeautifulSoup
@@ -63,6 +67,11 @@ class EbayRequestHandler:
         raise ValueError("EBAY_PROD_CLIENT_ID and EBAY_PROD_CLIENT_SECRET must be set in the environment variables.")
     if not OAUTH_TOKEN:
         raise ValueError("OAUTH_TOKEN is not set in the environment variables.")
+
+    SEARCH_URL = "https://api.ebay.com/buy/browse/v1/item_summary/search"
+    # Results per page requested by `iter_lots`/`iter_items` (the Browse API
+    # allows up to 200).
+    PAGE_SIZE = 50
     
 
     def __init__(self):
@@ -121,7 +130,7 @@ class EbayRequestHandler:
             raise Exception(f"Error: {response.status_code} - {response.text}")
 
 
-    def get_lots(self, parameter):
+    def get_lots(self, parameter, filters=None):
         """
         Search for lots/items using the Browse API.
 
@@ -129,6 +138,9 @@ class EbayRequestHandler:
         ----------
         parameter : str
             Query string portion (e.g., "q=iphone&limit=10").
+        filters : str | None
+            Extra filter clauses appended to the fixed ones (e.g.
+            "itemStartDate:[2025-01-01T00:00:00.000Z..]").
 
         Returns
         -------
@@ -145,6 +157,8 @@ class EbayRequestHandler:
         - Filters results to NEW condition and deliveryCountry=GB.
         """
         url = f"https://api.ebay.com/buy/browse/v1/item_summary/search?{parameter}&filter=conditions:{{NEW}},deliveryCountry:GB"
+        if filters:
+            url += f",{filters}"
         response = requests.get(url, headers=self.headers)
         if response.status_code == 200:
             return response.json()  # Return the JSON response
@@ -152,6 +166,106 @@ class EbayRequestHandler:
             raise Exception(f"Error: {response.status_code} - {response.text}")
     
 
+    def iter_lots(self, parameter, filters=None, page_size=PAGE_SIZE, max_results=None):
+        """
+        Lazily iterate over the lots matching a Browse search, page by page.
+
+        Parameters
+        ----------
+        parameter : str
+            Query string portion without `limit`/`offset` (e.g., "q=iphone" or
+            "q=iphone&sort=newlyListed").
+        filters : str | None
+            Extra filter clauses, as for `get_lots`.
+        page_size : int
+            Results requested per page.
+        max_results : int | None
+            Stop after this many results (None = every page eBay returns).
+
+        Yields
+        ------
+        dict
+            `itemSummaries` entries, in result order (see `iter_pages`).
+        """
+        url = f"{self.SEARCH_URL}?{parameter}&filter=conditions:{{NEW}},deliveryCountry:GB"
+        if filters:
+            url += f",{filters}"
+        return self.iter_pages(url, page_size, max_results)
+
+
+    def iter_items(self, name, params=None, page_size=PAGE_SIZE, max_results=None):
+        """
+        Lazily iterate over the fixed-price items of a Browse search, page by
+        page. `name` and `params` are as for `get_items`, without `limit`.
+
+        Yields
+        ------
+        dict
+            `itemSummaries` entries, in result order (see `iter_pages`).
+        """
+        return self.iter_pages(f"{self.SEARCH_URL}?{name}&{params}", page_size, max_results)
+
+
+    def iter_pages(self, url, page_size=PAGE_SIZE, max_results=None):
+        """
+        Generator over the `itemSummaries` of every page of a search, starting
+        at `url` and following each response's `next` link.
+
+        While the caller consumes a page, the next one is already requested on a
+        background thread, so network waits overlap with processing. No request
+        is made for a page beyond `max_results` or after the last page. When the
+        caller stops early (breaks out of the loop or drops the generator), a
+        prefetch that has not started is cancelled and one in flight is
+        discarded. At most the current page and the prefetched one are held.
+
+        Raises
+        ------
+        Exception
+            If a page's response is not 200 OK (raised where that page is
+            consumed).
+        """
+        if max_results is not None:
+            page_size = min(page_size, max_results)
+            if page_size <= 0:
+                return
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            separator = "&" if "?" in url else "?"
+            future = executor.submit(self.get_page, f"{url}{separator}limit={page_size}")
+            results = 0
+            while future is not None:
+                response_data = future.result()
+                page = response_data.get('itemSummaries') or []
+                if max_results is not None:
+                    page = page[:max_results - results]
+                results += len(page)
+                next_url = response_data.get('next')
+                # Request the next page before handing out this one.
+                if page and next_url and (max_results is None or results < max_results):
+                    future = executor.submit(self.get_page, next_url)
+                else:
+                    future = None
+                yield from page
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+    def get_page(self, url):
+        """
+        GET one page of Browse search results by its full URL.
+
+        Raises
+        ------
+        Exception
+            If the response is not 200 OK.
+        """
+        response = requests.get(url, headers=self.headers)
+        if response.status_code == 200:
+            return response.json()
+        else:
+            raise Exception(f"Error: {response.status_code} - {response.text}")
+
+
     def get_lot_from_id(self, parameter):
         """
         Retrieve a single item/lot by its eBay item ID.
@@ -3,10 +3,14 @@ FileHandler utilities for persisting and exporting "job lot" data.
 
 This module provides a `FileHandler` class that:
 - Creates a predictable folder structure for outputs and operational files.
-- Serializes/deserializes Python objects with `pickle` (supports lists and single objects).
+- Serializes/deserializes Python objects with `pickle` (supports lists and single objects),
+  either all at once (`load_object`) or lazily by position/id (`open_stream`).
 - Maintains "working" and "all" job-lot pickle files.
 - Exports human-readable, normalized text reports of job lots, items, and products.
 - Manages a simple text file of saved searches for automation.
+- Holds the Operations `FileLock` for every mutation and load, so several processes
+  (e.g. auto-search workers) can share one Operations directory. `iter_objects`
+  only holds it to open the stream, so long reads do not block writers.
 
 Expected data model (informal):
 - `job_lot` objects used by this module should implement:
@@ -19,13 +23,18 @@ Expected data model (informal):
 
 Note:
 - Pickle files store one pickled object after another (a "pickled stream").
-- Removing objects expects those objects to have a `.name` attribute; only objects
-  whose `.name` differs from `obj_name` are retained.
+- Removing objects (`remove_objects`) matches on `.name`, `.id` or a predicate and
+  rewrites the stream once, atomically, copying retained objects without unpickling.
 """
 
 from datetime import datetime
 from normalize_text_indentation import normalize_text
+from LazyPickleStream import LazyPickleStream
+from FileLock import FileLock
+import heapq
+import io
 import pickle
+import shutil
 import os
 
 # Creates date- and time-based attributes:
@@ -40,7 +49,8 @@ class FileHandler:
 
     Responsibilities:
         - Initialize dated/time-stamped output directories.
-        - Write, append, remove, and load pickled objects from files.
+        - Serialize file access across processes with `self.file_lock`.
+        - Write, append (including atomic batch commits), remove, and load pickled objects from files.
         - Produce sorted, text-based reports of job lots/items/products.
         - Track and print "auto searches" from a flat text file.
 
@@ -57,6 +67,9 @@ class FileHandler:
             Instructions.txt
     """
 
+    # Number of best job lots written by `write_sorted` (None = all of them).
+    REPORT_TOP_K = None
+
     def __init__(self):
         """
         Initialize the handler and ensure required directories/files exist.
@@ -64,22 +77,26 @@ class FileHandler:
         Side effects:
             - Ensures the folder hierarchy exists (idempotent).
             - Touches/creates several operational files in append mode ('a') to
-              guarantee their existence without truncating them.
+              guarantee their existence without truncating them (each handle is
+              closed straight away).
         """
 
         # Ensure directories exist
         os.makedirs('./Extracted_Info', exist_ok=True)
         os.makedirs('./Extracted_Info/Saved', exist_ok=True)
+        os.makedirs(f'./Extracted_Info/{CURRENT_DATE}', exist_ok=True)
         os.makedirs('./Operations', exist_ok=True)
         os.makedirs('./Operations/Images', exist_ok=True)
         os.makedirs('./Other', exist_ok=True)
 
+        # Serializes access to ./Operations across processes (see `FileLock`).
+        self.file_lock = FileLock()
+
         # "Touch" operational files by opening in append mode.
-        # Note: Files are intentionally not kept open; the handles are discarded.
-        f = open("./Operations/working_job_lots.pkl", "a")
-        f = open("./Operations/all_job_lots.pkl", "a")
-        f = open("./Operations/searches.txt", "a")
-        f = open("./Other/Instructions.txt", "a")
+        for path in ("./Operations/working_job_lots.pkl", "./Operations/all_job_lots.pkl",
+                     "./Operations/searches.txt", "./Other/Instructions.txt"):
+            with open(path, "a"):
+                pass
 
     def write_object(self, filename, obj):
         """
@@ -92,18 +109,27 @@ class FileHandler:
             filename (str): Path to target pickle file (will be overwritten).
             obj (Any | list[Any]): The object(s) to pickle.
 
+        The objects are written to `<filename>.tmp`, which is then renamed over
+        `filename`, so readers that already have the file open (`iter_objects`)
+        keep reading the old stream.
+
         Exceptions:
             Prints a message if pickling fails (e.g., unsupported types).
         """
-        try:
-            with open(filename, "wb") as f:
-                if isinstance(obj, list):
-                    for item in obj:
-                        pickle.dump(item, f, protocol=pickle.HIGHEST_PROTOCOL)
-                else:
-                    pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
-        except Exception as ex:
-            print("Error during pickling object (Possibly unsupported):", ex)
+        with self.file_lock:
+            temp_filename = f"{filename}.tmp"
+            try:
+                with open(temp_filename, "wb") as f:
+                    if isinstance(obj, list):
+                        for item in obj:
+                            pickle.dump(item, f, protocol=pickle.HIGHEST_PROTOCOL)
+                    else:
+                        pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temp_filename, filename)
+            except Exception as ex:
+                print("Error during pickling object (Possibly unsupported):", ex)
+                if os.path.exists(temp_filename):
+                    os.remove(temp_filename)
 
     def refresh_working_job_lots(self):
         """
@@ -127,55 +153,114 @@ class FileHandler:
         Exceptions:
             Prints a message if pickling fails.
         """
-        try:
-            with open(filename, "ab") as f:
-                if isinstance(obj, list):
-                    for item in obj:
-                        pickle.dump(item, f, protocol=pickle.HIGHEST_PROTOCOL)
-                else:
-                    pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
-        except Exception as ex:
-            print("Error during pickling object (Possibly unsupported):", ex)
+        with self.file_lock:
+            try:
+                with open(filename, "ab") as f:
+                    if isinstance(obj, list):
+                        for item in obj:
+                            pickle.dump(item, f, protocol=pickle.HIGHEST_PROTOCOL)
+                    else:
+                        pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception as ex:
+                print("Error during pickling object (Possibly unsupported):", ex)
+
+    def commit_objects(self, filename, objs):
+        """
+        Atomically append a batch of pickled objects to the end of `filename`.
+
+        The existing stream is copied byte-for-byte (nothing is unpickled) into
+        `<filename>.tmp`, the new objects are pickled after it, and the temp file is
+        fsynced and renamed over `filename`. A crash part-way through therefore
+        leaves either the old file or the complete new one, never a half-written
+        batch.
+
+        Args:
+            filename (str): Path to target pickle file.
+            objs (list[Any]): The objects to append, in order.
+
+        Returns:
+            bool: True if the batch was committed; False if it failed (the error is
+            printed and `filename` is left unchanged).
+        """
+        with self.file_lock:
+            temp_filename = f"{filename}.tmp"
+            try:
+                with open(temp_filename, "wb") as temp:
+                    if os.path.exists(filename):
+                        with open(filename, "rb") as f:
+                            shutil.copyfileobj(f, temp)
+                    for obj in objs:
+                        pickle.dump(obj, temp, protocol=pickle.HIGHEST_PROTOCOL)
+                    temp.flush()
+                    os.fsync(temp.fileno())
+                os.replace(temp_filename, filename)
+                return True
+            except Exception as ex:
+                print("Error during committing objects:", ex)
+                if os.path.exists(temp_filename):
+                    os.remove(temp_filename)
+                return False
 
     def remove_object(self, filename, obj_name):
         """
         Remove objects (by `.name` attribute) from a pickled stream.
 
-        Works by reading all objects from `filename`, filtering out those whose
-        `.name` equals `obj_name`, then rewriting the file with the retained objects.
+        Shorthand for `remove_objects(filename, names=...)`: the file is read and
+        rewritten once however many names are given.
 
         Args:
             filename (str): Path to the pickle file.
-            obj_name (str | list[str]): Name(s) to remove. If a list is supplied,
-                removal is performed for each name recursively.
+            obj_name (str | list[str]): Name(s) to remove.
+        """
+        names = obj_name if isinstance(obj_name, list) else [obj_name]
+        self.remove_objects(filename, names=names)
 
-        Notes:
-            - Objects are expected to have a `.name` attribute. If an object does
-              not, an exception may be raised during filtering; it is caught and
-              printed, and processing continues.
+    def remove_objects(self, filename, names=None, ids=None, predicate=None):
         """
-        if isinstance(obj_name, list):
-            for name in obj_name:
-                self.remove_object(filename, name)
-            return
-        try:
-            objects = []
-            with open(filename, "rb") as f:
-                while True:
-                    try:
-                        obj = pickle.load(f)
-                        # Keep objects whose name doesn't match the target
-                        if obj.name != obj_name:
-                            objects.append(obj)
-                    except EOFError:
-                        # End of pickled stream
-                        break
-                    except Exception as ex:
-                        print("Error during unpickling object (Possibly unsupported):", ex)
-            # Rewrite the file with remaining objects
-            self.write_object(filename, objects)
-        except Exception as ex:
-            print("Error during unpickling object (Possibly unsupported):", ex)
+        Remove every object matching any of `names`, `ids` or `predicate` from a
+        pickled stream, in a single pass.
+
+        Names and ids are read from the stream's sidecar index (see
+        `LazyPickleStream`), so unless a `predicate` is given nothing is
+        unpickled: the pickled bytes of the retained objects are copied as they
+        are into `<filename>.tmp`, which is fsynced and renamed over `filename`.
+        A crash part-way through leaves the old file intact.
+
+        Args:
+            filename (str): Path to the pickle file.
+            names (Iterable[str] | None): `.name` values to remove.
+            ids (Iterable | None): `.id` values to remove (compared as strings).
+            predicate (Callable[[Any], bool] | None): Called with each object;
+                objects for which it returns True are removed.
+
+        Returns:
+            int: Number of objects removed (0 if the removal failed; the error is
+            printed and `filename` is left unchanged).
+        """
+        with self.file_lock:
+            names = set(names or ())
+            ids = {str(id) for id in ids or ()}
+            temp_filename = f"{filename}.tmp"
+            try:
+                removed = 0
+                with self.open_stream(filename) as stream, open(temp_filename, "wb") as temp:
+                    for position, (name, id) in enumerate(zip(stream.names, stream.ids)):
+                        if name in names or id in ids or (predicate is not None and predicate(stream[position])):
+                            removed += 1
+                        else:
+                            temp.write(stream.raw(position))
+                    temp.flush()
+                    os.fsync(temp.fileno())
+                if removed:
+                    os.replace(temp_filename, filename)
+                else:
+                    os.remove(temp_filename)
+                return removed
+            except Exception as ex:
+                print("Error during removing objects:", ex)
+                if os.path.exists(temp_filename):
+                    os.remove(temp_filename)
+                return 0
 
     def load_object(self, filename):
         """
@@ -192,25 +277,74 @@ class FileHandler:
             Prints a message if unpickling fails; returns items accumulated up to
             the failure point.
         """
+        with self.file_lock:
+            try:
+                items = []
+                with open(filename, "rb") as f:
+                    while True:
+                        try:
+                            items.append(pickle.load(f))
+                        except EOFError:
+                            # Reached end of file/stream
+                            break
+            except Exception as ex:
+                print("Error during unpickling object (Possibly unsupported):", ex)
+            return items
+
+    def iter_objects(self, filename):
+        """
+        Yield the pickled objects in `filename` one at a time, without holding
+        the whole stream in memory, or the store's lock between records.
+
+        Args:
+            filename (str): Path to the pickle file.
+
+        Exceptions:
+            Prints a message if unpickling fails; stops at the failure point.
+        """
+        # The lock is only held to open the stream and note its length, not while
+        # the caller consumes it, so writers are not held up. Writers append past
+        # that length or replace the file (leaving this handle on the old one), so
+        # the records read are the stream as it was when iteration started.
         try:
-            items = []
-            with open(filename, "rb") as f:
-                while True:
-                    try:
-                        items.append(pickle.load(f))
-                    except EOFError:
-                        # Reached end of file/stream
-                        break
+            with self.file_lock:
+                f = open(filename, "rb")
+                size = os.fstat(f.fileno()).st_size
         except Exception as ex:
             print("Error during unpickling object (Possibly unsupported):", ex)
-        return items
+            return
+        with f:
+            try:
+                while f.tell() < size:
+                    yield pickle.load(f)
+            except Exception as ex:
+                print("Error during unpickling object (Possibly unsupported):", ex)
+
+    def open_stream(self, filename):
+        """
+        Open `filename` as a `LazyPickleStream`: a sequence whose records are
+        unpickled only when accessed (by position, slice or `find(id)`), using a
+        sidecar offset index kept next to the file.
+
+        Args:
+            filename (str): Path to the pickle file.
 
-    def write_sorted(self, source_filename):
+        Returns:
+            LazyPickleStream: Close it (or use it as a context manager) when done.
+        """
+        # Building or extending the sidecar index reads the stream and writes the index.
+        with self.file_lock:
+            return LazyPickleStream(filename)
+
+    def write_sorted(self, source_filename, top_k=None, summary_only=False):
         """
         Generate a normalized text report of job lots, sorted by key metrics.
 
         Sorting:
-            Descending by (rating, accuracy_score, sell_price).
+            Descending by (rating, accuracy_score, sell_price). Lots are streamed
+            from `source_filename`; with `top_k` set only the best `top_k` are kept,
+            in a bounded heap, so the report's cost stops growing with the working
+            set.
 
         Output:
             Writes a single text report to:
@@ -221,6 +355,11 @@ class FileHandler:
                 2. Items in Each Job Lot
                 3. Products used to calculate item info
 
+            All sections are rendered in one pass over the kept lots (each lot and
+            item is formatted once and reused across sections) into in-memory
+            buffers, and each section is written with a single call.
+            With `summary_only`, only the Job Lots section is written.
+
             After writing, the file is read back and normalized with `normalize_text`
             using:
                 - indent="spaces", tabsize=4
@@ -231,42 +370,50 @@ class FileHandler:
 
         Args:
             source_filename (str): Path to the pickle file containing job_lot objects.
+            top_k (int | None): Number of best lots to report; defaults to
+                `REPORT_TOP_K` (None reports all).
+            summary_only (bool): Write only the Job Lots section.
         """
-        job_lots = self.load_object(source_filename)
+        if top_k is None:
+            top_k = self.REPORT_TOP_K
+
+        def sort_key(job_lot):
+            return (job_lot.rating, job_lot.accuracy_score, job_lot.sell_price)
 
         # Sort job lots by specified attributes (highest-rated first)
-        job_lots = sorted(
-            job_lots,
-            key=lambda job_lot: (job_lot.rating, job_lot.accuracy_score, job_lot.sell_price),
-            reverse=True
-        )
+        if top_k is None:
+            job_lots = sorted(self.iter_objects(source_filename), key=sort_key, reverse=True)
+        else:
+            job_lots = heapq.nlargest(top_k, self.iter_objects(source_filename), key=sort_key)
 
         # Compose report path using current date/time
         with open(f"./Extracted_Info/{CURRENT_DATE}/{CURRENT_TIME}.txt", "w", encoding="utf-8") as file:
             if len(job_lots) > 0:
-                file.write("Job Lots:"+"\n")
-                file.write("_" * 160 + "\n")
-                n = 1
-                for job_lot in job_lots:
-                    file.write(f"{n}. ")
-                    self.write_job_lot(job_lot, file)
-                    n += 1
-
-                file.write("\n\nItems in Each Job Lot:\n")
-                file.write("_" * 161 + "\n")
-                n = 1
-                for job_lot in job_lots:
-                    file.write(f"{n}. ")
-                    self.write_item(job_lot, file)
-                    n += 1
-
-                file.write("\n\nProducts used to calculate item info:\n")
-                file.write("_" * 161 + "\n")
-                n = 1
-                for job_lot in job_lots:
-                    file.write(f"{n}. ")
-                    self.write_product(job_lot, file)
-                    n += 1
+                job_lot_section = io.StringIO()
+                item_section = io.StringIO()
+                product_section = io.StringIO()
+                for n, job_lot in enumerate(job_lots, start=1):
+                    job_lot_line = f"{n}. {job_lot}\n"
+                    job_lot_section.write(job_lot_line)
+                    if summary_only:
+                        continue
+                    item_lines = [f"\t{item}\n" for item in job_lot.items]
+                    item_section.write(job_lot_line)
+                    item_section.write("\tItems in Job Lot:\n")
+                    item_section.write("".join(item_lines))
+                    item_section.write("\n")
+                    product_section.write(job_lot_line)
+                    product_section.write("\tItems in Job Lot:\n")
+                    for item, item_line in zip(job_lot.items, item_lines):
+                        product_section.write(item_line)
+                        product_section.write("\t\tProducts in Item:\n")
+                        product_section.write("".join(f"\t\t{product}\n" for product in item.products))
+                        product_section.write("\n")
+
+                file.write("Job Lots:"+"\n" + "_" * 160 + "\n" + job_lot_section.getvalue())
+                if not summary_only:
+                    file.write("\n\nItems in Each Job Lot:\n" + "_" * 161 + "\n" + item_section.getvalue())
+                    file.write("\n\nProducts used to calculate item info:\n" + "_" * 161 + "\n" + product_section.getvalue())
 
     def write_progress(self, job_lot):
         """
@@ -286,15 +433,16 @@ class FileHandler:
                 - items.txt: job lot + items
                 - products.txt: job lot + items + products
         """
-        with open("./Extracted_Info/job_lots.txt", "a", encoding="utf-8") as file:
-            self.write_job_lot(job_lot, file)
-            file.close()
-        with open("./Extracted_Info/items.txt", "a", encoding="utf-8") as file:
-            self.write_item(job_lot, file)
-            file.close()
-        with open("./Extracted_Info/products.txt", "a", encoding="utf-8") as file:
-            self.write_product(job_lot, file)
-            file.close()
+        with self.file_lock:
+            with open("./Extracted_Info/job_lots.txt", "a", encoding="utf-8") as file:
+                self.write_job_lot(job_lot, file)
+                file.close()
+            with open("./Extracted_Info/items.txt", "a", encoding="utf-8") as file:
+                self.write_item(job_lot, file)
+                file.close()
+            with open("./Extracted_Info/products.txt", "a", encoding="utf-8") as file:
+                self.write_product(job_lot, file)
+                file.close()
 
     def write_job_lot(self, job_lot, file):
         """
@@ -348,8 +496,8 @@ class FileHandler:
         """
         CURRENT_TIME = datetime.now().strftime("%H-%M-%S")
         os.makedirs(f'./Extracted_Info/{CURRENT_DATE}', exist_ok=True)
-        f = open(f"./Extracted_Info/{CURRENT_DATE}/{CURRENT_TIME}.txt", "a")
-        f.write("No data yet.\n")
+        with open(f"./Extracted_Info/{CURRENT_DATE}/{CURRENT_TIME}.txt", "a") as f:
+            f.write("No data yet.\n")
 
     def get_auto_searches(self):
         """
@@ -384,19 +532,58 @@ class FileHandler:
             - Writes `new_searches` to the file if provided.
             - Prints a status message indicating whether the searches were updated.
         """
-        if new_searches:
-            with open("./Operations/searches.txt", "w", encoding="utf-8") as f:
-                f.write(new_searches)
-            print("Searches updated.")
-        else:
-            print("Searches unchanged.")
+        with self.file_lock:
+            if new_searches:
+                with open("./Operations/searches.txt", "w", encoding="utf-8") as f:
+                    f.write(new_searches)
+                print("Searches updated.")
+            else:
+                print("Searches unchanged.")
+
+    def get_search_watermarks(self):
+        """
+        Read the per-search watermarks from ./Operations/search_watermarks.pkl.
+
+        Returns:
+            dict[str, str]: Search term -> creation date (ISO 8601, as returned by
+                the Browse API) of the newest listing already discovered for it;
+                empty if none are saved yet.
+        """
+        try:
+            with self.file_lock:
+                with open("./Operations/search_watermarks.pkl", "rb") as f:
+                    return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return {}
+
+    def update_search_watermarks(self, watermarks):
+        """
+        Merge new watermarks into ./Operations/search_watermarks.pkl, keeping the
+        newer date per search (another process may have advanced it meanwhile).
+
+        Args:
+            watermarks (dict[str, str]): Search term -> newest discovered date.
+        """
+        if not watermarks:
+            return
+        try:
+            with self.file_lock:
+                saved = self.get_search_watermarks()
+                for search, watermark in watermarks.items():
+                    if watermark > saved.get(search, ""):
+                        saved[search] = watermark
+                with open("./Operations/search_watermarks.pkl.tmp", "wb") as f:
+                    pickle.dump(saved, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace("./Operations/search_watermarks.pkl.tmp", "./Operations/search_watermarks.pkl")
+        except OSError as ex:
+            print("Error during updating search watermarks:", ex)
 
 
 
 if __name__ == "__main__":
     file_handler = FileHandler()
-    lots = file_handler.load_object("./Operations/all_job_lots.pkl")
-    lot = lots[222]
+    with file_handler.open_stream("./Operations/all_job_lots.pkl") as lots:
+        lot = lots[222]
     print(f"lot id: {lot.id}, lot listing price: {lot.buy_listing_price}, lot postage price: {lot.postage_price}")
     # objects_to_remove = [
     #     "110 Cosmetic Wholesale Makeup skincare Joblot Beauty Bundle Make up NEW",
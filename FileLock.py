@@ -0,0 +1,178 @@
+"""
+Advisory inter-process lock for the Operations store.
+
+Several auto-search workers may run at once against the same ./Operations
+directory. Every read-modify-write of the pickle streams, the existence index and
+the text reports must then be serialized across processes, not just across the
+threads of one process. `FileLock` does this with an OS advisory lock on a lock
+file (`fcntl.flock` on POSIX, `msvcrt.locking` on Windows):
+
+    with FileLock():                      # ./Operations/.lock
+        ...read, modify and replace store files...
+
+- The lock is re-entrant within a process: a thread holding it can call other
+  locked code (e.g. `JobLotsCreator.commit` holding it around several
+  `FileHandler` calls that each take it too). Other threads of the same process
+  wait on an in-process lock, so the OS lock is taken once per process.
+- The lock file is only ever opened, never written, and its handle is closed as
+  soon as the outermost holder releases it.
+- The lock is advisory: it only protects against code that takes it too, which is
+  every `FileHandler` mutation and load.
+- If the holding process dies, the OS releases its lock.
+
+`stress_test()` checks the store under many concurrent writer processes (see
+tests/test_FileLock.py).
+"""
+
+import os
+import pickle
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+
+    LOCK_PATH = "./Operations/.lock"
+
+    # Per lock file: in-process lock, open handle and nesting depth of its holder.
+    states = {}
+    states_lock = threading.Lock()
+
+    def __init__(self, path=LOCK_PATH):
+        """
+        Args:
+            path (str): Lock file (created if missing). Locks on the same path
+                exclude each other, in this process and in others.
+        """
+        self.path = os.path.abspath(path)
+        with self.states_lock:
+            self.state = self.states.setdefault(self.path, {"lock": threading.RLock(), "file": None, "depth": 0})
+
+
+    def acquire(self):
+        state = self.state
+        state["lock"].acquire()
+        if state["depth"] == 0:
+            try:
+                file = open(self.path, "a+b")
+                try:
+                    if fcntl is not None:
+                        fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+                    else:
+                        file.seek(0)
+                        # LK_LOCK gives up after 10 attempts; keep trying.
+                        while True:
+                            try:
+                                msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+                                break
+                            except OSError:
+                                pass
+                except BaseException:
+                    file.close()
+                    raise
+            except BaseException:
+                state["lock"].release()
+                raise
+            state["file"] = file
+        state["depth"] += 1
+
+
+    def release(self):
+        state = self.state
+        state["depth"] -= 1
+        if state["depth"] == 0:
+            file, state["file"] = state["file"], None
+            try:
+                if fcntl is not None:
+                    fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+                else:
+                    file.seek(0)
+                    msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+            finally:
+                file.close()
+        state["lock"].release()
+
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+def stress_worker(directory, lot_ids):
+    """
+    One writer process of `stress_test`: stores the lots in `lot_ids` that are
+    not stored yet, through `JobLotsCreator`, in `directory`.
+    """
+    os.chdir(directory)
+    from JobLot import JobLot
+    from JobLotsCreator import JobLotsCreator
+
+    creator = JobLotsCreator()
+    for lot_id in lot_ids:
+        if not creator.check_job_lot_exists(lot_id, 10.0, 0.0):
+            creator.write(JobLot(
+                "Job Lot", lot_id, f"Lot {lot_id}", "",
+                buy_listing_price=10.0, rating=float(lot_id), accuracy_score=1.0,
+            ))
+    creator.commit()
+
+
+def stress_test(workers=8, lots=400):
+    """
+    Run `workers` processes that all try to store the same `lots` job lots (in
+    different orders) into one fresh Operations directory, then check the store:
+    every stream must unpickle completely, and every lot must be in the "all" and
+    "working" streams and the existence index exactly once.
+
+    Returns:
+        dict: Lots found per stream, duplicates, missing lots and seconds taken.
+    """
+    import random
+    import shutil
+    import tempfile
+    import time
+    from collections import Counter
+    from multiprocessing import get_context
+
+    directory = tempfile.mkdtemp(prefix="job_lot_stress_")
+    lot_ids = list(range(lots))
+    orders = [random.Random(worker).sample(lot_ids, lots) for worker in range(workers)]
+    start = time.perf_counter()
+    processes = [get_context("spawn").Process(target=stress_worker, args=(directory, order)) for order in orders]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    seconds = time.perf_counter() - start
+
+    result = {"seconds": seconds, "failed_workers": sum(process.exitcode != 0 for process in processes)}
+    try:
+        for stream in ("all_job_lots.pkl", "working_job_lots.pkl", "job_lot_index.pkl"):
+            records = []
+            with open(os.path.join(directory, "Operations", stream), "rb") as f:
+                while True:
+                    try:
+                        record = pickle.load(f)
+                    except EOFError:
+                        break
+                    # The index also holds the store states it covers (dicts).
+                    if not isinstance(record, dict):
+                        records.append(record)
+            counts = Counter(record[0] if isinstance(record, tuple) else str(record.id) for record in records)
+            result[stream] = {
+                "records": len(records),
+                "duplicates": sum(count - 1 for count in counts.values()),
+                "missing": len({str(lot_id) for lot_id in lot_ids} - set(counts)),
+            }
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return result
@@ -0,0 +1,96 @@
+"""
+Copy-on-write views over `Item` and `Product` objects.
+
+The filter and scoring passes only ever change a couple of fields on the goods
+they work on (`variant_name`, `brand_name`, `accuracy_score`, ...), yet they used
+to `copy.deepcopy` the whole object for every filter scheme, including an item's
+full `products` list. A `GoodView` instead keeps a reference to the base good and
+stores only the fields written through it:
+
+- Reading an attribute returns the view's own value if it was set, otherwise the
+  base good's value.
+- Writing an attribute (including `+=`/`*=`) only ever touches the view.
+- Methods of the base class (e.g. `Item.add_product`) run against the view, so
+  they see and mutate the view's fields rather than the base good's.
+
+Mutable fields are shared with the base good unless overridden, so a view that
+needs its own list (e.g. an item's `products`) must be given one on creation.
+Views are throwaway working copies: anything that is stored or pickled (e.g. the
+scored products kept on an item) should still be a real `Item`/`Product`;
+`copy()` on a view returns one.
+"""
+
+import copy
+
+
+class GoodView:
+
+    def __init__(self, base, **overrides):
+        object.__setattr__(self, "base", base)
+        object.__setattr__(self, "overrides", overrides)
+
+
+    def __getattr__(self, name):
+        # Only called for names not found on the view itself.
+        overrides = object.__getattribute__(self, "overrides")
+        if name in overrides:
+            return overrides[name]
+        base = object.__getattribute__(self, "base")
+        root = base
+        while isinstance(root, GoodView):
+            root = object.__getattribute__(root, "base")
+        attribute = getattr(type(root), name, None)
+        if callable(attribute):
+            # Bind base-class methods to the view so `self.<field>` resolves here.
+            return attribute.__get__(self)
+        return getattr(base, name)
+
+
+    def __setattr__(self, name, value):
+        self.overrides[name] = value
+
+
+    def view(self, **overrides):
+        return GoodView(self, **overrides)
+
+
+    def copy(self):
+        """
+        A real good of the base class holding the view's current values, copied
+        the way the base class copies (e.g. `Item.copy` is deep). Copying the view
+        object itself would share its `overrides` with the copy.
+        """
+        views = []
+        root = self
+        while isinstance(root, GoodView):
+            views.append(root)
+            root = object.__getattribute__(root, "base")
+        good = copy.copy(root)
+        # Innermost view first, so the outer views' values win.
+        for view in reversed(views):
+            for name, value in object.__getattribute__(view, "overrides").items():
+                setattr(good, name, value)
+        return good.copy()
+
+
+    def __str__(self):
+        root = self.base
+        while isinstance(root, GoodView):
+            root = root.base
+        return type(root).__str__(self)
+
+
+if __name__ == "__main__":
+    from Product import Product
+
+    product = Product("Rose Body Butter 50ml", "web_url", variant_name="Rose Body Butter 50ml")
+    filtered_product = product.view()
+    filtered_product.variant_name = "Rose Butter"
+    filtered_product.accuracy_score *= .5
+    print(f"Base: {product.variant_name}, {product.accuracy_score}")
+    print(f"View: {filtered_product.variant_name}, {filtered_product.accuracy_score}")
+
+    scored_product = filtered_product.copy()
+    scored_product.accuracy_score = 10
+    assert type(scored_product) is Product and scored_product.variant_name == "Rose Butter"
+    assert filtered_product.accuracy_score == product.accuracy_score * .5
@@ -1,6 +1,7 @@
 import copy
 from dataclasses import dataclass, field
 from typing import List, Any
+from GoodView import GoodView
 
 @dataclass
 class Item:
@@ -23,12 +24,19 @@ class Item:
     postage_price: float = 0.0
     price_quality: float = 0.0
     num_products: int = 0
+    # Set when the item was priced from `PriceIndex` rather than a live search;
+    # its products are then earlier observations, not new ones.
+    priced_from_index: bool = False
 
 
     def copy(self):
         return copy.deepcopy(self)
 
 
+    def view(self, **overrides):
+        return GoodView(self, **overrides)
+
+
     def add_product(self, product):
         self.products.append(product)
 
@@ -249,6 +249,136 @@ def adjust_accuracy_for_diffs(item, working_accuracy, accuracy_score):
     item.accuracy_score = accuracy_score * (accuracy_dif ** (1 - (STANDARDIZE_STRENGTH / 100)))
 
 
+# ------------------------------------------------------------------
+# Pool (NumPy) versions of the functions above.
+#
+# These take a `CandidatePool` and index arrays into it instead of lists of
+# products, and produce the same item fields and product prices as their list
+# counterparts: sorts are stable, sums keep the list order and rounding goes
+# through `round_prices`. A list that the list version extends or sorts in place
+# is returned as a new index array instead.
+# ------------------------------------------------------------------
+
+def calculate_price_and_score90_pool(item, pool, accuracy90):
+    """
+    Pool version of `calculate_price_and_score90`.
+    """
+    closest_price = float(pool.total_price[accuracy90[0]])
+
+    postage_prices = pool.postage_price[accuracy90]
+    postage_prices = postage_prices[postage_prices > 0]
+    estimated_postage_price = sum(postage_prices.tolist()) / len(postage_prices) if len(postage_prices) else 0
+
+    accuracies = np.sort(pool.accuracy_score[accuracy90], kind="stable").tolist()
+    accuracy_score = sum(accuracies) / len(accuracies)
+    accuracy_score *= (accuracies[-1] / max(1, accuracies[0])) ** 0.5
+
+    item.sell_price = round(closest_price, 2)
+    item.accuracy_score = round(accuracy_score, 2)
+    item.postage_price = round(estimated_postage_price, 2)
+    item.num_products = len(accuracy90)
+
+
+def calculate_price_and_score_pool(item, pool, accuracy_above, working_accuracy, score):
+    """
+    Pool version of `calculate_price_and_score`.
+
+    Returns:
+        np.ndarray: `working_accuracy` as the list version leaves it (extended with
+        the doubled above-set and the temp anchor, then sorted when attributes are set).
+    """
+    item.num_products = len(working_accuracy)
+
+    if len(accuracy_above) or score <= 30:
+        products_below = np.flatnonzero(pool.accuracy_score[:pool.size] > score * PRODUCTS_BELOW_MULTIPLIER)
+        products_below = products_below[np.argsort(pool.total_price[products_below], kind="stable")]
+
+        if not len(products_below) and score != 0:
+            return working_accuracy
+
+        products_below_prices = pool.total_price[products_below].tolist()
+        postage_below_prices = pool.postage_price[products_below].tolist()
+        products_below_prices_median = (
+            products_below_prices[(len(products_below_prices) // 2) - 1]
+            if len(products_below_prices) > 1 else (products_below_prices[0] if products_below_prices else 0)
+        )
+        products_below_postage_prices_median = (
+            postage_below_prices[(len(postage_below_prices) // 2) - 1]
+            if len(postage_below_prices) > 1 else (postage_below_prices[0] if postage_below_prices else 0)
+        )
+
+        if len(accuracy_above) > 0:
+            price_above_mean = round(float(np.mean(pool.total_price[accuracy_above] + pool.postage_price[accuracy_above])), 2)
+            temp_product_total_price = round(
+                products_below_prices_median + abs((products_below_prices_median - price_above_mean) / 2), 2
+            )
+            temp_product_postage_price = 0
+        else:
+            temp_product_total_price = products_below_prices_median
+            temp_product_postage_price = products_below_postage_prices_median
+
+        temp_product = pool.add_row(temp_product_total_price, temp_product_postage_price, score)
+        working_accuracy = np.concatenate([working_accuracy, accuracy_above, accuracy_above, [temp_product]]).astype(np.intp)
+
+    if len(working_accuracy) >= WORKING_ACC_MINIMUM_LENGTH or score == 0:
+        working_accuracy = set_item_attributes_pool(item, pool, working_accuracy)
+    else:
+        item.sell_price = 0
+        item.accuracy_score = 0
+        item.postage_price = 0
+        item.num_products = 0
+    return working_accuracy
+
+
+def set_item_attributes_pool(item, pool, working_accuracy):
+    """
+    Pool version of `set_item_attributes`. Returns `working_accuracy` sorted by price.
+
+    The list version patches a product once per occurrence in the working set and
+    once more through `item.products`; each patch only reads that product's own
+    prices, so rows are patched in rounds by occurrence count.
+    """
+    working_accuracy = working_accuracy[np.argsort(pool.total_price[working_accuracy], kind="stable")]
+
+    postage_prices = pool.postage_price[working_accuracy]
+    postage_prices = postage_prices[postage_prices > 0]
+    avg_postage_price = float(postage_prices[len(postage_prices) // CHEAPNESS_AGGRESSION]) if len(postage_prices) else 0
+
+    occurrences = np.bincount(working_accuracy, minlength=len(pool.total_price))
+    occurrences[:pool.size] += 1
+    for patch_round in range(int(occurrences.max(initial=0))):
+        pool.patch(np.flatnonzero(occurrences > patch_round), avg_postage_price)
+
+    closest_price = float(pool.buy_price[working_accuracy[len(working_accuracy) // CHEAPNESS_AGGRESSION]]) if len(working_accuracy) else 0
+
+    accuracies = pool.accuracy_score[working_accuracy].tolist()
+    accuracy_score = sum(accuracies) / len(accuracies) if accuracies else 0
+
+    adjust_accuracy_for_diffs_pool(item, pool, working_accuracy, accuracy_score)
+
+    item.sell_price = round(closest_price, 2)
+    item.accuracy_score = round(item.accuracy_score, 2)
+    item.postage_price = round(avg_postage_price, 2)
+    return working_accuracy
+
+
+def adjust_accuracy_for_diffs_pool(item, pool, working_accuracy, accuracy_score):
+    """
+    Pool version of `adjust_accuracy_for_diffs`.
+    """
+    accuracies = pool.accuracy_score[working_accuracy]
+    max_accuracy = float(accuracies.max()) if len(accuracies) else 1
+    min_accuracy = float(accuracies.min()) if len(accuracies) else 1
+
+    if min_accuracy == 0:
+        min_accuracy = 1
+    if max_accuracy == 0:
+        max_accuracy = 1
+
+    accuracy_dif = min_accuracy / max_accuracy if len(working_accuracy) else 1
+    item.accuracy_score = accuracy_score * (accuracy_dif ** (1 - (STANDARDIZE_STRENGTH / 100)))
+
+
 def calculate_buyer_protection_fee(item):
     """
     Apply a buyer-protection fee schedule to `item.sell_price`.
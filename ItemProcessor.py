@@ -6,11 +6,18 @@ This module orchestrates the end-to-end flow of:
 4) creating Product objects from raw eBay results,
 5) scoring, aggregating, and estimating prices + postage,
 6) computing final accuracy and listing estimates for the Item.
+With a `PriceIndex`, items priced recently enough are estimated from the stored
+history instead (steps 1 and 3-5 are skipped), and items priced by a live search
+are added to the index. With a `SearchMissCache`, items whose last full search
+found no usable listings are searched once, without the fallback searches.
 This module processes items by fetching product data from eBay, estimating prices, and calculating accuracy scores.
 """
 
 
 import re
+import time
+import heapq
+import threading
 import ItemCalculator as calc
 from ItemCleaner import ItemCleaner
 from BeautyProductProcessor import BeautyProductProcessor
@@ -24,6 +31,7 @@ from Item import Item
 from Product import Product
 from FilterScheme import FilterScheme
 from TokenSet import TokenSet
+from CandidatePool import CandidatePool
 
 class ItemProcessor():
 
@@ -33,6 +41,20 @@ class ItemProcessor():
             FilterScheme(word_type=("NOUN", "PROPN"), weight=1.7),
             FilterScheme(word_type=("NOUN",), weight=3.0),
         ]
+
+    # Minimum share of the item's brand/variant tokens a raw listing title must
+    # contain to be cleaned and scored at all. On the recorded job lots every
+    # listing below 0.1 ended with an accuracy score of 0.
+    PREFILTER_MIN_OVERLAP = 0.1
+
+    # Items with at least this many candidate products are priced on a NumPy
+    # `CandidatePool`; below it, plain lists are faster.
+    POOL_MIN_CANDIDATES = 20
+
+    # Candidate listings taken from each eBay search of an item. Up to the
+    # Browse API's page size this is one request; larger caps page through the
+    # results (see `search_listings`).
+    MAX_LISTINGS = 10
     
     def __init__(
         self,
@@ -43,14 +65,42 @@ class ItemProcessor():
         product_processor=None,
         cleaner=None,
         word_filterer=None,
+        price_index=None,
+        search_miss_cache=None,
     ):
-        self.ebay_request_handler = ebay_request_handler or EbayRequestHandler()
+        # Created on first use: scoring-only processors (e.g. `ScoringFarm` workers)
+        # never search eBay and so never authenticate.
+        self._ebay_request_handler = ebay_request_handler
         self.currency_converter = currency_converter or CurrencyConverter()
         self.item_name_extractor = item_name_extractor or ItemNameExtractor()
         self.product_processor = product_processor or ProductProcessor()
         self.cleaner = cleaner or ItemCleaner()
         self.word_filterer = word_filterer or WordFilterer()
         self.unit_converter = unit_converter or UnitConvertor()
+        # Opt-in: consulted before any eBay search (see `estimate_from_index`).
+        self.price_index = price_index
+        # Opt-in: items that recently found nothing skip the fallback searches.
+        self.search_miss_cache = search_miss_cache
+        # Running totals for the candidate pre-filter (see `prefilter_products`).
+        self.prefilter_stats = {"candidates": 0, "pruned": 0, "seconds_saved": 0.0}
+        # Items may be processed concurrently (see `LotProcessor`), so counters
+        # and the lazily created request handler are locked.
+        self.stats_lock = threading.Lock()
+        self.handler_lock = threading.Lock()
+
+
+    @property
+    def ebay_request_handler(self):
+        if self._ebay_request_handler is None:
+            with self.handler_lock:
+                if self._ebay_request_handler is None:
+                    self._ebay_request_handler = EbayRequestHandler()
+        return self._ebay_request_handler
+
+
+    @ebay_request_handler.setter
+    def ebay_request_handler(self, ebay_request_handler):
+        self._ebay_request_handler = ebay_request_handler
 
 
     def process(self, item, params=None):
@@ -62,20 +112,88 @@ class ItemProcessor():
         """
         
         print(f"Processing item: {item.name}")
+        if self.estimate_from_index(item):
+            return
+        found_products = self.fetch_listings(item, params)
+        self.process_listings(item, found_products)
+        if self.price_index is not None:
+            self.price_index.add_item(item)
+        if self.search_miss_cache is not None:
+            self.search_miss_cache.record(item)
+
+
+    def estimate_from_index(self, item):
+        """
+        Price `item` from `self.price_index` without searching eBay, if the index
+        has enough recent high-accuracy listings for it.
+
+        The item is cleaned and its measurements parsed as in `process_listings`
+        (on a copy first, to compute the index key); on a hit the indexed listings
+        become its products and are priced by `set_item_info` and
+        `calc.set_scores` like live ones.
+
+        Returns:
+            bool: True if the item was priced from the index.
+        """
+        if self.price_index is None:
+            return False
+        products = self.price_index.lookup(self.cleaned_copy(item))
+        if products is None:
+            return False
+
+        self.cleaner.clean(item)
+        self.set_measurements(item)
+        item.products = sorted(products, key=lambda x: x.accuracy_score, reverse=True)
+        item.priced_from_index = True
+        self.set_item_info(item)
+        calc.set_scores(item)
+        print(f"Estimated {item.name} from {len(products)} indexed listings")
+        return True
+
+
+    def cleaned_copy(self, item):
+        """
+        A copy of `item` cleaned and with its measurements parsed as in
+        `process_listings`, for computing the `PriceIndex`/`SearchMissCache` key
+        before the item itself is cleaned.
+        """
+        cleaned = item.copy()
+        self.cleaner.clean(cleaned)
+        self.set_measurements(cleaned)
+        return cleaned
+
+
+    def fetch_listings(self, item, params):
+        """
+        Searches eBay for candidate listings of `item` (network only, no scoring).
+
+        Starts with the given filters and, while fewer than 3 listings are found,
+        widens the search (any location, then the other condition), tagging the
+        extra listings with `acc_penalty`/`price_penalty`. Items the search miss
+        cache holds as recent misses only get the first search.
+
+        Returns:
+            list[dict]: Raw `itemSummaries` entries.
+        """
+        miss_key = self.search_miss_cache.key(self.cleaned_copy(item)) if self.search_miss_cache is not None else None
 
-        # Fetch up to 10 candidate listings from eBay (using the original item name).
-        response_data = self.ebay_request_handler.get_items(f"q={item.name}&limit=10", params=",".join(params.values()))
-        found_products = response_data.get('itemSummaries', [])
+        # Fetch up to MAX_LISTINGS candidate listings from eBay (using the original item name).
+        found_products = self.search_listings(item, params)
         num_products_found = len(found_products)
         original_params = params.copy()
+        calls = 1
 
         penalty = 0
 
+        if num_products_found < 3 and miss_key is not None and self.search_miss_cache.is_miss(miss_key):
+            print(f"Skipping fallback searches for {item.name}: no usable listings found recently")
+            return found_products
+
         if num_products_found < 3:
             params.pop("deliveryCountry")
             params.pop("itemLocationCountry")
-            response_data = self.ebay_request_handler.get_items(f"q={item.name}&limit=10", params=",".join(params.values()))
-            found_products2 = response_data.get('itemSummaries', [])
+            found_products2 = self.search_listings(item, params)
+            calls += 1
             for found_product in found_products2:
                 found_product['acc_penalty'] = 0.1
                 found_product.get('shippingOptions', {})[0].get('shippingCost', {}).get('value') == 0 if found_product.get('shippingOptions', {}) and found_product.get('shippingOptions', {})[0].get('shippingCost', {}).get('value') else None
@@ -91,8 +209,8 @@ class ItemProcessor():
                 elif original_params['conditions'] == "conditions:{USED}":
                     params['conditions'] = "conditions:{NEW}"
                     penalty = 0.6
-                response_data = self.ebay_request_handler.get_items(f"q={item.name}&limit=10", params=",".join(params.values()))
-                found_products3 = response_data.get('itemSummaries', [])
+                found_products3 = self.search_listings(item, params)
+                calls += 1
                 for found_product in found_products3:
                     found_product['acc_penalty'] = penalty
                     found_product['price_penalty'] = penalty
@@ -107,15 +225,39 @@ class ItemProcessor():
                     elif original_params['conditions'] == "conditions:{USED}":
                         params['conditions'] = "conditions:{NEW}"
                         penalty = 0.6
-                    response_data = self.ebay_request_handler.get_items(f"q={item.name}&limit=10", params=",".join(params.values()))
-                    found_products3 = response_data.get('itemSummaries', [])
+                    found_products3 = self.search_listings(item, params)
+                    calls += 1
                     for found_product in found_products3:
                         found_product['acc_penalty'] = penalty + 0.1
                         found_product['price_penalty'] = penalty
                     found_products.extend(found_products3)
                     num_products_found = len(found_products)
-                
 
+        if miss_key is not None:
+            self.search_miss_cache.searched(miss_key, calls)
+        return found_products
+
+
+    def search_listings(self, item, params):
+        """
+        One eBay search for `item` with the filters in `params`: its first
+        `MAX_LISTINGS` raw listings, streamed page by page.
+
+        Returns:
+            list[dict]: Raw `itemSummaries` entries.
+        """
+        return list(self.ebay_request_handler.iter_items(
+            f"q={item.name}", params=",".join(params.values()), max_results=self.MAX_LISTINGS
+        ))
+
+
+    def process_listings(self, item, found_products):
+        """
+        CPU-bound half of `process`: cleans the item, then parses, cleans, filters and
+        scores the raw listings fetched by `fetch_listings` and sets the item's price
+        and accuracy fields. Makes no eBay requests, so it can run in worker
+        processes (see `ScoringFarm`).
+        """
         # Normalize the item in-place (e.g., stripping noise, standardizing brand/variant).
         self.cleaner.clean(item)
 
@@ -125,14 +267,31 @@ class ItemProcessor():
         # Build multiple filtered variants of the name to improve matching robustness later.
         filtered_items = self.filter_name(item)
 
+        # Drop listings that share too few tokens with the item before any costly work.
+        num_candidates = len(found_products)
+        found_products = self.prefilter_products(item, found_products)
+        num_pruned = num_candidates - len(found_products)
+        start = time.perf_counter()
+
+        # Parse, convert and clean each raw listing once; every variant reuses them.
+        prepared_products = self.prepare_products(item, found_products)
+
         # Seed initial products for the original item based on the fetched listings.
-        self.initialize_products(item, found_products)
+        self.initialize_products(item, prepared_products)
 
         # For each filtered variant, also initialize products and compute item-level info.
         for filtered_item in filtered_items:
-            self.initialize_products(filtered_item[0], found_products)
+            self.initialize_products(filtered_item[0], prepared_products)
             self.set_item_info(filtered_item[0])
 
+        # Estimate the time saved from the per-listing cost of the listings we kept.
+        elapsed = time.perf_counter() - start
+        with self.stats_lock:
+            self.prefilter_stats["candidates"] += num_candidates
+            self.prefilter_stats["pruned"] += num_pruned
+            if found_products:
+                self.prefilter_stats["seconds_saved"] += num_pruned * elapsed / len(found_products)
+
         # Combine (weighted) signals from the filtered variants back into the original item.
         self.set_average_item_info(item, filtered_items)
 
@@ -149,7 +308,8 @@ class ItemProcessor():
         filtered_items = []
 
         for scheme in self.FILTERSCHEMES:
-            filtered_item = item.copy()
+            # Filtered items get their own products list; everything else is shared.
+            filtered_item = item.view(products=list(item.products))
             self.word_filterer.filter_item(filtered_item, scheme.word_type)
             filtered_items.append((filtered_item, scheme.weight))
 
@@ -202,22 +362,98 @@ class ItemProcessor():
         item.measurements = measurements
 
 
-    def initialize_products(self, item, found_products):
+    def prefilter_products(self, item, found_products):
         """
-        For each raw found product dict from eBay, build a Product object and add it to the item.
-        Finally, sort all products by accuracy_score descending so top matches come first.
+        Cheap blocking stage run before any listing is cleaned or scored.
+
+        Builds an inverted index (token -> listing positions) over the raw titles of
+        the found listings, then walks the postings of the item's brand/variant tokens
+        to count how many of them each title contains. Listings whose share of the
+        item's tokens is below `PREFILTER_MIN_OVERLAP` are dropped.
+
+        Returns:
+            list[dict]: The listings worth cleaning and scoring, in their original order.
         """
+        item_token_set = TokenSet(good=item)
+        item_tokens = {
+            token for token in item_token_set.brand_name_normalized + item_token_set.variant_name_normalized
+            if any(char.isalnum() for char in token)
+        }
+        if not item_tokens:
+            return found_products
+
+        index = {}
+        for position, found_product in enumerate(found_products):
+            for token in self.tokenize_title(found_product.get('title') or ""):
+                index.setdefault(token, set()).add(position)
+
+        overlaps = [0] * len(found_products)
+        for token in item_tokens:
+            for position in index.get(token, ()):
+                overlaps[position] += 1
+
+        return [
+            found_product for found_product, overlap in zip(found_products, overlaps)
+            if overlap / len(item_tokens) >= self.PREFILTER_MIN_OVERLAP
+        ]
+
+
+    def tokenize_title(self, title):
+        """
+        Returns the set of normalized word/number tokens of a raw listing title,
+        normalized the same way as `TokenSet` (lowercase words, "1.50" -> "1.5").
+        """
+        tokens = set()
+        for token in re.findall(r'\d+(?:\.\d+)?|[^\W\d_]+', title):
+            try:
+                tokens.add(str(float(token)).rstrip("0").rstrip("."))
+            except ValueError:
+                tokens.add(token.lower())
+        return tokens
+
+
+    def prepare_products(self, item, found_products):
+        """
+        Build and clean a Product for each raw found product dict from eBay.
+
+        This covers everything that does not depend on which item variant is being
+        scored (JSON parsing, currency conversion, cleaning, tokenization), so it runs
+        once per listing rather than once per filtered item.
+
+        Returns:
+            list[tuple[Product, TokenSet]]: Cleaned products paired with their tokens.
+        """
+        # The cleaner reads postage from the products seen so far via `item.products`.
+        item.products = []
         for found_product in found_products:
-            product = self.create_product(item, found_product)
+            product = self.create_product(found_product)
+            self.product_processor.clean_product(item, product)
+            item.add_product(product)
+
+        prepared_products = [(product, TokenSet(good=product)) for product in item.products]
+        item.products = []
+        return prepared_products
+
+
+    def initialize_products(self, item, prepared_products):
+        """
+        Score a copy of each prepared product against `item` and add it to the item.
+        Finally, sort all products by accuracy_score descending so top matches come first.
+        """
+        products = [prepared_product.copy() for prepared_product, _ in prepared_products]
+        product_token_sets = [product_token_set for _, product_token_set in prepared_products]
+        # All candidates are scored against the item in one vectorized batch.
+        self.product_processor.score_batch(item, products, product_token_sets)
+        for product in products:
             item.add_product(product)
 
         item.products = list(sorted(item.products, key=lambda x: x.accuracy_score, reverse=True))
 
 
-    def create_product(self, item, found_product):
+    def create_product(self, found_product):
         """
-        Maps eBay response fields into a Product, converts prices to a base currency,
-        and runs downstream product-specific processing to compute accuracy and prices.
+        Maps eBay response fields into a Product and converts prices to a base currency.
+        Cleaning and scoring are left to `ProductProcessor` (see `prepare_products`).
         """
         acc_penalty = found_product.get('acc_penalty', 0)
         price_penalty = found_product.get('price_penalty', 0)
@@ -245,9 +481,6 @@ class ItemProcessor():
             postage_price=postage_price,
             accuracy_score=(1 - acc_penalty) * 100,  # Initial accuracy before product-level processing.
         )
-
-        # Compute product-level scores/fields (e.g., accuracy_score, buy_price).
-        self.product_processor.process(item, product)
         return product
 
 
@@ -259,6 +492,49 @@ class ItemProcessor():
         - If the 90+ bucket is sufficiently large (>=6), use it for initial estimates.
         - Otherwise, walk down through adjacent buckets and let ItemCalculator derive
         sell_price/accuracy based on available data.
+
+        Both implementations give identical results; the NumPy pool only pays off
+        once an item has `POOL_MIN_CANDIDATES` products (see `CandidatePool.benchmark`).
+        """
+        if len(item.products) >= self.POOL_MIN_CANDIDATES:
+            self.set_item_info_from_pool(item)
+        else:
+            self.set_item_info_from_lists(item)
+
+
+    def set_item_info_from_pool(self, item):
+        """
+        `set_item_info` on a `CandidatePool` (NumPy arrays of the products' prices and
+        scores) with index arrays as the per-threshold buckets.
+        """
+        if not item.products:
+            item.accuracy_score = 0
+            return
+
+        pool = CandidatePool(item.products)
+        accuracy_nums = tuple(range(90, -5, -5))
+        all_accuracies = pool.thresholds(accuracy_nums)
+
+        if len(all_accuracies[0]) >= 6:
+            calc.calculate_price_and_score90_pool(item, pool, all_accuracies[0])
+            return
+
+        try:
+            for i in range(len(all_accuracies)-1):
+                all_accuracies[i+1] = calc.calculate_price_and_score_pool(item, pool, all_accuracies[i], all_accuracies[i+1], 90 - (i * 5))
+                if item.sell_price > 0:
+                    calc.calculate_buyer_protection_fee(item)
+                    calc.calculate_postage_price(item)
+                    item.total_price = round(item.sell_price + item.postage_price + item.buyer_protection_fee, 2)
+                    return
+        finally:
+            # Products see the same patched prices the list version leaves on them.
+            pool.write_back()
+
+
+    def set_item_info_from_lists(self, item):
+        """
+        `set_item_info` on lists of `Product` objects, one sorted list per threshold.
         """
         if not item.products:
             item.accuracy_score = 0
@@ -266,7 +542,7 @@ class ItemProcessor():
         
         closest_price, accuracy_score = 0, 0
         accuracy_nums = tuple(range(90, -5, -5))
-        all_accuracies = [self.create_accuracy(score, item) for score in accuracy_nums]
+        all_accuracies = self.create_accuracies(accuracy_nums, item)
 
         # If we have a healthy 90+ set, evaluate estimates there.
         if len(all_accuracies[0]) >= 6:
@@ -298,6 +574,37 @@ class ItemProcessor():
         return accuracy_sorted
 
 
+    def create_accuracies(self, scores, item):
+        """
+        Same lists as `[self.create_accuracy(score, item) for score in scores]`, built
+        in one sweep over descending `scores`.
+
+        Products are sorted by accuracy once. Each lower threshold only adds the
+        products between it and the previous threshold, which are merged into the
+        previous price-ordered list instead of re-filtering and re-sorting every
+        product. Ties on price keep `item.products` order, as the stable sort did.
+
+        Each threshold gets its own list object, since `ItemCalculator` extends them.
+        """
+        ranked = sorted(enumerate(item.products), key=lambda pair: pair[1].accuracy_score, reverse=True)
+        price_order = lambda pair: (pair[1].total_price, pair[0])
+
+        accuracies = []
+        accuracy_sorted = []
+        position = 0
+        for score in scores:
+            added = []
+            while position < len(ranked) and ranked[position][1].accuracy_score >= score:
+                added.append(ranked[position])
+                position += 1
+            if added:
+                added.sort(key=price_order)
+                accuracy_sorted = list(heapq.merge(accuracy_sorted, added, key=price_order))
+            accuracies.append([product for _, product in accuracy_sorted])
+
+        return accuracies
+
+
 if __name__ == "__main__":
     # Example usage: run this module directly to process a sample item
     # and print out the scored candidate products.
@@ -316,6 +623,8 @@ if __name__ == "__main__":
         print(f"{n}. Product: {product.name}, Listing Price: {product.total_price}, Buy Price: {product.buy_price}, Postage Price: {product.postage_price}, Accuracy Score: {product.accuracy_score}, web_url: {product.web_url}\n")
         n += 1
     print(item)
+    stats = item_processor.prefilter_stats
+    print(f"Pre-filter pruned {stats['pruned']} of {stats['candidates']} listings, saving ~{stats['seconds_saved']:.2f}s")
 
     # To do: match conditions of job lot to product conditions and filter out products that 
     # do not match.
@@ -22,6 +22,7 @@ class JobLot:
     accuracy_score: float = 0
     rating: float = 0
     date_created: str = None
+    search: str = None
 
     def get_item_info(self):
         for item in self.get_items():
@@ -0,0 +1,286 @@
+"""
+Persistent existence index for stored job lots.
+
+`JobLotsCreator.check_job_lot_exists` only needs to know whether a lot with a
+given (id, listing price, postage price) has been stored before, but answering
+that from ./Operations/all_job_lots.pkl means unpickling every stored job lot,
+item and product for every lot a search returns. `JobLotIndex` keeps just those
+keys instead:
+
+- Keys are `(str(id), buy_listing_price, postage_price)`, matching the comparison
+  the old check made (ids are compared as strings).
+- The index lives in ./Operations/job_lot_index.pkl as a pickled stream of keys
+  (and of the store states they cover, as dicts), so recording a new lot is a
+  single append.
+- It is loaded once per process and shared by every `JobLotIndex` for the same
+  file; lookups are set membership.
+- The index records which state of all_job_lots.pkl its keys cover (its size and
+  a hash of its last `TAIL_BYTES`). If the store only grew since (the usual case,
+  as commits copy it and append), just the appended lots are read; the keys of
+  lots committed by this process are already in the index. It is rebuilt from
+  all_job_lots.pkl when the index file is missing or the store was rewritten
+  (e.g. by `FileHandler.remove_object`), or on demand with `rebuild()`.
+  `SqliteFileHandler` leaves all_job_lots.pkl alone, so it calls `rebuild()`
+  itself after deleting or replacing stored lots.
+- Other processes may add keys while this one runs; `refresh()` reads the keys
+  appended since this process last read the file. Reads and writes of the index
+  file hold the store's `FileLock`.
+"""
+
+import hashlib
+import os
+import pickle
+import threading
+from FileLock import FileLock
+
+
+class JobLotIndex:
+
+    STORE_PATH = "./Operations/all_job_lots.pkl"
+    INDEX_PATH = "./Operations/job_lot_index.pkl"
+
+    # Bytes at the end of the store hashed to tell a store that was appended to
+    # from one that was rewritten.
+    TAIL_BYTES = 4096
+
+    # Loaded key sets, shared per index file so each process reads it only once,
+    # which file (inode) and how many bytes of it each set reflects, and which
+    # store state (size, tail hash) the keys cover.
+    loaded = {}
+    read_to = {}
+    covers = {}
+    lock = threading.RLock()
+
+    def __init__(self, store_path=STORE_PATH, index_path=INDEX_PATH, file_handler=None):
+        """
+        Args:
+            store_path (str): Pickled stream of stored job lots the index describes.
+            index_path (str): Pickled stream of index keys.
+            file_handler (FileHandler | None): If given, rebuilds load the stored
+                lots through it (e.g. from `SqliteFileHandler`) instead of reading
+                `store_path` directly.
+        """
+        self.store_path = store_path
+        self.index_path = index_path
+        self.file_handler = file_handler
+        self.file_lock = FileLock()
+
+
+    @staticmethod
+    def key(id, listing_price, postage_price):
+        return (str(id), listing_price, postage_price)
+
+
+    @property
+    def keys(self):
+        """
+        The set of stored keys, loaded (or rebuilt) on first use.
+        """
+        keys = self.loaded.get(self.index_path)
+        if keys is None:
+            keys = self.load()
+        return keys
+
+
+    def contains(self, id, listing_price, postage_price):
+        return self.key(id, listing_price, postage_price) in self.keys
+
+
+    def add(self, job_lot):
+        """
+        Record a job lot that has just been appended to the store.
+        """
+        key = self.key(job_lot.id, job_lot.buy_listing_price, job_lot.postage_price)
+        keys = self.keys
+        with self.file_lock, self.lock:
+            if key in keys:
+                return
+            keys.add(key)
+            self.append_records([key])
+
+
+    def append_records(self, records):
+        with open(self.index_path, "ab") as f:
+            # Only skip ahead if nothing was appended by another process since.
+            at_end = self.read_to.get(self.index_path) == (os.fstat(f.fileno()).st_ino, f.tell())
+            for record in records:
+                pickle.dump(record, f, protocol=pickle.HIGHEST_PROTOCOL)
+            if at_end:
+                self.read_to[self.index_path] = (os.fstat(f.fileno()).st_ino, f.tell())
+
+
+    def load(self):
+        """
+        Read the keys from the index file and bring them up to date with the
+        store (see `catch_up`), rebuilding the index if it is missing or the
+        store was rewritten, and make them the loaded keys.
+
+        Returns:
+            set[tuple]: The stored keys.
+        """
+        with self.file_lock, self.lock:
+            keys = set()
+            self.covers.pop(self.index_path, None)
+            if os.path.exists(self.index_path):
+                self.read_keys(keys, 0)
+            if not os.path.exists(self.index_path) or not self.catch_up(keys):
+                keys = self.write_index(self.read_store())
+            self.loaded[self.index_path] = keys
+            return keys
+
+
+    def refresh(self):
+        """
+        Add the keys other processes appended to the index file since this
+        process last read it (or reload it if it was rebuilt meanwhile).
+
+        Returns:
+            set[tuple]: The stored keys.
+        """
+        with self.file_lock, self.lock:
+            keys = self.loaded.get(self.index_path)
+            inode, read_to = self.read_to.get(self.index_path, (None, 0))
+            # A rebuilt index is a new file (see `write_index`); offsets into the
+            # old one mean nothing in it.
+            if keys is None or not os.path.exists(self.index_path) or os.stat(self.index_path).st_ino != inode:
+                return self.load()
+            self.read_keys(keys, read_to)
+            if not self.catch_up(keys):
+                keys = self.loaded[self.index_path] = self.write_index(self.read_store())
+            return keys
+
+
+    def read_keys(self, keys, start):
+        with open(self.index_path, "rb") as f:
+            f.seek(start)
+            while True:
+                try:
+                    record = pickle.load(f)
+                except EOFError:
+                    break
+                # Store states are dicts (see `write_index`); everything else is a key.
+                if isinstance(record, dict):
+                    self.covers[self.index_path] = record["store"]
+                else:
+                    keys.add(record)
+            self.read_to[self.index_path] = (os.fstat(f.fileno()).st_ino, f.tell())
+
+
+    def catch_up(self, keys):
+        """
+        Add the keys of lots appended to the store since the state the index
+        covers, to `keys` and to the index file, with the new store state.
+
+        Returns:
+            bool: False if the store was rewritten (or the index records no
+            state), so the index has to be rebuilt.
+        """
+        covered = self.covers.get(self.index_path)
+        state = self.store_state()
+        if state == covered:
+            return True
+        if covered is None or state is None:
+            return False
+        size, digest = covered
+        if state[0] < size or self.tail_digest(size) != digest:
+            return False
+        new_keys = []
+        with open(self.store_path, "rb") as f:
+            f.seek(size)
+            while f.tell() < state[0]:
+                job_lot = pickle.load(f)
+                key = self.key(job_lot.id, job_lot.buy_listing_price, job_lot.postage_price)
+                if key not in keys:
+                    keys.add(key)
+                    new_keys.append(key)
+        self.append_records(new_keys + [{"store": state}])
+        self.covers[self.index_path] = state
+        return True
+
+
+    def store_state(self):
+        """
+        (size, hash of the last `TAIL_BYTES`) of the store, or None if there is none.
+        """
+        if not os.path.exists(self.store_path):
+            return None
+        size = os.path.getsize(self.store_path)
+        return (size, self.tail_digest(size))
+
+
+    def tail_digest(self, size):
+        start = max(size - self.TAIL_BYTES, 0)
+        with open(self.store_path, "rb") as f:
+            f.seek(start)
+            return hashlib.sha1(f.read(size - start)).hexdigest()
+
+
+    def rebuild(self):
+        """
+        Rebuild the index file from the store and replace the loaded keys.
+
+        Returns:
+            int: Number of keys in the rebuilt index.
+        """
+        with self.file_lock, self.lock:
+            keys = self.write_index(self.read_store())
+            self.loaded[self.index_path] = keys
+        return len(keys)
+
+
+    def read_store(self):
+        keys = set()
+        if self.file_handler is not None:
+            for job_lot in self.file_handler.load_object(self.store_path):
+                keys.add(self.key(job_lot.id, job_lot.buy_listing_price, job_lot.postage_price))
+            return keys
+        if not os.path.exists(self.store_path):
+            return keys
+        with open(self.store_path, "rb") as f:
+            while True:
+                try:
+                    job_lot = pickle.load(f)
+                except EOFError:
+                    break
+                keys.add(self.key(job_lot.id, job_lot.buy_listing_price, job_lot.postage_price))
+        return keys
+
+
+    def write_index(self, keys):
+        state = self.store_state()
+        temp_path = f"{self.index_path}.tmp"
+        with open(temp_path, "wb") as f:
+            for key in keys:
+                pickle.dump(key, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump({"store": state}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            self.read_to[self.index_path] = (os.fstat(f.fileno()).st_ino, f.tell())
+        os.replace(temp_path, self.index_path)
+        self.covers[self.index_path] = state
+        return keys
+
+
+if __name__ == "__main__":
+    import time
+
+    index = JobLotIndex()
+    print(f"Rebuilt index with {index.rebuild()} keys")
+
+    # Compare against the old check, which unpickled the whole store per lookup.
+    from FileHandler import FileHandler
+    file_handler = FileHandler()
+    job_lots = file_handler.load_object(JobLotIndex.STORE_PATH)
+    lookups = [(job_lot.id, job_lot.buy_listing_price, job_lot.postage_price) for job_lot in job_lots[:20]]
+
+    start = time.perf_counter()
+    for id, listing_price, postage_price in lookups:
+        any(
+            str(job_lot.id) == str(id) and job_lot.buy_listing_price == listing_price and job_lot.postage_price == postage_price
+            for job_lot in file_handler.load_object(JobLotIndex.STORE_PATH)
+        )
+    scan_seconds = time.perf_counter() - start
+
+    JobLotIndex.loaded.clear()
+    start = time.perf_counter()
+    found = sum(JobLotIndex().contains(*lookup) for lookup in lookups)
+    index_seconds = time.perf_counter() - start
+    print(f"{len(lookups)} lookups: full scan {scan_seconds:.3f}s, index {index_seconds:.4f}s ({found} found)")
@@ -3,9 +3,11 @@ Job lot creation and persistence utilities.
 
 This module defines `JobLotsCreator`, a coordinator responsible for:
 - (Placeholder) creating job lots via `create()` (currently unimplemented),
-- checking if a stored job lot with a given id exists,
-- writing a job lot to persistent collections while avoiding duplicates,
-  and ensuring the "working" collection is sorted.
+- checking if a stored job lot with a given id exists (via `JobLotIndex`),
+- writing job lots to persistent collections while avoiding duplicates:
+  lots are buffered and committed in batches with one atomic rewrite per file,
+  and the sorted text report of the "working" collection is regenerated at
+  checkpoints and when a run is flushed.
 
 File storage layout
 -------------------
@@ -19,30 +21,41 @@ LotProcessor
 FileHandler
     - load_object(path) -> Any
         Loads and returns a Python object (typically a list of job lots).
-    - append_object(path, obj) -> None
-        Appends `obj` to the serialized collection at `path`.
-    - write_sorted(path) -> None
-        Sorts and persists the collection at `path`. The sort criteria
-        are defined within `FileHandler`.
+    - commit_objects(path, objs) -> bool
+        Atomically appends `objs` to the serialized collection at `path`.
+    - file_lock
+        Re-entrant inter-process lock (`FileLock`) over the Operations store.
+    - write_sorted(path, top_k=None, summary_only=False) -> None
+        Writes the sorted text report of the collection at `path`. The sort
+        criteria are defined within `FileHandler`.
 ItemNameExtractor
     Utility for extracting item names (initialized but not used here).
+JobLotIndex
+    - contains(id, listing_price, postage_price) -> bool
+    - add(job_lot) -> None
+    - refresh() -> set
+        Persistent (id, listing price, postage price) index of the stored lots,
+        kept in ./Operations/job_lot_index.pkl.
 
 Assumptions & caveats
 ---------------------
 - `check_job_lot_exists` gracefully handles a missing all_job_lots file by
-  returning False.
+  returning False (the index is then empty).
 - `write` assumes the pickle files exist or that `FileHandler` can handle
   creation on demand.
-- Membership checks (`if job_lot not in ...`) rely on the job lot object's
-  equality semantics (`__eq__`); if not implemented, duplicates may still
-  occur across sessions or processes.
-- No concurrency/atomicity guarantees: simultaneous writers could race.
+- Duplicates are detected by (id, listing price, postage price) key.
+- Lots still pending when the process dies are lost; creation runs call
+  `flush()` when they finish.
+- Each batch commit is atomic and holds the Operations `FileLock` for its whole
+  read-modify-write, so several processes can write to the same store; a lot
+  another process stored while this one was processing it is not stored twice.
 """
 
 import os
 from LotProcessor import LotProcessor
 from FileHandler import FileHandler
 from ItemNameExtractor import ItemNameExtractor
+from JobLotIndex import JobLotIndex
 
 
 class JobLotsCreator:
@@ -51,10 +64,21 @@ class JobLotsCreator:
     and persistence into "all" and "working" collections on disk.
     """
 
-    def __init__(self):
+    # Lots buffered by `write` before they are committed to disk.
+    BATCH_SIZE = 10
+    # Commits between regenerations of the text report during a run.
+    CHECKPOINT_BATCHES = 5
+
+    def __init__(self, file_handler=None):
         """
         Initialize collaborators.
 
+        Parameters
+        ----------
+        file_handler : FileHandler | None
+            Storage backend for the job lot collections. Defaults to the pickle
+            streams of `FileHandler`; `SqliteFileHandler` keeps them in SQLite.
+
         Attributes
         ----------
         lot_processor : LotProcessor
@@ -63,10 +87,22 @@ class JobLotsCreator:
             Persistence helper for reading/writing pickled collections.
         item_name_extractor : ItemNameExtractor
             Helper for extracting/normalizing item names (not used here).
+        job_lot_index : JobLotIndex
+            Existence index of the lots in './Operations/all_job_lots.pkl'.
+        pending : list
+            Lots written since the last commit (see `write`).
         """
         self.lot_processor = LotProcessor()
-        self.file_handler = FileHandler()
+        self.file_handler = file_handler or FileHandler()
         self.item_name_extractor = ItemNameExtractor()
+        self.job_lot_index = JobLotIndex(file_handler=self.file_handler)
+        self.pending = []
+        self.pending_keys = set()
+        # Keys of pending lots that were already in the index when queued (e.g.
+        # custom lots, whose ids repeat across runs); only keys other processes
+        # add after that make `commit` drop a lot.
+        self.pending_known_keys = set()
+        self.batches_since_report = 0
 
     def create(self):
         """
@@ -94,65 +130,180 @@ class JobLotsCreator:
         Returns
         -------
         bool
-            True if a job lot with a matching id exists in
-            './Operations/all_job_lots.pkl'; False otherwise.
+            True if a job lot with a matching id, listing price and postage
+            price exists in './Operations/all_job_lots.pkl'; False otherwise.
 
         Notes
         -----
-        - If the file doesn't exist, the method returns False.
-        - Uses string comparison (`str(job_lot.id) == str(id)`) to tolerate
-          type differences (e.g., int vs. str).
+        - Answered from `self.job_lot_index`, which is loaded once per process
+          (and rebuilt from the store if missing or out of date), rather than
+          by unpickling the whole store for every lot.
+        - Lots written but not yet committed also count as existing.
+        - If the store doesn't exist, the method returns False.
+        - Ids are compared as strings to tolerate type differences
+          (e.g., int vs. str).
         """
-        if os.path.exists("./Operations/all_job_lots.pkl"):
-            job_lots = self.file_handler.load_object("./Operations/all_job_lots.pkl")
-            for job_lot in job_lots:
-                if str(job_lot.id) == str(id) and job_lot.buy_listing_price == listing_price and job_lot.postage_price == postage_price:
-                    return True
-        return False
+        if JobLotIndex.key(id, listing_price, postage_price) in self.pending_keys:
+            return True
+        return self.job_lot_index.contains(id, listing_price, postage_price)
     
     def write(self, job_lot):
         """
-        Append `job_lot` to persistent collections if not already present,
-        and ensure the working set is sorted.
+        Queue `job_lot` for the persistent collections.
 
         Behavior
         --------
-        - Loads './Operations/all_job_lots.pkl' and appends `job_lot` if absent.
-        - Loads './Operations/working_job_lots.pkl' and appends `job_lot` if absent.
-        - Calls `write_sorted('./Operations/working_job_lots.pkl')` to persist a
-          sorted working list.
+        - Lots are buffered in `self.pending` and committed `BATCH_SIZE` at a
+          time by `commit`, so a run no longer reloads and rewrites both pickle
+          files for every lot.
+        - Every `CHECKPOINT_BATCHES` commits the summary section of the text
+          report is regenerated (a checkpoint); the full report is only written
+          by `flush`, which every creation run calls when it ends.
+        - A lot whose key is already pending is ignored.
+        - Whether the lot's key was already in the existence index is noted,
+          so `commit` only drops lots another process stores after this point.
 
         Parameters
         ----------
         job_lot : Any
-            The lot object to store. Membership checks rely on `==` semantics.
+            The lot object to store.
+        """
+        key = JobLotIndex.key(job_lot.id, job_lot.buy_listing_price, job_lot.postage_price)
+        if key in self.pending_keys:
+            print("Job lot is already pending, discarding")
+            return
+        self.pending.append(job_lot)
+        self.pending_keys.add(key)
+        if key in self.job_lot_index.keys:
+            self.pending_known_keys.add(key)
+        if len(self.pending) >= self.BATCH_SIZE:
+            self.commit()
+            if self.batches_since_report >= self.CHECKPOINT_BATCHES:
+                self.write_report(summary_only=True)
+
+    def commit(self):
+        """
+        Commit the pending lots to the "all" and "working" collections.
 
-        Side Effects
-        ------------
-        - Reads and writes to the pickle files in ./Operations/.
-        - May create or modify these files depending on `FileHandler` behavior.
+        Behavior
+        --------
+        - All pending lots are appended to './Operations/all_job_lots.pkl'
+          and recorded in the existence index (callers check existence before
+          processing a lot, and pending lots are already de-duplicated).
+        - Lots rated at least -100 whose key is not already in
+          './Operations/working_job_lots.pkl' are appended to it.
+        - Each file gets one atomic temp-file + rename
+          (`FileHandler.commit_objects`), so a crash leaves either none or all
+          of the batch in it.
+        - If a commit fails, the pending lots are kept for the next attempt.
+        - The whole commit holds the store's `FileLock`. Under it the existence
+          index is refreshed with keys other processes added, and pending lots
+          they have stored since the lot was queued are dropped. Lots whose key
+          was already stored when they were queued (custom lots reuse ids
+          -1, -2, ... across runs) are stored again, as before batching.
 
         Caveats
         -------
-        - Not atomic; concurrent writers can cause race conditions.
-        - Duplicate detection is based on list membership (`in`), which depends
-          on `__eq__` of `job_lot`. If equality isn't defined, duplicates may slip in.
+        - Duplicates are detected by (id, listing price, postage price) key, as
+          in `check_job_lot_exists`, rather than by object equality.
+        """
+        if not self.pending:
+            return
+        with self.file_handler.file_lock:
+            stored_keys = self.job_lot_index.refresh()
+            new_job_lots = []
+            for job_lot in self.pending:
+                key = JobLotIndex.key(job_lot.id, job_lot.buy_listing_price, job_lot.postage_price)
+                if key in stored_keys and key not in self.pending_known_keys:
+                    print("Job lot was stored by another process, discarding")
+                else:
+                    new_job_lots.append(job_lot)
+            if new_job_lots and not self.file_handler.commit_objects("./Operations/all_job_lots.pkl", new_job_lots):
+                return
+            for job_lot in new_job_lots:
+                self.job_lot_index.add(job_lot)
+
+            working_keys = {
+                JobLotIndex.key(job_lot.id, job_lot.buy_listing_price, job_lot.postage_price)
+                for job_lot in self.file_handler.load_object("./Operations/working_job_lots.pkl")
+            }
+            working_job_lots = []
+            for job_lot in new_job_lots:
+                key = JobLotIndex.key(job_lot.id, job_lot.buy_listing_price, job_lot.postage_price)
+                if job_lot.rating < -100:
+                    print("Rating is too low, discarding")
+                elif key in working_keys:
+                    print("Job lot is already in working set, discarding")
+                else:
+                    working_job_lots.append(job_lot)
+            if not self.file_handler.commit_objects("./Operations/working_job_lots.pkl", working_job_lots):
+                return
+        print(f"Info has been updated ({len(working_job_lots)} job lots)")
+
+        self.pending.clear()
+        self.pending_keys.clear()
+        self.pending_known_keys.clear()
+        self.batches_since_report += 1
+
+    def flush(self):
+        """
+        End of a run: commit whatever is pending and regenerate the text report.
+        """
+        self.commit()
+        self.write_report()
+
+    def write_report(self, summary_only=False):
+        """
+        Regenerate the sorted text report of the working set (checkpoints only
+        write the job lot summary; the full report is written by `flush`).
         """
-        all_job_lots = self.file_handler.load_object("./Operations/all_job_lots.pkl")
-        if job_lot not in all_job_lots:
-            self.file_handler.append_object("./Operations/all_job_lots.pkl", job_lot)
-        working_job_lots = self.file_handler.load_object("./Operations/working_job_lots.pkl")
-        if job_lot.rating < -100:
-            print("Rating is too low, discarding")
-        elif job_lot in working_job_lots:
-            print("Job lot is already in working set, discarding")
-        else:
-            self.file_handler.append_object("./Operations/working_job_lots.pkl", job_lot)
-            print("Info has been updated")
-
-        self.file_handler.write_sorted('./Operations/working_job_lots.pkl')
+        self.file_handler.write_sorted('./Operations/working_job_lots.pkl', summary_only=summary_only)
+        self.batches_since_report = 0
+
+def repeat_custom_lot_test():
+    """
+    Store two custom lots with the same key (custom lots are numbered -1, -2, ...
+    afresh every run, and have no listing price) in two runs against a fresh
+    Operations directory, refreshing the working set between them as
+    `CustomJobLotsCreator` does. Both must be stored, and the second must be in
+    the working set.
+
+    Returns:
+        dict: Names of the lots in the "all" and "working" streams.
+    """
+    import shutil
+    import tempfile
+    from JobLot import JobLot
+
+    directory = tempfile.mkdtemp(prefix="job_lot_custom_")
+    cwd = os.getcwd()
+    os.chdir(directory)
+    try:
+        for run in range(2):
+            creator = JobLotsCreator()
+            creator.file_handler.refresh_working_job_lots()
+            creator.write(JobLot(
+                "custom", -1, f"custom run {run}", "NA", "Custom image",
+                buy_listing_price=0.0, postage_price=1.55, rating=1.0, accuracy_score=1.0,
+            ))
+            creator.commit()
+        return {
+            stream: [job_lot.name for job_lot in creator.file_handler.load_object(f"./Operations/{stream}_job_lots.pkl")]
+            for stream in ("all", "working")
+        }
+    finally:
+        os.chdir(cwd)
+        JobLotIndex.loaded.clear()
+        JobLotIndex.read_to.clear()
+        JobLotIndex.covers.clear()
+        shutil.rmtree(directory, ignore_errors=True)
+
 
 if __name__ == "__main__":
+    stored = repeat_custom_lot_test()
+    assert stored == {"all": ["custom run 0", "custom run 1"], "working": ["custom run 1"]}, stored
+    print("Repeated custom lot ids are stored:", stored)
+
     creator = JobLotsCreator()
     # Example usage (uncomment to test):
     exists = creator.check_job_lot_exists('v1|267075364121|0', 28.79, 0.0)
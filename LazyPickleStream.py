@@ -0,0 +1,210 @@
+"""
+Offset-indexed, lazily unpickled view of a pickle-stream file.
+
+`FileHandler.load_object` unpickles every record of a stream into a list, even
+when the caller only wants one lot (or just the ids). `LazyPickleStream` keeps a
+sidecar index of where each record starts and ends, maps the file with `mmap`,
+and only unpickles a record when it is asked for:
+
+    with LazyPickleStream("./Operations/all_job_lots.pkl") as lots:
+        lot = lots[222]                    # unpickles one record
+        versions = lots.find("v1|...|0")   # every record with that id
+        names = lots.names                 # from the index, nothing unpickled
+
+Sidecar index
+-------------
+`<file>.idx` holds, per record, its byte range and its `id`/`name` (as strings),
+plus a fingerprint (offset and hash) of the last indexed record:
+
+- If the stream only grew since the index was written (the last indexed record
+  is still where it was, byte for byte), only the new tail is scanned. This is
+  the usual case, since the stores are only ever appended to or copied-then-
+  appended (`FileHandler.commit_objects`).
+- Otherwise (the stream was rewritten, e.g. by `remove_object`), the index is
+  rebuilt from scratch.
+
+Building or extending the index unpickles each new record once, one at a time,
+so memory stays at one record whatever the size of the stream.
+"""
+
+import hashlib
+import mmap
+import os
+import pickle
+from collections.abc import Sequence
+
+
+class LazyPickleStream(Sequence):
+
+    INDEX_SUFFIX = ".idx"
+
+    def __init__(self, filename):
+        """
+        Open `filename` and bring its sidecar index up to date.
+
+        Args:
+            filename (str): Path to a pickle-stream file.
+        """
+        self.filename = filename
+        self.index_filename = filename + self.INDEX_SUFFIX
+        self.file = open(filename, "rb")
+        size = os.fstat(self.file.fileno()).st_size
+        # mmap cannot map an empty file.
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self.offsets, self.ids, self.record_names = self.load_index()
+
+
+    def __len__(self):
+        return len(self.offsets)
+
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        start, end = self.offsets[position]
+        return pickle.loads(self.data[start:end])
+
+
+    def __iter__(self):
+        for start, end in self.offsets:
+            yield pickle.loads(self.data[start:end])
+
+
+    @property
+    def names(self):
+        """
+        The `name` of every record, in stream order, read from the index.
+        """
+        return list(self.record_names)
+
+
+    def positions(self, id):
+        """
+        Positions of the records whose `id` equals `id` (compared as strings).
+        """
+        id = str(id)
+        return [position for position, record_id in enumerate(self.ids) if record_id == id]
+
+
+    def find(self, id):
+        """
+        Every record with the given `id`, oldest first; only those are unpickled.
+        """
+        return [self[position] for position in self.positions(id)]
+
+
+    def raw(self, position):
+        """
+        The pickled bytes of one record, e.g. to copy it to another stream
+        without unpickling it.
+        """
+        start, end = self.offsets[position]
+        return self.data[start:end]
+
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.file.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+    def load_index(self):
+        """
+        Read the sidecar index and extend it (or rebuild it) to match the stream.
+
+        Returns:
+            tuple[list, list, list]: Record byte ranges, ids and names.
+        """
+        offsets, ids, names = [], [], []
+        try:
+            with open(self.index_filename, "rb") as f:
+                index = pickle.load(f)
+            if self.fingerprint(index["offsets"]) == index["fingerprint"]:
+                offsets, ids, names = index["offsets"], index["ids"], index["names"]
+        except (OSError, EOFError, KeyError, pickle.UnpicklingError):
+            pass
+
+        scan_from = offsets[-1][1] if offsets else 0
+        if scan_from < len(self.data):
+            self.scan(scan_from, offsets, ids, names)
+            self.write_index(offsets, ids, names)
+        elif scan_from > len(self.data):
+            # The fingerprint matched but the stream is shorter; treat as rewritten.
+            offsets, ids, names = [], [], []
+            self.scan(0, offsets, ids, names)
+            self.write_index(offsets, ids, names)
+        return offsets, ids, names
+
+
+    def scan(self, start, offsets, ids, names):
+        """
+        Unpickle records from byte `start` to the end of the stream, one at a
+        time, appending their byte ranges, ids and names.
+        """
+        self.file.seek(start)
+        while True:
+            record_start = self.file.tell()
+            try:
+                obj = pickle.load(self.file)
+            except EOFError:
+                break
+            offsets.append((record_start, self.file.tell()))
+            ids.append(str(obj.id) if hasattr(obj, "id") else None)
+            names.append(getattr(obj, "name", None))
+
+
+    def fingerprint(self, offsets):
+        """
+        Offset and hash of the last record in `offsets`, as found in the stream
+        now; equal to the stored fingerprint only if that record is unchanged.
+        """
+        if not offsets:
+            return None
+        start, end = offsets[-1]
+        if end > len(self.data):
+            return None
+        return (start, end, hashlib.sha1(self.data[start:end]).hexdigest())
+
+
+    def write_index(self, offsets, ids, names):
+        index = {"offsets": offsets, "ids": ids, "names": names, "fingerprint": self.fingerprint(offsets)}
+        temp_filename = f"{self.index_filename}.tmp"
+        try:
+            with open(temp_filename, "wb") as f:
+                pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_filename, self.index_filename)
+        except OSError as ex:
+            # The index is only a cache; the stream can still be read without it.
+            print("Error during writing stream index:", ex)
+
+
+if __name__ == "__main__":
+    import time
+    import tracemalloc
+    from FileHandler import FileHandler
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    lots = FileHandler().load_object("./Operations/all_job_lots.pkl")
+    lot = lots[222]
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    del lots
+    print(f"load_object: lot {lot.id} in {seconds:.3f}s, peak {peak / 1e6:.1f} MB")
+
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    with LazyPickleStream("./Operations/all_job_lots.pkl") as lots:
+        lot = lots[222]
+        versions = len(lots.find(lot.id))
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    print(f"LazyPickleStream: lot {lot.id} ({versions} versions) in {seconds:.3f}s, peak {peak / 1e6:.1f} MB")
@@ -42,6 +42,21 @@ Notes on calculations
   (If buy_listing_price is None, profit defaults to 0.)
 - Rating = round( total_score * profit ** 1.2, 2 ) if profit > 0 else 0
 
+Concurrency
+-----------
+`LotProcessor(max_workers=N)` with N > 1 processes the items of a lot on a
+bounded thread pool (the work is dominated by eBay/currency HTTP waits). All
+threads share the one `BeautyItemProcessor` and its collaborators: the request
+handler and currency converter keep no mutable state, spaCy tagging in
+`WordFilterer` is serialized by a lock, and the item processor's counters are
+updated under a lock. Lot totals are always accumulated afterwards in item
+order, so the results are identical to a serial run.
+
+`LotProcessor(scoring_farm=ScoringFarm(...))` additionally moves the CPU-bound
+scoring into worker processes: listings are fetched in this process, then items
+are scored by the farm. `process_lots` does this for many lots at once, so their
+items are spread across all workers together.
+
 Side effects
 ------------
 - Mutates `jobLot.items` by sorting in descending order of `price_quality`.
@@ -51,6 +66,7 @@ All monetary values are assumed to be in the same currency.
 """
 
 from BeautyItemProcessor import BeautyItemProcessor
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 
@@ -67,11 +83,30 @@ class LotProcessor:
        accuracy_score, rating.
     """
 
-    def __init__(self):
+    def __init__(self, max_workers=None, scoring_farm=None, price_index=None, search_miss_cache=None):
         """
         Initialize the lot processor and its underlying item processor.
+
+        Parameters
+        ----------
+        max_workers : int | None
+            Opt-in: when greater than 1, items are processed concurrently on a
+            thread pool of this size. None or 1 keeps the serial loop.
+        scoring_farm : ScoringFarm | None
+            Opt-in: score items in the farm's worker processes (listings are
+            still fetched here, concurrently when `max_workers` > 1).
+        price_index : PriceIndex | None
+            Opt-in: items with enough recent history are priced from this local
+            index without any eBay request (see `ItemProcessor.estimate_from_index`).
+        search_miss_cache : SearchMissCache | None
+            Opt-in: items whose last full search found no usable listings are
+            searched once, without the fallback searches.
         """
         self.item_processor = BeautyItemProcessor()
+        self.item_processor.price_index = price_index
+        self.item_processor.search_miss_cache = search_miss_cache
+        self.max_workers = max_workers
+        self.scoring_farm = scoring_farm
 
     def process(self, jobLot):
         """
@@ -106,6 +141,80 @@ class LotProcessor:
         # Sort items for presentation/consumption by descending price_quality.
         jobLot.items = sorted(jobLot.items, key=lambda x: x.price_quality, reverse=True)
 
+        # Allow the item processor to fill/adjust item-level fields.
+        if self.scoring_farm is not None:
+            self.score_on_farm([jobLot])
+        elif self.max_workers and self.max_workers > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [executor.submit(self.item_processor.process, item, self.create_params(jobLot)) for item in jobLot.items]
+                for future in futures:
+                    future.result()
+        else:
+            for item in jobLot.items:
+                self.item_processor.process(item, self.create_params(jobLot))
+
+        self.aggregate(jobLot)
+
+
+    def process_lots(self, jobLots):
+        """
+        Process several lots. With a scoring farm, the items of all lots are
+        scored together, spread across every worker process; otherwise each lot
+        goes through `process` in turn.
+        """
+        if self.scoring_farm is None:
+            for jobLot in jobLots:
+                self.process(jobLot)
+            return
+
+        for jobLot in jobLots:
+            jobLot.items = sorted(jobLot.items, key=lambda x: x.price_quality, reverse=True)
+        self.score_on_farm(jobLots)
+        for jobLot in jobLots:
+            self.aggregate(jobLot)
+
+
+    def score_on_farm(self, jobLots):
+        """
+        Fetch listings for every item of `jobLots` here (on a thread pool when
+        `max_workers` > 1), score them in `self.scoring_farm` and put the scored
+        items back on their lots in the same order. Items the price index can
+        estimate are priced here instead.
+        """
+        items = [item for jobLot in jobLots for item in jobLot.items]
+        params = [self.create_params(jobLot) for jobLot in jobLots for _ in jobLot.items]
+        for item in items:
+            print(f"Processing item: {item.name}")
+
+        # Items priced from the price index skip the fetch and the farm.
+        searched = [position for position, item in enumerate(items) if not self.item_processor.estimate_from_index(item)]
+        searched_items = [items[position] for position in searched]
+        searched_params = [params[position] for position in searched]
+
+        if self.max_workers and self.max_workers > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                listings = list(executor.map(self.item_processor.fetch_listings, searched_items, searched_params))
+        else:
+            listings = [self.item_processor.fetch_listings(item, item_params) for item, item_params in zip(searched_items, searched_params)]
+
+        scored_items = list(items)
+        for position, scored_item in zip(searched, self.scoring_farm.score(list(zip(searched_items, listings)))):
+            scored_items[position] = scored_item
+            if self.item_processor.price_index is not None:
+                self.item_processor.price_index.add_item(scored_item)
+            if self.item_processor.search_miss_cache is not None:
+                self.item_processor.search_miss_cache.record(scored_item)
+        position = 0
+        for jobLot in jobLots:
+            jobLot.items = scored_items[position:position + len(jobLot.items)]
+            position += len(jobLot.items)
+
+
+    def aggregate(self, jobLot):
+        """
+        Write the lot-level totals, profit, rating and accuracy onto `jobLot` from
+        its processed items.
+        """
         total_accuracy_score = 0
         total_sell_price = 0
         total_postage_price = 0
@@ -113,18 +222,9 @@ class LotProcessor:
         total_score = 0
         num_items = 0
 
-        # Process each item and accumulate weighted sums.
+        # Accumulate weighted sums in item order, so totals do not depend on which
+        # item finished first.
         for item in jobLot.items:
-            # Allow the item processor to fill/adjust item-level fields.
-            params = {
-                "filter": f"filter=",
-                "buyingOptions": f"buyingOptions:{{FIXED_PRICE}}",
-                "conditions": f"conditions:{jobLot.condition.upper()}",
-                "deliveryCountry": f"deliveryCountry:GB",
-                "itemLocationCountry": f"itemLocationCountry:GB"
-            }
-            self.item_processor.process(item, params)
-
             # Weighted accuracy and scoring by quantity.
             total_accuracy_score += item.accuracy_score * item.quantity
             total_sell_price += (item.sell_price) * item.quantity
@@ -156,4 +256,18 @@ class LotProcessor:
 
         current_date = datetime.now().strftime("%d_%m_%Y")
 
-        jobLot.date_created = current_date
\ No newline at end of file
+        jobLot.date_created = current_date
+
+
+    def create_params(self, jobLot):
+        """
+        Browse API search filters for one item of `jobLot`. A fresh dict per item,
+        since `ItemProcessor.process` pops/overrides keys while widening its search.
+        """
+        return {
+            "filter": f"filter=",
+            "buyingOptions": f"buyingOptions:{{FIXED_PRICE}}",
+            "conditions": f"conditions:{jobLot.condition.upper()}",
+            "deliveryCountry": f"deliveryCountry:GB",
+            "itemLocationCountry": f"itemLocationCountry:GB"
+        }
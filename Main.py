@@ -10,6 +10,7 @@ from CustomJobLotsCreator import CustomJobLotsCreator
 from Item import Item
 from ItemProcessor import ItemProcessor
 from FileHandler import FileHandler
+from ColumnarExporter import ColumnarExporter
 from ItemNameExtractor import ItemNameExtractor
 import GitHandler
 
@@ -26,7 +27,8 @@ Overview
 4) Extract items from eBay links.
 5) Open the folder containing extracted info.
 6) Open local instructions file.
-7) Edit automatic searches used by option (1).
+7) Settings: edit automatic searches used by option (1), or export the stored
+   job lots as columnar tables for analysis.
 8) Exit.
 
 Key behavior & dependencies
@@ -214,11 +216,14 @@ class Main:
 
         elif choice == "7":
             print("1. Edit automatic searches")
-            print("2. Exit settings\n")
-            setting_choice = input("Enter your choice (1 or 2): ")
+            print("2. Export job lot history for analysis")
+            print("3. Exit settings\n")
+            setting_choice = input("Enter your choice (1, 2 or 3): ")
             if setting_choice == "1":
                 self.edit_auto_searches()
             elif setting_choice == "2":
+                self.export_job_lots()
+            elif setting_choice == "3":
                 print("Exiting settings.")
             else:
                 print("Invalid choice.")
@@ -241,14 +246,23 @@ class Main:
         --------
         - Refreshes the working job lots file.
         - Reads newline-separated search terms from `FileHandler.get_auto_searches()`.
-        - For each non-empty term, triggers `EbayJobLotsCreator.create(term, 5)`.
+        - Runs all non-empty terms through `EbayJobLotsCreator.create_pipeline`
+          (3 lots per search), which streams lots through discovery, detail
+          fetching, item extraction, pricing and persistence concurrently.
         """
         self.file_handler.refresh_working_job_lots()
         searches = self.file_handler.get_auto_searches()
-        for search in searches.split("\n"):
-            search = search.strip()
-            if search:
-                self.ebayJobLotsCreator.create(search, 3)
+        searches = [search.strip() for search in searches.split("\n") if search.strip()]
+        self.ebayJobLotsCreator.create_pipeline(searches, 3)
+
+    def export_job_lots(self):
+        """
+        Export ./Operations/all_job_lots.pkl as job lot, item and product tables
+        (Parquet, or CSV without pyarrow) under ./Extracted_Info/Export.
+        """
+        tables = ColumnarExporter(self.file_handler).export()
+        for name, (path, rows) in tables.items():
+            print(f"{name}: {rows} rows -> {path}")
 
     def edit_auto_searches(self):
         """
@@ -0,0 +1,202 @@
+"""
+Staged streaming pipeline built on threads and bounded queues.
+
+A `Pipeline` is a chain of `Stage`s. Each stage has its own input queue (bounded
+by `queue_size`, so a slow stage holds back the ones before it instead of letting
+work pile up) and its own number of worker threads (`concurrency`). Items flow
+from stage to stage as soon as they are ready, so different inputs can be in
+different stages at the same time.
+
+Stage functions
+---------------
+- A normal stage function takes one input and returns one output, or None to
+  drop the input (e.g. a job lot that already exists).
+- A `fan_out` stage function returns an iterable of outputs (e.g. all new lots
+  found by one search). Each output is passed on as soon as the iterable yields
+  it, so a generator's first outputs are being worked on while it produces the
+  rest.
+- An exception drops that input only: it is printed and counted as failed, and
+  the rest of the run carries on. For a `fan_out` stage only the outputs not
+  yet yielded are lost.
+
+Reporting
+---------
+Every stage keeps counts of processed/failed/emitted inputs, its busy time and
+the current and maximum depth of its input queue. `report()` returns these with
+the throughput (inputs per second of wall time); `print_report()` prints them,
+and `run(..., report_interval=N)` also prints them every N seconds while running.
+"""
+
+import queue
+import threading
+import time
+
+
+class Stage:
+
+    def __init__(self, name, function, concurrency=1, queue_size=8, fan_out=False):
+        self.name = name
+        self.function = function
+        self.concurrency = concurrency
+        self.fan_out = fan_out
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.lock = threading.Lock()
+        self.processed = 0
+        self.failed = 0
+        self.emitted = 0
+        self.busy_seconds = 0.0
+        self.max_queue_depth = 0
+
+
+    def put(self, value):
+        self.queue.put(value)
+        with self.lock:
+            self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize())
+
+
+    def record(self, seconds, emitted=0, failed=False):
+        with self.lock:
+            self.processed += 1
+            self.failed += failed
+            self.emitted += emitted
+            self.busy_seconds += seconds
+
+
+class Pipeline:
+
+    # Placed on a stage's queue once per worker thread when its inputs are exhausted.
+    STOP = object()
+
+    def __init__(self, stages):
+        self.stages = stages
+        self.started = None
+        self.finished = None
+
+
+    def run(self, inputs, report_interval=None):
+        """
+        Push every input through all stages and wait until the last stage is done.
+
+        Returns:
+            list: The outputs of the last stage, in completion order.
+        """
+        results = []
+        results_lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.finished = None
+
+        threads = []
+        for position, stage in enumerate(self.stages):
+            next_stage = self.stages[position + 1] if position + 1 < len(self.stages) else None
+            stage_threads = [
+                threading.Thread(target=self.work, args=(stage, next_stage, results, results_lock), daemon=True)
+                for _ in range(stage.concurrency)
+            ]
+            for thread in stage_threads:
+                thread.start()
+            threads.append(stage_threads)
+
+        done = threading.Event()
+        if report_interval:
+            monitor = threading.Thread(target=self.monitor, args=(done, report_interval), daemon=True)
+            monitor.start()
+
+        for value in inputs:
+            self.stages[0].put(value)
+
+        # Stages finish in order: once all of a stage's workers have stopped,
+        # nothing more can reach the next stage.
+        for stage, stage_threads in zip(self.stages, threads):
+            for _ in stage_threads:
+                stage.queue.put(self.STOP)
+            for thread in stage_threads:
+                thread.join()
+
+        done.set()
+        self.finished = time.perf_counter()
+        return results
+
+
+    def work(self, stage, next_stage, results, results_lock):
+        """
+        Worker thread body: take inputs from `stage` until STOP and hand every
+        output to `next_stage` (or to `results` after the last stage).
+        """
+        while True:
+            value = stage.queue.get()
+            if value is self.STOP:
+                return
+            busy_seconds, emitted, failed = 0.0, 0, False
+            start = time.perf_counter()
+            try:
+                output = stage.function(value)
+                outputs = output if stage.fan_out else ([] if output is None else [output])
+                # Time spent waiting for room in the next stage's queue is not busy time.
+                for output in outputs:
+                    busy_seconds += time.perf_counter() - start
+                    self.emit(output, next_stage, results, results_lock)
+                    emitted += 1
+                    start = time.perf_counter()
+            except Exception as e:
+                print(f"Pipeline stage '{stage.name}' failed: {e}")
+                failed = True
+            busy_seconds += time.perf_counter() - start
+            stage.record(busy_seconds, emitted=emitted, failed=failed)
+
+
+    def emit(self, output, next_stage, results, results_lock):
+        if next_stage is not None:
+            next_stage.put(output)
+        else:
+            with results_lock:
+                results.append(output)
+
+
+    def monitor(self, done, report_interval):
+        while not done.wait(report_interval):
+            self.print_report()
+
+
+    def report(self):
+        """
+        Returns:
+            list[dict]: Per stage, in order: name, concurrency, current and max
+            queue depth, processed/failed/emitted counts, busy seconds and
+            throughput (processed inputs per second of pipeline wall time).
+        """
+        elapsed = ((self.finished or time.perf_counter()) - self.started) if self.started else 0
+        return [
+            {
+                "stage": stage.name,
+                "concurrency": stage.concurrency,
+                "queue_depth": stage.queue.qsize(),
+                "max_queue_depth": stage.max_queue_depth,
+                "processed": stage.processed,
+                "failed": stage.failed,
+                "emitted": stage.emitted,
+                "busy_seconds": stage.busy_seconds,
+                "throughput": stage.processed / elapsed if elapsed else 0,
+            }
+            for stage in self.stages
+        ]
+
+
+    def print_report(self):
+        for row in self.report():
+            print(
+                f"{row['stage']:<14} x{row['concurrency']}  queue {row['queue_depth']} (max {row['max_queue_depth']})  "
+                f"done {row['processed']} (failed {row['failed']})  {row['throughput']:.2f}/s  "
+                f"busy {row['busy_seconds']:.1f}s"
+            )
+
+
+if __name__ == "__main__":
+    # Example: three stages with different speeds and concurrency limits.
+    pipeline = Pipeline([
+        Stage("split", lambda n: range(n), concurrency=1, fan_out=True),
+        Stage("slow square", lambda n: time.sleep(0.05) or n * n, concurrency=4),
+        Stage("keep even", lambda n: n if n % 2 == 0 else None, concurrency=1),
+    ])
+    results = pipeline.run([10, 20, 30])
+    print(f"{len(results)} results")
+    pipeline.print_report()
@@ -0,0 +1,234 @@
+"""
+Local price index of every candidate product scored so far.
+
+Each stored job lot already holds, for every item, the eBay listings it was
+priced from with their `accuracy_score`, `total_price`, `buy_price` and
+`postage_price`. `PriceIndex` collects these observations by item, so an item
+that has been priced recently can be priced again without any eBay request:
+
+    price_index = PriceIndex()
+    products = price_index.lookup(item)   # None unless enough recent matches
+    ...
+    price_index.add_item(item)            # after a live search
+
+- Items are keyed by their normalized brand + variant tokens (`TokenSet`, after
+  `ItemCleaner`), as a sorted tuple, so word order and formatting do not matter.
+- Only listings scored at least `MIN_ACCURACY` for the item are kept, one per
+  listing URL (the most recent).
+- `lookup` returns the observations from the last `MAX_AGE_DAYS` days as
+  `Product`s, if there are at least `MIN_OBSERVATIONS` of them: enough for the
+  90+ accuracy band `ItemProcessor.set_item_info` prices from.
+- The index is saved to ./Operations/price_index.pkl with how many records of
+  all_job_lots.pkl it covers (and a hash of the last one). Loading only reads
+  the records stored since, through the stream's offset index; if the store was
+  rewritten (e.g. lots removed), the index is rebuilt.
+- `add_item` adds the listings of an item priced by a live search straight away,
+  so later items in the same run can use them; they reach the saved index through
+  the store once their lot is committed. Items priced from the index itself are
+  marked `priced_from_index` and not re-added, so observations keep their
+  original date and expire after `MAX_AGE_DAYS`.
+"""
+
+import hashlib
+import os
+import pickle
+import threading
+from datetime import date, datetime
+from FileHandler import FileHandler
+from Product import Product
+from TokenSet import TokenSet
+
+
+class PriceIndex:
+
+    STORE_PATH = "./Operations/all_job_lots.pkl"
+    INDEX_PATH = "./Operations/price_index.pkl"
+
+    # Observations needed for an estimate, how old they may be (None = any age;
+    # lots stored before `date_created` existed have no date and never count as
+    # recent) and how well they must match the item.
+    MIN_OBSERVATIONS = 6
+    MAX_AGE_DAYS = 30
+    MIN_ACCURACY = 90
+
+    def __init__(self, file_handler=None, store_path=STORE_PATH, index_path=INDEX_PATH):
+        """
+        Args:
+            file_handler (FileHandler | None): Reads the stored job lots and holds
+                the store's `FileLock` while the index file is written.
+            store_path (str): Stored job lots the index is built from.
+            index_path (str): Saved index.
+        """
+        self.file_handler = file_handler or FileHandler()
+        self.store_path = store_path
+        self.index_path = index_path
+        self.lock = threading.Lock()
+        # key -> {web_url: (day ordinal, accuracy, total price, buy price, postage price, name)}
+        self.observations = None
+        self.stats = {"hits": 0, "misses": 0}
+
+
+    @staticmethod
+    def key(good):
+        token_set = TokenSet(good=good)
+        tokens = token_set.brand_name_normalized + token_set.variant_name_normalized
+        return tuple(sorted({token for token in tokens if any(char.isalnum() for char in token)}))
+
+
+    def lookup(self, item, today=None):
+        """
+        Recent, high-accuracy observations for `item` (cleaned the way
+        `ItemProcessor` cleans it) as products ready to be priced.
+
+        Returns:
+            list[Product] | None: At least `MIN_OBSERVATIONS` products, or None.
+        """
+        today = (today or date.today()).toordinal()
+        key = self.key(item)
+        with self.lock:
+            observations = self.load().get(key, {})
+            recent = [
+                (web_url, observation) for web_url, observation in observations.items()
+                if self.MAX_AGE_DAYS is None
+                or (observation[0] is not None and today - observation[0] <= self.MAX_AGE_DAYS)
+            ]
+            if len(recent) < self.MIN_OBSERVATIONS:
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits"] += 1
+        return [
+            Product(
+                name=name,
+                web_url=web_url,
+                total_price=total_price,
+                buy_price=buy_price,
+                postage_price=postage_price,
+                accuracy_score=accuracy,
+            )
+            for web_url, (_, accuracy, total_price, buy_price, postage_price, name) in recent
+        ]
+
+
+    def add_item(self, item, day=None):
+        """
+        Record the listings an item was just priced from (dated `day`, today by
+        default).
+        """
+        day = (day or date.today()).toordinal()
+        with self.lock:
+            self.add(self.load(), item, day)
+
+
+    def add(self, observations, item, day):
+        matches = {}
+        for product in getattr(item, "products", None) or []:
+            accuracy = getattr(product, "accuracy_score", None)
+            web_url = getattr(product, "web_url", None)
+            if web_url and isinstance(accuracy, (int, float)) and accuracy >= self.MIN_ACCURACY:
+                buy_price = float(getattr(product, "buy_price", 0) or 0)
+                postage_price = float(getattr(product, "postage_price", 0) or 0)
+                # Products stored by older versions have no total price.
+                total_price = float(getattr(product, "total_price", 0) or 0) or round(buy_price + postage_price, 2)
+                matches[web_url] = (day, float(accuracy), total_price, buy_price, postage_price, getattr(product, "name", None))
+        if not matches:
+            return
+        try:
+            key = self.key(item)
+        except (AttributeError, TypeError):
+            # Items from old versions of the models may lack name fields.
+            return
+        current = observations.setdefault(key, {})
+        for web_url, observation in matches.items():
+            previous = current.get(web_url)
+            if previous is None or (previous[0] or 0) <= (observation[0] or 0):
+                current[web_url] = observation
+
+
+    def load(self):
+        """
+        The observations, loaded on first use: the saved index brought up to date
+        with the records stored since it was saved.
+        """
+        if self.observations is not None:
+            return self.observations
+        observations, records, fingerprint = {}, 0, None
+        try:
+            with open(self.index_path, "rb") as f:
+                saved = pickle.load(f)
+            observations, records, fingerprint = saved["observations"], saved["records"], saved["fingerprint"]
+        except (OSError, EOFError, KeyError, pickle.UnpicklingError):
+            pass
+
+        with self.file_handler.open_stream(self.store_path) as stream:
+            if not hasattr(stream, "raw"):
+                # Not a pickle stream (e.g. SQLite): nothing to resume from.
+                observations, records = {}, 0
+            elif records > len(stream) or (records and self.fingerprint(stream, records) != fingerprint):
+                observations, records = {}, 0
+            if records < len(stream):
+                for position in range(records, len(stream)):
+                    self.add_job_lot(observations, stream[position])
+                records = len(stream)
+                if hasattr(stream, "raw"):
+                    self.save(observations, records, self.fingerprint(stream, records))
+        self.observations = observations
+        return observations
+
+
+    def add_job_lot(self, observations, job_lot):
+        try:
+            day = datetime.strptime(job_lot.date_created, "%d_%m_%Y").date().toordinal()
+        except (AttributeError, TypeError, ValueError):
+            day = None
+        for item in getattr(job_lot, "items", None) or []:
+            # Listings of index-priced items are already indexed under the date
+            # they were seen; re-adding them under this lot's date would keep
+            # them from ever expiring.
+            if not getattr(item, "priced_from_index", False):
+                self.add(observations, item, day)
+
+
+    @staticmethod
+    def fingerprint(stream, records):
+        return hashlib.sha1(stream.raw(records - 1)).hexdigest() if records else None
+
+
+    def save(self, observations, records, fingerprint):
+        temp_path = f"{self.index_path}.tmp"
+        try:
+            with self.file_handler.file_lock:
+                with open(temp_path, "wb") as f:
+                    pickle.dump(
+                        {"observations": observations, "records": records, "fingerprint": fingerprint},
+                        f,
+                        protocol=pickle.HIGHEST_PROTOCOL,
+                    )
+                os.replace(temp_path, self.index_path)
+        except OSError as ex:
+            # The index is only a cache; it is rebuilt from the store next time.
+            print("Error during writing price index:", ex)
+
+
+if __name__ == "__main__":
+    import time
+
+    start = time.perf_counter()
+    price_index = PriceIndex()
+    observations = price_index.load()
+    print(f"Loaded {sum(map(len, observations.values()))} observations of {len(observations)} items in {time.perf_counter() - start:.2f}s")
+
+    # How many stored items could have been priced from the index, as of the
+    # newest lot in the store.
+    newest = max(
+        (datetime.strptime(job_lot.date_created, "%d_%m_%Y").date()
+         for job_lot in price_index.file_handler.iter_objects(PriceIndex.STORE_PATH)
+         if isinstance(getattr(job_lot, "date_created", None), str)),
+        default=date.today(),
+    )
+    items = [key for key, by_url in observations.items() if len(by_url) >= PriceIndex.MIN_OBSERVATIONS]
+    print(f"{len(items)} items have at least {PriceIndex.MIN_OBSERVATIONS} matches at {PriceIndex.MIN_ACCURACY}+ accuracy")
+    recent = [
+        key for key, by_url in observations.items()
+        if sum(day is not None and newest.toordinal() - day <= PriceIndex.MAX_AGE_DAYS for day, *_ in by_url.values()) >= PriceIndex.MIN_OBSERVATIONS
+    ]
+    print(f"{len(recent)} of them within {PriceIndex.MAX_AGE_DAYS} days of {newest}")
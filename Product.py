@@ -1,6 +1,7 @@
 import copy
 from dataclasses import dataclass, field
 from typing import List, Any
+from GoodView import GoodView
 
 @dataclass
 class Product:
@@ -21,7 +22,12 @@ class Product:
 
 
     def copy(self):
-        return copy.deepcopy(self)
+        # Every field is an immutable scalar or string, so a shallow copy is a full copy.
+        return copy.copy(self)
+
+
+    def view(self, **overrides):
+        return GoodView(self, **overrides)
 
 
     def __str__(self):
@@ -8,7 +8,7 @@ and contextual cues in the original names (e.g., words like "for" or "with").
 
 Inputs are expected to provide at least:
 - `item.brand_name`, `item.variant_name`, `item.name`, `item.original_brand_name`,
-  `item.original_variant_name`, and `item.copy()`.
+  `item.original_variant_name`, and `item.view()`.
 - `product.brand_name`, `product.variant_name`, `product.name`, `product.original_brand_name`,
   `product.original_variant_name`, and `product.accuracy_score` (float).
 
@@ -16,6 +16,7 @@ No function here returns a final score; instead they **adjust** `product.accurac
 """
 
 import re
+import numpy as np
 from WordFilterer import WordFilterer
 from TokenSet import TokenSet
 
@@ -52,6 +53,15 @@ def set_accuracy(item, product):
     if not is_match:
         calculate_accuracy_no_match(item, product)
 
+def is_exact_match(item, product):
+    """
+    True when `product.variant_name` equals `item.variant_name`, ignoring case.
+
+    This is the "exact class" handled by the first two checks of
+    `calculate_accuracy_is_match`.
+    """
+    return item.variant_name.lower() == product.variant_name.lower()
+
 def calculate_accuracy_is_match(item, product):
     """
     Apply multiplicative score updates for exact and inclusion-style matches
@@ -357,6 +367,141 @@ def calculate_accuracy_no_match( item, product):
             product.accuracy_score *= (P90_CLOSENESS_MATCH_SCORE - .2)
 
 
+# ------------------------------
+# Batch (vectorized) no-match scoring
+# ------------------------------
+# Closeness tiers used by `calculate_accuracy_no_match`, as lookup tables.
+# Tier index: 0 -> < .3, 1 -> < .4, ..., 7 -> >= .9, 8 -> exactly 1.
+CLOSENESS_TIER_BOUNDS = np.array([.3, .4, .5, .6, .7, .8, .9])
+# Columns: numbers in name and (n // 5) < numbers, numbers and (n // 2) < numbers,
+# numbers otherwise, no numbers.
+CLOSENESS_TIER_SCORES = np.array([
+    [.01, .01, .01, .01],
+    [P30_CLOSENESS_MATCH_SCORE, (P30_CLOSENESS_MATCH_SCORE + .02), (P30_CLOSENESS_MATCH_SCORE - .01), (P30_CLOSENESS_MATCH_SCORE - .02)],
+    [P40_CLOSENESS_MATCH_SCORE, (P40_CLOSENESS_MATCH_SCORE + .03), (P40_CLOSENESS_MATCH_SCORE - .02), (P40_CLOSENESS_MATCH_SCORE - .05)],
+    [P50_CLOSENESS_MATCH_SCORE, (P50_CLOSENESS_MATCH_SCORE + .03), (P50_CLOSENESS_MATCH_SCORE - .02), (P50_CLOSENESS_MATCH_SCORE - .05)],
+    [P60_CLOSENESS_MATCH_SCORE, (P60_CLOSENESS_MATCH_SCORE + .03), (P60_CLOSENESS_MATCH_SCORE - .02), (P60_CLOSENESS_MATCH_SCORE - .05)],
+    [P70_CLOSENESS_MATCH_SCORE, (P70_CLOSENESS_MATCH_SCORE + .03), (P70_CLOSENESS_MATCH_SCORE - .02), (P70_CLOSENESS_MATCH_SCORE - .05)],
+    [P80_CLOSENESS_MATCH_SCORE, (P80_CLOSENESS_MATCH_SCORE + .03), (P80_CLOSENESS_MATCH_SCORE - .02), (P80_CLOSENESS_MATCH_SCORE - .2)],
+    [P90_CLOSENESS_MATCH_SCORE, (P90_CLOSENESS_MATCH_SCORE + .03), (P90_CLOSENESS_MATCH_SCORE - .02), (P90_CLOSENESS_MATCH_SCORE - .2)],
+    [EXACT_CLOSENESS_MATCH_SCORE, (EXACT_CLOSENESS_MATCH_SCORE + .05), (EXACT_CLOSENESS_MATCH_SCORE - .05), (EXACT_CLOSENESS_MATCH_SCORE - .25)],
+])
+# Extra factor when the searched number is (tier 1) or is not (tiers 2-7) found.
+CLOSENESS_TIER_NUMBER_PENALTIES = np.array([
+    1, .2, .2, .2, P60_CLOSENESS_MATCH_SCORE * .2, P70_CLOSENESS_MATCH_SCORE * .2, .2, .2, 1
+])
+# Length-difference factors, indexed by min(|delta|, 4) with 0 treated like 4.
+SHORTER_PRODUCT_LENGTH_SCORES = np.array([.8, .97, .92, .87, .8])
+LONGER_PRODUCT_LENGTH_SCORES = np.array([.6, .75, .7, .65, .6])
+
+def set_accuracy_batch(item, products):
+    """
+    Batch counterpart of `set_accuracy` for many products scored against one item.
+
+    Match-based adjustments run per product; every product without a direct or
+    inclusive match is then scored together by `calculate_accuracy_no_match_batch`.
+
+    Side effects:
+        Mutates each `product.accuracy_score` in place.
+    """
+    no_match_products = [product for product in products if not calculate_accuracy_is_match(item, product)]
+    calculate_accuracy_no_match_batch(item, no_match_products)
+
+def calculate_accuracy_no_match_batch(item, products, product_token_sets=None):
+    """
+    Vectorized `calculate_accuracy_no_match` over all `products` of one item.
+
+    Item and product tokens are encoded into a shared vocabulary and turned into a
+    product x vocabulary count matrix. Token overlap, the numeric-token match and
+    the length deltas are then computed for all products at once, and the
+    closeness tiers are read from lookup tables instead of the if/elif chain.
+
+    The context and end adjustments still run per product (they rely on regex and
+    POS lookups). All multipliers are applied in the same order as the scalar path,
+    so scores are identical; `calculate_accuracy_no_match` stays the reference.
+
+    Args:
+        item: The searched item.
+        products (list): Products that had no direct/inclusive match.
+        product_token_sets (list[TokenSet] | None): Tokens per product, if known.
+
+    Side effects:
+        Mutates each `product.accuracy_score` in place.
+    """
+    if not products:
+        return
+
+    item_token_set = TokenSet(good=item)
+    if product_token_sets is None:
+        product_token_sets = [TokenSet(good=product) for product in products]
+
+    for product, product_token_set in zip(products, product_token_sets):
+        adjust_accuracy_for_context(item, product, False)
+        adjust_accuracy_for_end(item, product, item_token_set, product_token_set)
+
+    searched_words = item_token_set.variant_name_normalized
+    vocabulary = {}
+    searched_ids = np.array([vocabulary.setdefault(word, len(vocabulary)) for word in searched_words], dtype=np.intp)
+    rows, cols = [], []
+    for row, product_token_set in enumerate(product_token_sets):
+        for word in product_token_set.variant_name_normalized:
+            rows.append(row)
+            cols.append(vocabulary.setdefault(word, len(vocabulary)))
+    counts = np.zeros((len(products), len(vocabulary)), dtype=np.int64)
+    np.add.at(counts, (np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)), 1)
+    present = counts > 0
+    is_digit = np.array([word.isdigit() for word in vocabulary], dtype=bool)
+
+    scores = np.array([product.accuracy_score for product in products], dtype=np.float64)
+
+    if item.brand_name != "":
+        no_brand = np.array([product.brand_name == "" for product in products], dtype=bool)
+        scores = np.where(no_brand, scores * .1, scores)
+
+    # Only the last searched word decides `numbers_in_name`/`numbers_match` (see scalar path).
+    num_parts_match = present[:, searched_ids].sum(axis=1)
+    numbers_in_name = int(bool(searched_words) and any(char.isdigit() for char in searched_words[-1]))
+    numbers_match = present[:, searched_ids[-1]].astype(np.int64) * numbers_in_name if numbers_in_name else np.zeros(len(products), dtype=np.int64)
+
+    num_searched = len(searched_words)
+    search_closeness = num_parts_match / max(num_searched, 1)
+
+    # Length deltas between non-numeric token counts.
+    product_lengths = counts[:, ~is_digit].sum(axis=1)
+    item_length = sum(1 for word in searched_words if not word.isdigit())
+    delta = np.abs(product_lengths - num_parts_match)
+    delta_index = np.where((delta >= 1) & (delta <= 3), delta, 0)
+    length_scores = np.where(
+        product_lengths < item_length,
+        SHORTER_PRODUCT_LENGTH_SCORES[delta_index],
+        LONGER_PRODUCT_LENGTH_SCORES[delta_index],
+    )
+    scores = scores * length_scores
+
+    # Closeness tiers via lookup tables.
+    tiers = np.searchsorted(CLOSENESS_TIER_BOUNDS, search_closeness, side='right')
+    tiers = np.where(search_closeness == 1, 8, tiers)
+    if not numbers_in_name:
+        column = 3
+    elif (num_searched // 5) < numbers_in_name:
+        column = 0
+    elif (num_searched // 2) < numbers_in_name:
+        column = 1
+    else:
+        column = 2
+    scores = scores * CLOSENESS_TIER_SCORES[tiers, column]
+
+    if numbers_in_name:
+        penalised = np.where(tiers == 1, numbers_match == numbers_in_name, numbers_match != numbers_in_name)
+        penalised &= (tiers != 0) & (tiers != 8)
+        scores = np.where(penalised, scores * CLOSENESS_TIER_NUMBER_PENALTIES[tiers], scores)
+
+    # No searched token found at all -> zero.
+    scores = np.where(num_parts_match > 0, scores, 0)
+
+    for product, score in zip(products, scores.tolist()):
+        product.accuracy_score = score
+
 def adjust_accuracy_for_context(item, product, match):
     """
     Adjust the score based on contextual wording around the brand/variant names
@@ -400,7 +545,7 @@ def adjust_accuracy_for_context(item, product, match):
             words_before = re.findall(r'\w+', m.group(1)) if m else []
         else:
             # For the no-match path, approximate using the first normalized token.
-            temp_item = item.copy()
+            temp_item = item.view()
             if part == "brand":
                 temp_item.brand_name = item_name_original_part
             else:
@@ -448,8 +593,7 @@ def adjust_accuracy_for_context(item, product, match):
         m = re.search(re.escape(item_name_original_part) + r'((?:\s+\w+){0,2})', product.original_variant_name, re.IGNORECASE)
         words_after = re.findall(r'\w+', m.group(1)) if m else []
     else:
-        temp_item = item.copy()
-        temp_item.variant_name = item_name_original_part
+        temp_item = item.view(variant_name=item_name_original_part)
 
         temp_item_token_set = TokenSet(good=temp_item)
         m = re.search(re.escape(temp_item_token_set.variant_name_normalized[0]) + r'((?:\s+\w+){0,2})', product.original_variant_name, re.IGNORECASE)
@@ -502,3 +646,56 @@ def adjust_accuracy_for_end(item, product, item_token_set, product_token_set):
         else:
             product.accuracy_score *= .85
     # print(f"Adjusted for product name: {product.original_variant_name}: {product.accuracy_score}")
+
+
+def compare_no_match_batch(items):
+    """
+    Differential check of `calculate_accuracy_no_match_batch` against the scalar
+    `calculate_accuracy_no_match`, which stays the reference implementation.
+
+    Each item's recorded products are scored twice from the same starting score,
+    once per product and once as a batch.
+
+    Args:
+        items (list[Item]): Items that still carry their candidate products.
+
+    Returns:
+        dict: Product count, mismatching scores and the time taken by each path.
+    """
+    import time
+
+    total = 0
+    mismatches = 0
+    scalar_seconds = 0.0
+    batch_seconds = 0.0
+    for item in items:
+        if not item.products or not item.variant_name.strip():
+            continue
+        # Older recordings predate brand parsing and cannot be tokenized.
+        if any(product.brand_name is None for product in item.products):
+            continue
+        scalar_products = [product.copy() for product in item.products]
+        batch_products = [product.copy() for product in item.products]
+        for scalar_product, batch_product in zip(scalar_products, batch_products):
+            scalar_product.accuracy_score = batch_product.accuracy_score = 100
+
+        start = time.perf_counter()
+        for scalar_product in scalar_products:
+            calculate_accuracy_no_match(item, scalar_product)
+        scalar_seconds += time.perf_counter() - start
+
+        start = time.perf_counter()
+        calculate_accuracy_no_match_batch(item, batch_products)
+        batch_seconds += time.perf_counter() - start
+
+        for scalar_product, batch_product in zip(scalar_products, batch_products):
+            total += 1
+            if scalar_product.accuracy_score != batch_product.accuracy_score:
+                mismatches += 1
+
+    return {
+        "products": total,
+        "mismatches": mismatches,
+        "scalar_seconds": scalar_seconds,
+        "batch_seconds": batch_seconds,
+    }
@@ -131,22 +131,23 @@ class ProductCleaner(GoodCleaner):
             such as "= 200ml".
 
         Behavior:
-          * Remove these expressions from the variant name for display.
+          * Remove these expressions from the variant name for display
+            (single token scan, see `scan_quantities`). The rest of the name is
+            left exactly as it was; a name without them is not touched.
           * Infer a `divisor` (number of units) and scale:
               - total_price /= divisor ** 0.96
               - accuracy_score *= (1 - (0.03 * divisor ** 0.6))
 
         Note: Exponents are heuristic dampeners to avoid overly aggressive scaling.
+
+        Returns:
+            float: The divisor (1 if no quantity expression was found).
         """
-        divisor = 1
-        product_token_set = TokenSet(good=product)
-        divisor = max(divisor, self.clean_pack(product, product_token_set))
-        product_token_set = TokenSet(good=product)
-        divisor = max(divisor, self.clean_x(product, product_token_set))
         product_token_set = TokenSet(good=product)
         item_token_set = TokenSet(good=item)
-        divisor = max(divisor, self.clean_start(product, product_token_set, item_token_set))
-        product.variant_name = product.variant_name.strip()
+        divisor, removed = self.scan_quantities(product_token_set, item_token_set)
+        if removed:
+            product.variant_name = self.remove_tokens(product.variant_name, removed).strip()
 
         if divisor > 1:
             if product.postage_price > 0:
@@ -162,6 +163,24 @@ class ProductCleaner(GoodCleaner):
             product.accuracy_score = round(
                 product.accuracy_score * (1 - (.03 * (divisor ** 0.6))), 2
             )
+        return divisor
+
+    @staticmethod
+    def remove_tokens(variant_name, removed):
+        """
+        Cut the token ranges found by `scan_quantities` out of `variant_name`.
+
+        Token positions are taken from the string itself (`TokenSet.TOKEN_PATTERN`),
+        so characters the tokens skip (e.g. '_') and everything outside the
+        removed ranges stay as they were. Each range is replaced by a space, or by
+        its kept tokens between spaces.
+        """
+        spans = [match.span() for match in re.finditer(TokenSet.TOKEN_PATTERN, variant_name)]
+        for first, last, kept in reversed(removed):
+            replacement = "".join(variant_name[slice(*spans[j])] for j in kept).strip()
+            replacement = f" {replacement} " if replacement else " "
+            variant_name = variant_name[:spans[first][0]] + replacement + variant_name[spans[last][1]:]
+        return variant_name
 
     def adjust_measurements(self, product, item_units, item_values):
         """
@@ -180,178 +199,123 @@ class ProductCleaner(GoodCleaner):
         self.convert_product_units(product, product_token_set, item_units)
         self.convert_values(product, product_token_set, item_units, item_values)
 
-    def clean_start(self, product, product_token_set, item_token_set):
-        
-        divisor = 1
-        if product_token_set.variant_name_normalized[0].isdigit() and not product_token_set.variant_name_normalized[0] == item_token_set.variant_name_normalized[0]:
-            product.variant_name = re.sub(
-                re.escape(product_token_set.variant_name_raw[0]), ' ', product.variant_name, count=1, flags=re.IGNORECASE
-            ).strip()
-            divisor = float(product_token_set.variant_name_normalized[0])
-        return divisor
-
-    def clean_pack(self, product, product_token_set):
+    def scan_quantities(self, product_token_set, item_token_set):
         """
-        Remove 'pack' patterns and return inferred count.
-
-        Handles:
-          - "<N> pack x <M><unit>"  -> drops the 'pack' word (keeps the size part).
-          - "<N> pack"              -> removes the whole token pair; divisor=N.
-          - "pack of <N>"           -> removes the phrase; divisor=N.
+        Strip pack/multiplier expressions from the variant tokens in one scan.
+
+        The scan walks the token stream once, left to right. At each position it
+        tries the patterns below (N, M, T are whole numbers; unit is any unit
+        known to `UnitConvertor`), consumes the matched tokens, and otherwise
+        keeps the token as-is:
+          - "<N> pack x ..."               -> drops 'pack' and continues as "<N> x ...".
+          - "<N> pack of <M>"              -> dropped; pack count = M (before "x", M
+                                              is kept to start "<M> x ...").
+          - "<N> pack"                     -> dropped; pack count = N.
+          - "pack of <N>"                  -> dropped; pack count = N (before "x", N
+                                              is kept to start "<N> x ...").
+          - "<N> x <M> pack"               -> dropped; multiplier = N, pack count = M.
+          - "<N> x <M><unit> = <T>[unit]"  -> rewritten to "<M><unit>"; multiplier = N.
+          - "<N> x <M> = <T>[unit]"        -> rewritten to "<M>"; multiplier = N.
+          - "<N> x <M>[unit]"              -> dropped; multiplier = N.
+          - "<N> x" (dangling)             -> dropped; multiplier = N.
+          - "x <N>" / "* <N>"              -> dropped; multiplier = N.
+          - leading "<N>"                  -> dropped when it differs from the item's
+                                              first token; leading count = N.
+
+        Only the first multiplier counts, to avoid misreading a size as a quantity.
 
         Args:
-            product (Product)
             product_token_set (TokenSet)
+            item_token_set (TokenSet)
 
         Returns:
-            int: divisor inferred from the 'pack' pattern (>=1).
-        """
-        divisor = 1
-        for i, token_raw in enumerate(product_token_set.variant_name_normalized):
-            if token_raw.strip().lower().isdigit():
-                before2_raw = product_token_set.variant_name_raw[i - 2] if i - 2 >= 0 else None
-                before2_normalized = product_token_set.variant_name_normalized[i - 2].strip().lower() if i - 2 >= 0 else None
-                before_normalized = product_token_set.variant_name_normalized[i - 1].strip().lower() if i - 1 >= 0 else None
-                token_raw = product_token_set.variant_name_raw[i]
-                after_raw = product_token_set.variant_name_raw[i + 1] if i + 1 < len(product_token_set.variant_name_raw) else None
-                after_normalized = product_token_set.variant_name_normalized[i + 1] if i + 1 < len(product_token_set.variant_name_normalized) else None
-                after2_raw = product_token_set.variant_name_raw[i + 2] if i + 2 < len(product_token_set.variant_name_raw) else None
-                after2_normalized = product_token_set.variant_name_normalized[i + 2] if i + 2 < len(product_token_set.variant_name_normalized) else None
-
-                # e.g., "6 pack x 500ml" -> drop the word "pack".
-                if after_raw and after_normalized == 'pack' and after2_raw and after2_normalized == 'x':
-                    product.variant_name = re.sub(
-                        re.escape(f"{after_raw}"), " ", product.variant_name, count=1, flags=re.IGNORECASE
-                    )
-                # e.g., "6 pack" -> remove "6 pack" and set divisor=6.
-                elif after_raw and after_normalized == 'pack':
-                    product.variant_name = re.sub(
-                        re.escape(f"{token_raw}{after_raw}"), " ", product.variant_name, count=1, flags=re.IGNORECASE
-                    )
-                    divisor = int(token_raw)
-
-                # e.g., "pack of 4" -> remove phrase and set divisor=4.
-                if before2_normalized and before2_normalized == 'pack' and before_normalized == 'of':
-                    product.variant_name = re.sub(
-                        re.escape(f"{before2_raw}{before_normalized}{token_raw}"), " ", product.variant_name, count=1, flags=re.IGNORECASE
-                    )
-                    divisor = int(token_raw)
-
-        product.variant_name = product.variant_name.strip()
-        return divisor
-
-    def clean_x(self, product, product_token_set):
+            tuple[float, list[tuple[int, int, list[int]]]]: (divisor, removed). The
+            divisor is the largest of the pack count, multiplier and leading count
+            (>=1). `removed` holds each matched token range as (first index, last
+            index, indexes of the tokens it keeps), in order (see `remove_tokens`).
         """
-        Remove 'x' multiplicative patterns and return inferred count.
-
-        Handles variations such as:
-          - "4 x 50ml"
-          - "4 x 50 = 200ml"
-          - "4 x 50ml = 200ml" (and similar with '*')
-          - Lone "x 4"
-
-        Inference:
-          - The *first* numeric token adjacent to 'x'/'*' is taken as the divisor
-            (to avoid confusing quantity with size).
-
-        Returns:
-            int: divisor inferred from the 'x' pattern (>=1).
-
-        Caution:
-          The condition `if before_normalized and before_normalized.lower() == 'x' or before_normalized == '*'`
-          relies on Python's operator precedence; parentheses would make intent clearer.
-        """
-        changed = False  # True once the divisor has been set from an 'x' expression.
-        divisor = 1
-        for i, token_normalized in enumerate(product_token_set.variant_name_normalized):
-            if token_normalized.isdigit():
-                token_raw = product_token_set.variant_name_raw[i]
-                before_raw = product_token_set.variant_name_raw[i - 1] if i - 1 >= 0 else None
-                before_normalized = product_token_set.variant_name_normalized[i - 1].strip().lower() if i - 1 >= 0 else None
-                after_raw = product_token_set.variant_name_raw[i + 1] if i + 1 < len(product_token_set.variant_name_raw) else None
-                after_normalized = product_token_set.variant_name_normalized[i + 1].strip().lower() if i + 1 < len(product_token_set.variant_name_normalized) else None
-                after2_raw = product_token_set.variant_name_raw[i + 2] if i + 2 < len(product_token_set.variant_name_raw) else None
-                after2_normalized = product_token_set.variant_name_normalized[i + 2].strip().lower() if i + 2 < len(product_token_set.variant_name_normalized) else None
-                after3_raw = product_token_set.variant_name_raw[i + 3] if i + 3 < len(product_token_set.variant_name_raw) else None
-                after3_normalized = product_token_set.variant_name_normalized[i + 3].strip().lower() if i + 3 < len(product_token_set.variant_name_normalized) else None
-                after4_raw = product_token_set.variant_name_raw[i + 4] if i + 4 < len(product_token_set.variant_name_raw) else None
-                after4_normalized = product_token_set.variant_name_normalized[i + 4].strip().lower() if i + 4 < len(product_token_set.variant_name_normalized) else None
-                after5_raw = product_token_set.variant_name_raw[i + 5] if i + 5 < len(product_token_set.variant_name_raw) else None
-                after5_normalized = product_token_set.variant_name_normalized[i + 5].strip().lower() if i + 5 < len(product_token_set.variant_name_normalized) else None
-                after6_raw = product_token_set.variant_name_raw[i + 6] if i + 6 < len(product_token_set.variant_name_raw) else None
-                after6_normalized = product_token_set.variant_name_normalized[i + 6].strip().lower() if i + 6 < len(product_token_set.variant_name_normalized) else None
-
-                # e.g., "4 x 50ml" or "4 * 50ml"
-                if after_normalized and (after_normalized == 'x' or after_normalized == '*'):
-                    # e.g., "4 x 50ml = 200ml" (possibly with leftover units trailing)
-                    if after3_normalized and after4_normalized and after4_normalized == '=' and after3_normalized in self.unit_convertor.get_units():
-                        if after5_normalized and after6_normalized and after6_normalized in self.unit_convertor.get_units():
-                            product.variant_name = re.sub(
-                                re.escape(f"{token_raw}{after_raw}{after2_raw}{after3_raw}{after4_raw}{after5_raw}{after6_raw}"),
-                                f" {after2_raw}{after3_raw} ",
-                                product.variant_name, count=1, flags=re.IGNORECASE
-                            )
-                        else:
-                            product.variant_name = re.sub(
-                                re.escape(f"{token_raw}{after_raw}{after2_raw}{after3_raw}{after4_raw}{after5_raw}"),
-                                f" {after2_raw}{after3_raw} ",
-                                product.variant_name, count=1, flags=re.IGNORECASE
-                            )
-                    # e.g., "4 x 50 = 200ml" or "4 x 50 = 200"
-                    if after3_normalized and after3_normalized == '=':
-                        if after5_normalized and after5_normalized in self.unit_convertor.get_units():
-                            product.variant_name = re.sub(
-                                re.escape(f"{token_raw}{after_raw}{after2_raw}{after3_raw}{after4_raw}{after5_raw}"),
-                                f" {after2_raw} ",
-                                product.variant_name, count=1, flags=re.IGNORECASE
-                            )
-                        else:
-                            product.variant_name = re.sub(
-                                re.escape(f"{token_raw}{after_raw}{after2_raw}{after3_raw}{after4_raw}"),
-                                f" {after2_raw}",
-                                product.variant_name, count=1, flags=re.IGNORECASE
-                            )
-                    # e.g., "4 x 50ml" or "4 x 50"
-                    elif after2_normalized and after2_normalized.isdigit():
-                        if after3_normalized and after3_normalized in self.unit_convertor.get_units():
-                            pattern = re.escape(f"{token_raw}{after_raw}{after2_raw}{after3_raw}")
-                            product.variant_name = re.sub(
-                                pattern,
-                                " ",
-                                product.variant_name, count=1, flags=re.IGNORECASE
-                            )
-                        else:
-                            product.variant_name = re.sub(
-                                re.escape(f"{token_raw}{after_raw}{after2_raw}"),
-                                " ",
-                                product.variant_name, count=1, flags=re.IGNORECASE
-                            )
-                    # e.g., dangling "4 x"
+        raw = product_token_set.variant_name_raw
+        normalized = [token.strip().lower() for token in product_token_set.variant_name_normalized]
+        units = self.unit_convertor.get_units()
+        item_first = item_token_set.variant_name_normalized[0] if item_token_set.variant_name_normalized else None
+
+        def at(j):
+            return normalized[j] if j < len(normalized) else None
+
+        def is_x(token):
+            return token == 'x' or token == '*'
+
+        def is_number(token):
+            return token is not None and token.isdigit()
+
+        removed = []
+        kept_any = False  # Whether any token before `i` stays in the name.
+        pack_count, multiplier, leading_count = 1, None, 1
+        i = 0
+        while i < len(raw):
+            token = normalized[i]
+            end, kept = None, []  # `end` is the last consumed index; None means no match.
+
+            if is_number(token):
+                # "6 pack x 50ml" is read as "6 x 50ml".
+                x = i + 2 if at(i + 1) == 'pack' and is_x(at(i + 2)) else i + 1
+                if is_x(at(x)):
+                    if at(x + 2) in units and at(x + 3) == '=':
+                        # e.g., "4 x 50ml = 200ml" -> "50ml"
+                        end = x + 5 if at(x + 5) in units else x + 4
+                        kept = [x + 1, x + 2]
+                    elif at(x + 2) == '=':
+                        # e.g., "4 x 50 = 200ml" -> "50"
+                        end = x + 4 if at(x + 4) in units else x + 3
+                        kept = [x + 1]
+                    elif is_number(at(x + 1)) and at(x + 2) == 'pack':
+                        # e.g., "2 x 3 pack" -> dropped; pack count = 3 as well.
+                        pack_count = int(normalized[x + 1])
+                        end = x + 2
+                    elif is_number(at(x + 1)):
+                        # e.g., "4 x 50ml" or "4 x 50"
+                        end = x + 2 if at(x + 2) in units else x + 1
                     else:
-                        product.variant_name = re.sub(
-                            re.escape(f"{token_raw}{after_raw}"),
-                            " ",
-                            product.variant_name, count=1, flags=re.IGNORECASE
-                        )
-
-                    # Only set divisor once; avoids misreading size as quantity.
-                    if not changed:
-                        changed = True
-                        divisor = int(token_normalized)
-
-                # e.g., leading "x 4" or "* 4"
-                if before_normalized and before_normalized.lower() == 'x' or before_normalized == '*':
-                    product.variant_name = re.sub(
-                        re.escape(f"{before_raw}{token_raw}"),
-                        " ",
-                        product.variant_name, count=1, flags=re.IGNORECASE
-                    )
-                    if not changed:
-                        changed = True
-                        divisor = int(token_normalized)
-
-        product.variant_name = product.variant_name.strip()
-        return divisor
+                        # e.g., dangling "4 x"
+                        end = x
+                    if multiplier is None:
+                        multiplier = int(token)
+                elif at(i + 1) == 'pack' and at(i + 2) == 'of' and is_number(at(i + 3)):
+                    # e.g., "12 pack of 3": the later count wins. Before "x", the
+                    # count is left to start the multiplier ("3 x 10ml").
+                    pack_count = int(normalized[i + 3])
+                    end = i + 2 if is_x(at(i + 4)) else i + 3
+                elif at(i + 1) == 'pack':
+                    # e.g., "6 pack"
+                    pack_count = int(token)
+                    end = i + 1
+                elif not kept_any and token != item_first:
+                    # e.g., leading "3 Lip Gloss" when the item doesn't start with 3.
+                    leading_count = float(token)
+                    end = i
+
+            elif token == 'pack' and at(i + 1) == 'of' and is_number(at(i + 2)):
+                # e.g., "pack of 4"; in "pack of 2 x 50ml" the 2 starts the multiplier.
+                pack_count = int(normalized[i + 2])
+                end = i + 1 if is_x(at(i + 3)) else i + 2
+
+            elif is_x(token) and is_number(at(i + 1)) and not is_x(at(i + 2)) and at(i + 2) != 'pack':
+                # e.g., "x 4" or "* 4"
+                if multiplier is None:
+                    multiplier = int(normalized[i + 1])
+                end = i + 1
+
+            if end is None:
+                kept_any = True
+                i += 1
+                continue
+
+            end = min(end, len(raw) - 1)
+            removed.append((i, end, kept))
+            kept_any = kept_any or bool(kept)
+            i = end + 1
+
+        return max(pack_count, multiplier or 1, leading_count), removed
 
     def convert_product_units(self, product, product_token_set, item_units):
         """
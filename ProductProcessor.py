@@ -27,6 +27,7 @@ Dependencies (by module/class name)
 - ProductCalculator (as `calc`): provides `set_accuracy(item, product)`
 """
 
+import time
 from CurrencyConverter import CurrencyConverter
 from Item import Item
 from Product import Product
@@ -34,6 +35,7 @@ from UnitConvertor import UnitConvertor
 from ProductCleaner import ProductCleaner
 from WordFilterer import WordFilterer
 from FilterScheme import FilterScheme
+from TokenSet import TokenSet
 import ProductCalculator as calc
 
 
@@ -55,15 +57,25 @@ class ProductProcessor:
         FilterScheme(word_type=("NOUN",), weight=3.0),
     ]
 
-    def __init__(self):
+    # Largest difference in `accuracy_score` the early-exit path may introduce
+    # relative to full scoring. Exact-class matches keep every token under every
+    # scheme, so the only source of drift is rounding.
+    EARLY_EXIT_MAX_DEVIATION = 0.01
+
+    def __init__(self, early_exit=False):
         """
         Initialize collaborating components used throughout the pipeline.
 
+        Args:
+            early_exit (bool): Opt in to skipping the POS-filtered views when the
+                unfiltered product is an exact-class match for the item (see `score`).
+
         Notes:
             - `currency_converter` and `unit_converter` are stored on the instance
               for parity/extensibility, though this class defers unit work to
               `ProductCleaner` and price accuracy to `calc.set_accuracy`.
         """
+        self.early_exit = early_exit
         self.currency_converter = CurrencyConverter()
         self.unit_converter = UnitConvertor()
         self.cleaner = ProductCleaner()
@@ -75,10 +87,7 @@ class ProductProcessor:
 
         Steps:
             1) Clean raw product fields relative to the item context.
-            2) Create several POS-filtered variants of the product name.
-            3) Compute accuracy for each filtered variant.
-            4) Set the product's final accuracy as a weighted average.
-            5) Convert the final accuracy into a `buy_quality_score` via thresholds.
+            2) Score the cleaned product against the item (see `score`).
 
         Args:
             item (Item): The target item (brand, variant, quantity, etc.).
@@ -91,21 +100,94 @@ class ProductProcessor:
         # 1) Normalize/clean the product data using the item context
         self.clean_product(item, product)
 
-        if self.FILTERSCHEMES:
-            # 2) Generate multiple POS-filtered variants of the product name
-            filtered_products = self.filter_name(item, product)
+        # 2) Filter, score and map to a quality score
+        self.score(item, product)
+
+    def score(self, item, product, product_token_set=None):
+        """
+        Score an already cleaned product against the item.
+
+        Steps:
+            1) Create several POS-filtered variants of the product name.
+            2) Compute accuracy for each filtered variant.
+            3) Set the product's final accuracy as a weighted average.
+            4) Convert the final accuracy into a `buy_quality_score` via thresholds.
+
+        This is the only item-dependent part of the pipeline, so callers that
+        score the same cleaned product against several item variants can clean
+        once and call this per variant.
+
+        Early exit:
+            With `early_exit` enabled, a product whose variant equals the item's
+            variant (ignoring case) is scored once, unfiltered. `filter_product`
+            keeps every token that appears in the item's variant, so each filtered
+            view would be identical and the weighted average equals this single
+            score to within `EARLY_EXIT_MAX_DEVIATION`.
 
-            # 3) Compute accuracy per filtered variant
+        Args:
+            item (Item): The target item (brand, variant, quantity, etc.).
+            product (Product): A product already passed through `clean_product`.
+            product_token_set (TokenSet | None): Tokens of the cleaned product;
+                computed here when not supplied.
+        """
+        if self.early_exit and calc.is_exact_match(item, product):
+            # Exact-class match: every filtered view equals the unfiltered one.
+            calc.set_accuracy(item, product)
+            product.accuracy_score = round(product.accuracy_score, 2)
+
+        elif self.FILTERSCHEMES:
+            # 1) Generate multiple POS-filtered variants of the product name
+            filtered_products = self.filter_name(item, product, product_token_set)
+
+            # 2) Compute accuracy per filtered variant
             for filtered_product in filtered_products:
                 # `calc.set_accuracy` compares the (filtered) product to the item
                 calc.set_accuracy(item, filtered_product[0])
 
-            # 4) Aggregate the accuracies into one final product score
+            # 3) Aggregate the accuracies into one final product score
             self.set_average_product_info(product, filtered_products)
 
-        # 5) Map accuracy (0–100) to a tiered buy_quality_score.
+        # 4) Map accuracy (0–100) to a tiered buy_quality_score.
         self.map_accuracy_to_quality_score(product)
 
+    def score_batch(self, item, products, product_token_sets=None):
+        """
+        Score all cleaned candidate products of one item together.
+
+        Same result as calling `score` per product, but every POS-filtered view of
+        every product is scored in one `calc.set_accuracy_batch` call, so the
+        token-overlap scoring runs vectorized over all candidates.
+
+        Args:
+            item (Item): The target item.
+            products (list[Product]): Products already passed through `clean_product`.
+            product_token_sets (list[TokenSet] | None): Tokens per product.
+        """
+        if product_token_sets is None:
+            product_token_sets = [TokenSet(good=product) for product in products]
+
+        views = []
+        filtered_per_product = []
+        for product, product_token_set in zip(products, product_token_sets):
+            if self.early_exit and calc.is_exact_match(item, product):
+                views.append(product)
+                filtered_per_product.append(None)
+            elif self.FILTERSCHEMES:
+                filtered_products = self.filter_name(item, product, product_token_set)
+                views.extend(filtered_product for filtered_product, _ in filtered_products)
+                filtered_per_product.append(filtered_products)
+            else:
+                filtered_per_product.append([])
+
+        calc.set_accuracy_batch(item, views)
+
+        for product, filtered_products in zip(products, filtered_per_product):
+            if filtered_products is None:
+                product.accuracy_score = round(product.accuracy_score, 2)
+            elif filtered_products:
+                self.set_average_product_info(product, filtered_products)
+            self.map_accuracy_to_quality_score(product)
+
     def clean_product(self, item, product):
         """
         Normalize product attributes (e.g., casing, noisy tokens, units/prices)
@@ -117,7 +199,7 @@ class ProductProcessor:
         """
         self.cleaner.clean(item, product)
 
-    def filter_name(self, item, product):
+    def filter_name(self, item, product, product_token_set=None):
         """
         Create multiple filtered copies of the product by keeping only certain POS tags.
 
@@ -129,15 +211,19 @@ class ProductProcessor:
         Args:
             item (Item): Provides context for WordFilterer (e.g., brand/variant).
             product (Product): The base product to clone/filter.
+            product_token_set (TokenSet | None): Tokens of `product`, shared by all
+                schemes so the name is only tokenized once.
 
         Returns:
             list[tuple[Product, float]]: Pairs of (filtered_product, weight).
         """
+        if product_token_set is None:
+            product_token_set = TokenSet(good=product)
         filtered_items = []
         for scheme in self.FILTERSCHEMES:
-            filtered_product = product.copy()
-            # `filter_product` mutates `filtered_product`'s name fields in place.
-            self.word_filterer.filter_product(item, filtered_product, scheme.word_type)
+            filtered_product = product.view()
+            # `filter_product` rewrites the view's name fields; `product` is untouched.
+            self.word_filterer.filter_product(item, filtered_product, scheme.word_type, product_token_set)
             filtered_items.append((filtered_product, scheme.weight))
         return filtered_items
 
@@ -216,6 +302,62 @@ class ProductProcessor:
                 pass
 
 
+def compare_early_exit(recorded_pairs):
+    """
+    Score recorded (item, product) pairs in full mode and early-exit mode and
+    report throughput and score drift between the two.
+
+    Each product is rebuilt from its recorded raw title and prices, cleaned once,
+    and then scored by both modes from identical copies.
+
+    Args:
+        recorded_pairs (list[tuple[Item, Product]]): e.g. items and their products
+            loaded from ./Operations/all_job_lots.pkl.
+
+    Returns:
+        dict: products scored, early exits taken, seconds per mode, products per
+        second per mode, and the max/mean absolute accuracy drift.
+    """
+    full_processor = ProductProcessor()
+    fast_processor = ProductProcessor(early_exit=True)
+
+    prepared = []
+    for item, recorded in recorded_pairs:
+        product = Product(
+            recorded.original_name,
+            recorded.web_url,
+            total_price=round(recorded.buy_price + recorded.postage_price, 2),
+            buy_price=recorded.buy_price,
+            postage_price=recorded.postage_price,
+        )
+        full_processor.clean_product(item, product)
+        prepared.append((item, product, TokenSet(good=product)))
+
+    results = {}
+    for mode, processor in (("full", full_processor), ("early_exit", fast_processor)):
+        scored = []
+        start = time.perf_counter()
+        for item, product, product_token_set in prepared:
+            scored_product = product.copy()
+            processor.score(item, scored_product, product_token_set)
+            scored.append(scored_product.accuracy_score)
+        results[mode] = (time.perf_counter() - start, scored)
+
+    full_seconds, full_scores = results["full"]
+    fast_seconds, fast_scores = results["early_exit"]
+    drifts = [abs(a - b) for a, b in zip(full_scores, fast_scores)]
+    return {
+        "products": len(prepared),
+        "early_exits": sum(calc.is_exact_match(item, product) for item, product, _ in prepared),
+        "full_seconds": round(full_seconds, 3),
+        "early_exit_seconds": round(fast_seconds, 3),
+        "full_per_second": round(len(prepared) / full_seconds, 1) if full_seconds else 0,
+        "early_exit_per_second": round(len(prepared) / fast_seconds, 1) if fast_seconds else 0,
+        "max_drift": round(max(drifts, default=0), 4),
+        "mean_drift": round(sum(drifts) / len(drifts), 4) if drifts else 0,
+    }
+
+
 if __name__ == "__main__":
     # Example usage / quick smoke test:
     # 1) Build a processor, a sample Item, and a sample Product.
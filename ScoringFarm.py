@@ -0,0 +1,166 @@
+"""
+Process-pool worker farm for the CPU-bound half of item processing.
+
+Once eBay requests are overlapped (see `LotProcessor(max_workers=...)`), most of
+the remaining time is spent in spaCy tagging, regex cleaning and scoring, which a
+thread pool cannot spread across cores because of the GIL. `ScoringFarm` runs
+`ItemProcessor.process_listings` in worker processes instead:
+
+- Each worker loads the spaCy model and builds one item processor when it starts
+  (`init_worker`), so the model is loaded once per worker rather than per task.
+- Work is sent as batches of `(item, raw listing JSON)` pairs; listings are fetched
+  beforehand in the parent with `ItemProcessor.fetch_listings`.
+- Each batch returns the scored items, in order. Results are identical to scoring
+  in-process, since every step is deterministic.
+
+Typical use is through `LotProcessor(scoring_farm=farm).process_lots(job_lots)`,
+which fetches all lots' listings and spreads their items over the workers together.
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+from BeautyItemProcessor import BeautyItemProcessor
+
+
+# The worker's item processor, built once by `init_worker`.
+worker_processor = None
+
+
+def init_worker(processor_class):
+    """
+    Worker start-up: import `WordFilterer` (which loads the spaCy model) and build
+    the scoring-only item processor used for every batch.
+    """
+    global worker_processor
+    import WordFilterer  # noqa: F401 - loads the spaCy model for this worker
+    worker_processor = processor_class()
+
+
+def score_batch(batch):
+    """
+    Score a batch of `(item, found_products)` pairs in a worker.
+
+    Returns:
+        list[Item]: The scored items, in batch order.
+    """
+    for item, found_products in batch:
+        worker_processor.process_listings(item, found_products)
+    return [item for item, _ in batch]
+
+
+class ScoringFarm:
+
+    def __init__(self, max_workers=None, processor_class=BeautyItemProcessor, batch_size=4):
+        """
+        Args:
+            max_workers (int | None): Worker processes (None = one per core).
+            processor_class (type): Item processor class built in each worker.
+            batch_size (int): Items per task; larger batches mean fewer round trips.
+        """
+        self.batch_size = batch_size
+        self.executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=init_worker,
+            initargs=(processor_class,),
+        )
+
+
+    def score(self, pairs):
+        """
+        Score `(item, found_products)` pairs across the workers.
+
+        Returns:
+            list[Item]: Scored items in the same order as `pairs`. These are copies
+            made by the workers; the input items are left as they were.
+        """
+        batches = [pairs[i:i + self.batch_size] for i in range(0, len(pairs), self.batch_size)]
+        futures = [self.executor.submit(score_batch, batch) for batch in batches]
+        return [item for future in futures for item in future.result()]
+
+
+    def close(self):
+        self.executor.shutdown()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def benchmark(job_lots, worker_counts=(1, 2, 4, 8)):
+    """
+    Replays the listings recorded on `job_lots` through farms of different sizes.
+
+    Each recorded item is rebuilt from its recorded names and paired with listing
+    JSON rebuilt from its recorded products, so no eBay requests are made.
+
+    Returns:
+        dict[int, dict]: Per worker count, seconds taken, items scored per second
+        and how many items differ from the single-process result.
+    """
+    from Item import Item
+
+    pairs = []
+    for job_lot in job_lots:
+        for item in job_lot.items:
+            listings = [
+                {
+                    "title": product.original_name,
+                    "itemWebUrl": product.web_url,
+                    "price": {"value": product.buy_price, "currency": "GBP"},
+                    "shippingOptions": [{"shippingCost": {"value": product.postage_price, "currency": "GBP"}}],
+                }
+                for product in item.products
+            ]
+            fresh_item = Item(
+                name=item.name,
+                brand_name=item.brand_name or "",
+                variant_name=item.variant_name,
+                quantity=item.quantity,
+                original_name=item.original_name,
+            )
+            pairs.append((fresh_item, listings))
+
+    def summary(item):
+        return (item.accuracy_score, item.sell_price, [(p.web_url, p.accuracy_score) for p in item.products])
+
+    report = {}
+    expected = None
+    for worker_count in worker_counts:
+        with ScoringFarm(max_workers=worker_count) as farm:
+            # Warm the workers up so model loading is not part of the timing.
+            farm.score(pairs[:worker_count])
+            start = time.perf_counter()
+            scored = farm.score(pairs)
+            seconds = time.perf_counter() - start
+        summaries = [summary(item) for item in scored]
+        if expected is None:
+            expected = summaries
+        report[worker_count] = {
+            "seconds": seconds,
+            "items_per_second": len(pairs) / seconds if seconds else 0,
+            "mismatches": sum(a != b for a, b in zip(summaries, expected)),
+        }
+    return report
+
+
+if __name__ == "__main__":
+    import pickle
+
+    job_lots = []
+    with open("./Operations/all_job_lots.pkl", "rb") as f:
+        while True:
+            try:
+                job_lots.append(pickle.load(f))
+            except EOFError:
+                break
+
+    recorded_lots = [job_lot for job_lot in job_lots if any(item.products for item in job_lot.items)]
+    for worker_count, result in benchmark(recorded_lots[:20]).items():
+        print(
+            f"{worker_count} workers: {result['seconds']:.2f}s, "
+            f"{result['items_per_second']:.1f} items/s, {result['mismatches']} mismatches"
+        )
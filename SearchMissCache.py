@@ -0,0 +1,168 @@
+"""
+Negative cache of items whose eBay search found no usable listings.
+
+Items with obscure or misread names (e.g. "Unknown brand Velvet Lip Tint") run
+the whole fallback cascade of `ItemProcessor.fetch_listings` (up to 4 Browse
+searches: GB, any location, the other condition in GB, the other condition
+anywhere), find nothing worth pricing from and end with an accuracy score of 0.
+The same names come back in later runs and would burn the same requests again.
+
+`SearchMissCache` remembers them:
+
+    cache = SearchMissCache()
+    key = cache.key(cleaned_item)
+    if cache.is_miss(key):        # recorded less than TTL_DAYS ago
+        ...search once, no fallbacks...
+    ...
+    cache.searched(key, calls)    # after a full cascade of `calls` requests
+    cache.record(scored_item)     # after scoring: miss, or forget it
+
+- Items are keyed like `PriceIndex` (sorted normalized brand + variant tokens,
+  after `ItemCleaner`), so word order and formatting do not matter.
+- An item is a miss when a full search found nothing to price it from: no
+  listings at all, or only listings that scored `MISS_ACCURACY` (unrelated
+  products returned for an unknown or misread name) and no price. A search that
+  merely scored low is not a miss; its listings still price the item.
+- Entries expire after `TTL_DAYS`, much sooner than the `PriceIndex` keeps
+  positive results, so new listings for a once-missing item are found again.
+  Only a full cascade records or renews a miss; a cut-short search that finds
+  usable listings removes it straight away.
+- The cache is saved to ./Operations/search_misses.pkl after every change (under
+  the store's `FileLock`). It is only a cache: if two processes write it at once,
+  the last one wins, and an unreadable file is simply started over.
+- `stats` counts the shortened searches and the requests they avoided (the
+  requests the recorded full cascade took, less the one still made).
+"""
+
+import os
+import pickle
+import threading
+from datetime import date
+from FileHandler import FileHandler
+from PriceIndex import PriceIndex
+
+
+class SearchMissCache:
+
+    CACHE_PATH = "./Operations/search_misses.pkl"
+
+    # How long a miss is trusted, and the score of a listing that shares nothing
+    # with the item. On the recorded job lots, 233 of 669 item keys are misses
+    # under this rule (195 of them found no listings at all); none of them was
+    # priced, and none was priced by another search of the same key.
+    TTL_DAYS = 7
+    MISS_ACCURACY = 0
+
+    def __init__(self, file_handler=None, cache_path=CACHE_PATH):
+        """
+        Args:
+            file_handler (FileHandler | None): Provides the store's `FileLock`,
+                held while the cache file is written.
+            cache_path (str): Saved cache.
+        """
+        self.file_handler = file_handler or FileHandler()
+        self.cache_path = cache_path
+        self.lock = threading.Lock()
+        # key -> (day ordinal of the full search, requests it took)
+        self.misses = None
+        # key -> requests of a full search whose listings are still being scored
+        self.pending = {}
+        self.stats = {"hits": 0, "calls_avoided": 0, "recorded": 0, "cleared": 0}
+
+
+    key = staticmethod(PriceIndex.key)
+
+
+    def is_miss(self, key, today=None):
+        """
+        Whether `key` had no usable listings in a full search within `TTL_DAYS`.
+        Counts the hit and the requests it saves.
+        """
+        today = (today or date.today()).toordinal()
+        with self.lock:
+            miss = self.load().get(key)
+            if miss is None or today - miss[0] > self.TTL_DAYS:
+                return False
+            self.stats["hits"] += 1
+            self.stats["calls_avoided"] += max(miss[1] - 1, 0)
+            return True
+
+
+    def searched(self, key, calls):
+        """
+        Note that `key` went through the full search cascade in `calls` requests,
+        so `record` may store (or renew) it as a miss.
+        """
+        with self.lock:
+            self.pending[key] = calls
+
+
+    def record(self, item, day=None):
+        """
+        After `item` (cleaned) was scored: store it as a miss if a full search
+        found nothing to price it from (see `missed`), or forget it otherwise.
+        """
+        missed = self.missed(item)
+        try:
+            key = self.key(item)
+        except (AttributeError, TypeError):
+            return
+        day = (day or date.today()).toordinal()
+        with self.lock:
+            calls = self.pending.pop(key, None)
+            misses = self.load()
+            if not missed:
+                if misses.pop(key, None) is None:
+                    return
+                self.stats["cleared"] += 1
+            elif calls is not None:
+                misses[key] = (day, calls)
+                self.stats["recorded"] += 1
+            else:
+                return
+            self.save(misses)
+
+
+    @classmethod
+    def missed(cls, item):
+        """
+        Whether the scored `item` got no price and none of its listings scored
+        above `MISS_ACCURACY` (true when it has no listings at all).
+        """
+        if (getattr(item, "sell_price", 0) or 0) > 0:
+            return False
+        return not any(
+            isinstance(getattr(product, "accuracy_score", None), (int, float))
+            and product.accuracy_score > cls.MISS_ACCURACY
+            for product in getattr(item, "products", None) or []
+        )
+
+
+    def load(self):
+        if self.misses is None:
+            try:
+                with open(self.cache_path, "rb") as f:
+                    self.misses = pickle.load(f)
+            except (OSError, EOFError, pickle.UnpicklingError):
+                self.misses = {}
+        return self.misses
+
+
+    def save(self, misses):
+        temp_path = f"{self.cache_path}.tmp"
+        try:
+            with self.file_handler.file_lock:
+                with open(temp_path, "wb") as f:
+                    pickle.dump(misses, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temp_path, self.cache_path)
+        except OSError as ex:
+            print("Error during writing search miss cache:", ex)
+
+
+    def print_report(self):
+        stats = self.stats
+        print(
+            f"Search miss cache: {stats['hits']} searches cut short, {stats['calls_avoided']} eBay requests avoided, "
+            f"{stats['recorded']} misses recorded, {stats['cleared']} cleared"
+        )
+
@@ -0,0 +1,527 @@
+"""
+SQLite storage backend for job lots, behind the `FileHandler` interface.
+
+`SqliteFileHandler` is a drop-in `FileHandler` whose job-lot collections live in
+./Operations/job_lots.db instead of pickle streams. The "files"
+./Operations/all_job_lots.pkl and ./Operations/working_job_lots.pkl become the
+collections "all" and "working"; `load_object`, `iter_objects`, `open_stream`,
+`write_object`, `append_object`, `commit_objects`, `remove_object` and `remove_objects` keep their signatures and meaning for them,
+and fall through to the pickle implementation for any other path.
+
+Schema
+------
+- job_lots: one row per job lot per collection (every `JobLot` field except
+  `items`, plus `created_on`, the ISO form of `date_created`).
+- items: one row per item, referencing its job lot row, in lot order.
+- products: one row per product, referencing its item row, in item order.
+
+Items and products are deleted with their job lot. Lists (an item's
+`measurements`) are stored as JSON. Attributes not in the dataclasses (fields
+from older versions of the models) and values that are not plain scalars are
+pickled into an `extra` column, so a migrated store loads back the same objects. Scalar columns are declared without
+a type, so ints stay ints and floats stay floats.
+
+Indexes cover the eBay item id (`lot_id`), `rating`, `created_on` and `search`,
+each per collection, so e.g. `top_lots(20, days=7)` ("top 20 lots by rating this
+week") reads 20 lots instead of the whole store. The database runs in WAL mode,
+so readers are not blocked by a writer, and every write is one transaction.
+
+`migrate()` copies the existing pickle streams into the database once.
+"""
+
+import dataclasses
+import json
+import pickle
+import sqlite3
+import threading
+from collections.abc import Sequence
+from datetime import datetime
+from FileHandler import FileHandler
+from JobLotIndex import JobLotIndex
+from JobLot import JobLot
+from Item import Item
+from Product import Product
+
+
+class SqliteFileHandler(FileHandler):
+
+    DB_PATH = "./Operations/job_lots.db"
+
+    # Pickle stream paths used by the rest of the code -> collection names.
+    COLLECTIONS = {
+        "./Operations/all_job_lots.pkl": "all",
+        "./Operations/working_job_lots.pkl": "working",
+    }
+
+    JOB_LOT_FIELDS = [f.name for f in dataclasses.fields(JobLot) if f.name not in ("id", "items")]
+    ITEM_FIELDS = [f.name for f in dataclasses.fields(Item) if f.name != "products"]
+    PRODUCT_FIELDS = [f.name for f in dataclasses.fields(Product)]
+
+    # SQLite's default limit on host parameters per statement is 999.
+    CHUNK_SIZE = 500
+
+    # Job lots loaded per query by `iter_objects`.
+    ITER_BATCH_SIZE = 20
+
+    def __init__(self, db_path=DB_PATH):
+        """
+        Create the usual folders/files (see `FileHandler`), open the database in
+        WAL mode and create the schema if needed.
+
+        Args:
+            db_path (str): SQLite database file.
+        """
+        super().__init__()
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        self.create_schema()
+
+
+    def create_schema(self):
+        job_lot_columns = ", ".join(f'"{name}"' for name in self.JOB_LOT_FIELDS)
+        item_columns = ", ".join(f'"{name}"' for name in self.ITEM_FIELDS)
+        product_columns = ", ".join(f'"{name}"' for name in self.PRODUCT_FIELDS)
+        with self.lock, self.connection:
+            self.connection.executescript(f"""
+                CREATE TABLE IF NOT EXISTS job_lots (
+                    row_id INTEGER PRIMARY KEY,
+                    collection TEXT NOT NULL,
+                    lot_id, {job_lot_columns}, created_on TEXT, extra BLOB
+                );
+                CREATE TABLE IF NOT EXISTS items (
+                    row_id INTEGER PRIMARY KEY,
+                    job_lot_row INTEGER NOT NULL REFERENCES job_lots(row_id) ON DELETE CASCADE,
+                    {item_columns}, extra BLOB
+                );
+                CREATE TABLE IF NOT EXISTS products (
+                    row_id INTEGER PRIMARY KEY,
+                    item_row INTEGER NOT NULL REFERENCES items(row_id) ON DELETE CASCADE,
+                    {product_columns}, extra BLOB
+                );
+                CREATE INDEX IF NOT EXISTS job_lots_lot_id ON job_lots(collection, lot_id);
+                CREATE INDEX IF NOT EXISTS job_lots_rating ON job_lots(collection, rating);
+                CREATE INDEX IF NOT EXISTS job_lots_created_on ON job_lots(collection, created_on);
+                CREATE INDEX IF NOT EXISTS job_lots_search ON job_lots(collection, search);
+                CREATE INDEX IF NOT EXISTS items_job_lot_row ON items(job_lot_row);
+                CREATE INDEX IF NOT EXISTS products_item_row ON products(item_row);
+            """)
+            # Fields added to the models since the database was created.
+            for table, fields in (("job_lots", self.JOB_LOT_FIELDS), ("items", self.ITEM_FIELDS), ("products", self.PRODUCT_FIELDS)):
+                existing = {row[1] for row in self.connection.execute(f"PRAGMA table_info({table})")}
+                for name in fields:
+                    if name not in existing:
+                        self.connection.execute(f'ALTER TABLE {table} ADD COLUMN "{name}"')
+
+
+    def write_object(self, filename, obj):
+        """
+        Replace a collection with `obj` (a job lot or list of job lots); other
+        paths are pickled as usual.
+        """
+        collection = self.COLLECTIONS.get(filename)
+        if collection is None:
+            return super().write_object(filename, obj)
+        try:
+            self.replace_collection(collection, obj if isinstance(obj, list) else [obj])
+        except Exception as ex:
+            print("Error during writing job lots:", ex)
+        self.rebuild_index(collection)
+
+
+    def replace_collection(self, collection, job_lots):
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM job_lots WHERE collection = ?", (collection,))
+            for job_lot in job_lots:
+                self.insert_job_lot(collection, job_lot)
+
+
+    def append_object(self, filename, obj):
+        collection = self.COLLECTIONS.get(filename)
+        if collection is None:
+            return super().append_object(filename, obj)
+        self.commit_objects(filename, obj if isinstance(obj, list) else [obj])
+
+
+    def commit_objects(self, filename, objs):
+        """
+        Append a batch of job lots to a collection in one transaction.
+
+        Returns:
+            bool: True if the batch was committed; False if it failed (the error
+            is printed and the collection is left unchanged).
+        """
+        collection = self.COLLECTIONS.get(filename)
+        if collection is None:
+            return super().commit_objects(filename, objs)
+        try:
+            with self.lock, self.connection:
+                for job_lot in objs:
+                    self.insert_job_lot(collection, job_lot)
+            return True
+        except Exception as ex:
+            print("Error during committing job lots:", ex)
+            return False
+
+
+    def remove_object(self, filename, obj_name):
+        """
+        Remove the job lots named `obj_name` (a name or list of names) from a
+        collection.
+        """
+        names = obj_name if isinstance(obj_name, list) else [obj_name]
+        self.remove_objects(filename, names=names)
+
+
+    def remove_objects(self, filename, names=None, ids=None, predicate=None):
+        """
+        Remove the job lots of a collection matching any of `names`, `ids` or
+        `predicate`, in one transaction. Only a `predicate` needs the lots loaded
+        (one at a time).
+        """
+        collection = self.COLLECTIONS.get(filename)
+        if collection is None:
+            return super().remove_objects(filename, names, ids, predicate)
+        names = list(set(names or ()))
+        ids = list({str(id) for id in ids or ()})
+        try:
+            row_ids = []
+            if predicate is not None:
+                with self.open_stream(filename) as stream:
+                    row_ids = [row_id for position, row_id in enumerate(stream.row_ids) if predicate(stream[position])]
+            with self.lock, self.connection:
+                removed = 0
+                for clause, values in (
+                    ("name IN", names),
+                    ("CAST(lot_id AS TEXT) IN", ids),
+                    ("row_id IN", row_ids),
+                ):
+                    for start in range(0, len(values), self.CHUNK_SIZE):
+                        chunk = values[start:start + self.CHUNK_SIZE]
+                        removed += self.connection.execute(
+                            f"DELETE FROM job_lots WHERE collection = ? AND {clause} ({', '.join('?' * len(chunk))})",
+                            [collection, *chunk],
+                        ).rowcount
+        except Exception as ex:
+            print("Error during removing job lots:", ex)
+            return 0
+        if removed:
+            self.rebuild_index(collection)
+        return removed
+
+
+    def rebuild_index(self, collection):
+        """
+        Rebuild the `JobLotIndex` after job lots were deleted from or replaced in
+        the "all" collection. The index only notices a changed pickle stream by
+        its modification time, which the database never touches; without this,
+        removed lots would still be reported as stored.
+        """
+        if collection != "all":
+            return
+        try:
+            JobLotIndex(file_handler=self).rebuild()
+        except Exception as ex:
+            print("Error during rebuilding job lot index:", ex)
+
+
+    def load_object(self, filename):
+        """
+        Load every job lot of a collection, in insertion order.
+        """
+        collection = self.COLLECTIONS.get(filename)
+        if collection is None:
+            return super().load_object(filename)
+        return self.query_job_lots("WHERE collection = ? ORDER BY row_id", (collection,))
+
+
+    def iter_objects(self, filename):
+        """
+        Yield the job lots of a collection in insertion order, loading
+        `ITER_BATCH_SIZE` lots at a time (see `iter_collection`).
+        """
+        collection = self.COLLECTIONS.get(filename)
+        if collection is None:
+            return super().iter_objects(filename)
+        return self.iter_collection(collection)
+
+
+    def iter_collection(self, collection):
+        """
+        Generator behind `iter_objects`. Lots are read by row id in batches, so
+        only one batch is in memory and the lock is only held while a batch is
+        queried, never while the caller consumes it. Lots added after iteration
+        started are not included, like a pickle stream read up to its length
+        when iteration started.
+        """
+        with self.lock:
+            (last_row,) = self.connection.execute(
+                "SELECT MAX(row_id) FROM job_lots WHERE collection = ?", (collection,)
+            ).fetchone()
+        row_id = 0
+        while last_row is not None and row_id < last_row:
+            rows = self.query_job_lots(
+                "WHERE collection = ? AND row_id > ? AND row_id <= ? ORDER BY row_id LIMIT ?",
+                (collection, row_id, last_row, self.ITER_BATCH_SIZE),
+                row_ids=True,
+            )
+            if not rows:
+                break
+            for row_id, job_lot in rows:
+                yield job_lot
+
+
+    def open_stream(self, filename):
+        """
+        Lazy sequence over a collection (see `SqliteStream`); other paths open
+        a `LazyPickleStream`.
+        """
+        collection = self.COLLECTIONS.get(filename)
+        if collection is None:
+            return super().open_stream(filename)
+        with self.lock:
+            row_ids = [row[0] for row in self.connection.execute(
+                "SELECT row_id FROM job_lots WHERE collection = ? ORDER BY row_id", (collection,)
+            )]
+        return SqliteStream(self, collection, row_ids)
+
+
+    def top_lots(self, limit=20, days=None, search=None, collection="all"):
+        """
+        The highest-rated job lots, optionally only those created in the last
+        `days` days and/or found by `search`. Only the returned lots are loaded.
+
+        Returns:
+            list[JobLot]: Up to `limit` lots, highest rating first.
+        """
+        conditions = ["collection = ?"]
+        parameters = [collection]
+        if days is not None:
+            conditions.append("created_on >= date('now', ?)")
+            parameters.append(f"-{days} days")
+        if search is not None:
+            conditions.append("search = ?")
+            parameters.append(search)
+        return self.query_job_lots(
+            f"WHERE {' AND '.join(conditions)} ORDER BY rating DESC LIMIT ?",
+            (*parameters, limit),
+        )
+
+
+    def find_job_lots(self, lot_id, collection="all"):
+        """
+        All stored versions of the lot with eBay item id `lot_id`.
+        """
+        return self.query_job_lots("WHERE collection = ? AND lot_id = ? ORDER BY row_id", (collection, lot_id))
+
+
+    def migrate(self, force=False):
+        """
+        One-shot copy of the pickle streams into the database.
+
+        A collection that already has rows is skipped unless `force` is set, in
+        which case it is replaced. Each collection is copied in one transaction;
+        an error aborts the migration and leaves that collection unchanged.
+
+        Returns:
+            dict[str, int]: Job lots migrated per collection.
+        """
+        migrated = {}
+        for filename, collection in self.COLLECTIONS.items():
+            with self.lock:
+                exists = self.connection.execute(
+                    "SELECT 1 FROM job_lots WHERE collection = ? LIMIT 1", (collection,)
+                ).fetchone()
+            if exists and not force:
+                continue
+            job_lots = super().load_object(filename)
+            self.replace_collection(collection, job_lots)
+            self.rebuild_index(collection)
+            migrated[collection] = len(job_lots)
+        return migrated
+
+
+    def insert_job_lot(self, collection, job_lot):
+        """
+        Insert one job lot with its items and products (caller holds the
+        transaction).
+        """
+        values, extra = self.split(job_lot, self.JOB_LOT_FIELDS, exclude=("id", "items"))
+        cursor = self.connection.execute(
+            f"INSERT INTO job_lots (collection, lot_id, {self.columns(self.JOB_LOT_FIELDS)}, created_on, extra) "
+            f"VALUES ({', '.join('?' * (len(values) + 4))})",
+            [collection, job_lot.id, *values, self.created_on(job_lot.date_created), extra],
+        )
+        job_lot_row = cursor.lastrowid
+        for item in job_lot.items:
+            values, extra = self.split(item, self.ITEM_FIELDS, exclude=("products",))
+            cursor = self.connection.execute(
+                f"INSERT INTO items (job_lot_row, {self.columns(self.ITEM_FIELDS)}, extra) "
+                f"VALUES ({', '.join('?' * (len(values) + 2))})",
+                [job_lot_row, *values, extra],
+            )
+            item_row = cursor.lastrowid
+            self.connection.executemany(
+                f"INSERT INTO products (item_row, {self.columns(self.PRODUCT_FIELDS)}, extra) "
+                f"VALUES ({', '.join('?' * (len(self.PRODUCT_FIELDS) + 2))})",
+                [[item_row, *values, extra] for values, extra in (self.split(product, self.PRODUCT_FIELDS) for product in item.products)],
+            )
+
+
+    def query_job_lots(self, clause, parameters, row_ids=False):
+        """
+        Load the job lots selected by `clause` (a WHERE/ORDER BY/LIMIT suffix),
+        then only their items and products. With `row_ids`, each lot comes back
+        as a (row id, job lot) pair.
+        """
+        with self.lock:
+            lot_rows = self.connection.execute(
+                f"SELECT row_id, lot_id, {self.columns(self.JOB_LOT_FIELDS)}, extra FROM job_lots {clause}", parameters
+            ).fetchall()
+            item_rows = self.child_rows("items", "job_lot_row", self.ITEM_FIELDS, [row[0] for row in lot_rows])
+            product_rows = self.child_rows("products", "item_row", self.PRODUCT_FIELDS, [row[0] for row in item_rows])
+
+        products = {}
+        for row_id, item_row, *values, extra in product_rows:
+            products.setdefault(item_row, []).append(self.build(Product, self.PRODUCT_FIELDS, values, extra))
+        items = {}
+        for row_id, job_lot_row, *values, extra in item_rows:
+            item = self.build(Item, self.ITEM_FIELDS, values, extra)
+            item.products = products.get(row_id, [])
+            items.setdefault(job_lot_row, []).append(item)
+        job_lots = []
+        for row_id, lot_id, *values, extra in lot_rows:
+            job_lot = self.build(JobLot, self.JOB_LOT_FIELDS, values, extra, id=lot_id)
+            job_lot.items = items.get(row_id, [])
+            job_lots.append((row_id, job_lot) if row_ids else job_lot)
+        return job_lots
+
+
+    def child_rows(self, table, parent_column, fields, parent_rows):
+        rows = []
+        for start in range(0, len(parent_rows), self.CHUNK_SIZE):
+            chunk = parent_rows[start:start + self.CHUNK_SIZE]
+            rows += self.connection.execute(
+                f"SELECT row_id, {parent_column}, {self.columns(fields)}, extra FROM {table} "
+                f"WHERE {parent_column} IN ({', '.join('?' * len(chunk))}) ORDER BY row_id",
+                chunk,
+            ).fetchall()
+        return rows
+
+
+    def build(self, cls, fields, values, extra, **known):
+        """
+        Rebuild a model object from its columns, restoring list fields from JSON
+        and legacy attributes from `extra`.
+        """
+        obj = cls.__new__(cls)
+        for name, value in zip(fields, values):
+            if name == "measurements" and value is not None:
+                value = json.loads(value)
+            setattr(obj, name, value)
+        for name, value in known.items():
+            setattr(obj, name, value)
+        if extra is not None:
+            for name, value in pickle.loads(extra).items():
+                setattr(obj, name, value)
+        return obj
+
+
+    @staticmethod
+    def columns(fields):
+        return ", ".join(f'"{name}"' for name in fields)
+
+
+    @staticmethod
+    def split(obj, fields, exclude=()):
+        """
+        Column values of `obj` for `fields`, plus everything that does not fit a
+        column pickled into one `extra` value (or None): attributes that are not
+        dataclass fields, and field values that are not plain scalars (e.g. a
+        legacy lot whose `condition` holds a list of items). `measurements` is
+        stored as JSON.
+        """
+        extra = {name: value for name, value in vars(obj).items() if name not in fields and name not in exclude}
+        values = []
+        for name in fields:
+            value = getattr(obj, name, None)
+            if name == "measurements" and isinstance(value, list):
+                try:
+                    value = json.dumps(value)
+                except TypeError:
+                    extra[name], value = value, None
+            elif not isinstance(value, (str, int, float, bytes, type(None))):
+                extra[name], value = value, None
+            values.append(value)
+        return values, (pickle.dumps(extra, protocol=pickle.HIGHEST_PROTOCOL) if extra else None)
+
+
+    @staticmethod
+    def created_on(date_created):
+        """
+        `date_created` ("DD_MM_YYYY") as an ISO date, so it sorts and compares.
+        """
+        try:
+            return datetime.strptime(date_created, "%d_%m_%Y").date().isoformat()
+        except (TypeError, ValueError):
+            return None
+
+
+class SqliteStream(Sequence):
+    """
+    `LazyPickleStream` counterpart for a SQLite collection: holds only the
+    collection's row ids and loads a job lot when it is accessed.
+    """
+
+    def __init__(self, file_handler, collection, row_ids):
+        self.file_handler = file_handler
+        self.collection = collection
+        self.row_ids = row_ids
+
+
+    def __len__(self):
+        return len(self.row_ids)
+
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        return self.file_handler.query_job_lots("WHERE row_id = ?", (self.row_ids[position],))[0]
+
+
+    def find(self, id):
+        return self.file_handler.find_job_lots(id, self.collection)
+
+
+    def close(self):
+        pass
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+if __name__ == "__main__":
+    import time
+
+    file_handler = SqliteFileHandler()
+    print(f"Migrated: {file_handler.migrate()}")
+
+    start = time.perf_counter()
+    pickled = FileHandler.load_object(file_handler, "./Operations/all_job_lots.pkl")
+    top_pickled = sorted(pickled, key=lambda job_lot: job_lot.rating, reverse=True)[:20]
+    pickle_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    top = file_handler.top_lots(20)
+    sqlite_seconds = time.perf_counter() - start
+
+    print(f"Top 20 by rating: pickle {pickle_seconds:.3f}s, SQLite {sqlite_seconds:.3f}s")
+    for job_lot in file_handler.top_lots(20, days=7):
+        print(job_lot)
@@ -15,6 +15,10 @@ class TokenSet:
     original_brand_name_raw: str = ""
     original_brand_name_normalized: str = ""
 
+    # Numbers, words and single symbols, each with its trailing whitespace.
+    # Anything else (e.g. '_') separates tokens but is not part of one.
+    TOKEN_PATTERN = r'\d+(?:\.\d+)?\s*|[^\W\d_]+\s*|[^\w\s]\s*'
+
 
     def __init__(self, good: str):
         self.good = good
@@ -48,7 +52,7 @@ class TokenSet:
         Returns:
             tuple[list[str], list[str]]: (raw_tokens, normalized_tokens_without_decimals)
         """
-        pattern = r'\d+(?:\.\d+)?\s*|[^\W\d_]+\s*|[^\w\s]\s*'
+        pattern = self.TOKEN_PATTERN
         tokens_raw = re.findall(pattern, good.variant_name)
         tokens_normalized = []
         for token in tokens_raw:
@@ -82,7 +86,7 @@ class TokenSet:
         Returns:
             tuple[list[str], list[str]]: (raw_tokens, normalized_tokens_without_decimals)
         """
-        pattern = r'\d+(?:\.\d+)?\s*|[^\W\d_]+\s*|[^\w\s]\s*'
+        pattern = self.TOKEN_PATTERN
         tokens_raw = re.findall(pattern, good.brand_name)
         tokens_normalized = []
         for token in tokens_raw:
@@ -112,7 +116,7 @@ class TokenSet:
         Returns:
             tuple[list[str], list[str]]: (raw_tokens, normalized_tokens_without_decimals)
         """
-        pattern = r'\d+(?:\.\d+)?\s*|[^\W\d_]+\s*|[^\w\s]\s*'
+        pattern = self.TOKEN_PATTERN
         tokens_raw = re.findall(pattern, good.original_variant_name)
         tokens_normalized = []
         for token in tokens_raw:
@@ -142,7 +146,7 @@ class TokenSet:
         Returns:
             tuple[list[str], list[str]]: (raw_tokens, normalized_tokens_without_decimals)
         """
-        pattern = r'\d+(?:\.\d+)?\s*|[^\W\d_]+\s*|[^\w\s]\s*'
+        pattern = self.TOKEN_PATTERN
         tokens_raw = re.findall(pattern, good.original_brand_name)
         tokens_normalized = []
         for token in tokens_raw:
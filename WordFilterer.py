@@ -34,11 +34,14 @@ Behavioral notes
   be a concatenated string without spaces; this mirrors the original logic.
 - Per-token POS is computed by running `nlp()` on the token string and taking
   the first token in the returned Doc.
+- POS tags are memoized per token string in `WordFilterer.TAG_CACHE`, which is
+  shared by every instance, so each distinct token only goes through `nlp()`
+  once per process.
 
 Caveats
 -------
-- Repeatedly calling `nlp()` on single tokens can be relatively expensive; this
-  module preserves that behavior to avoid changing runtime semantics.
+- Calling `nlp()` on single tokens is relatively expensive; the tag cache keeps
+  the per-token semantics while avoiding repeated calls.
 - The demo under `if __name__ == "__main__":` calls `filter_product` without the
   required `filters` argument; it will raise a `TypeError` if executed as-is.
   This is left unchanged intentionally per the “no code changes” requirement.
@@ -46,6 +49,7 @@ Caveats
 
 import spacy
 import re
+import threading
 from Product import Product
 from Item import Item
 from TokenSet import TokenSet
@@ -60,6 +64,11 @@ class WordFilterer:
     using unit/number whitelists and spaCy POS-based allowlists.
     """
 
+    # token string -> spaCy POS tag (or None), shared across instances.
+    TAG_CACHE = {}
+    # spaCy pipelines are not documented as thread-safe, so tagging is serialized.
+    TAG_LOCK = threading.Lock()
+
     def __init__(self):
         """
         Initialize helpers.
@@ -107,14 +116,12 @@ class WordFilterer:
             if token_lower in ["for", "with"] or (token_lower in self.unit_convertor.get_units()) or len(numbers_in_token) > 0:
                 updated_tokens.append(token)
                 continue
-            token_lower_nlp = (nlp(token_lower))
-            token_lower_nlp = token_lower_nlp[0] if token_lower_nlp else None
-            if (token_lower_nlp and token_lower_nlp.pos_ in filters):
+            if self.get_tag(token_lower) in filters:
                 updated_tokens.append(token)
 
         item.variant_name = "".join(updated_tokens)
 
-    def filter_product(self, item, product, filters):
+    def filter_product(self, item, product, filters, product_token_set=None):
         """
         Filter `product.variant_name` tokens and rewrite `product.variant_name`.
 
@@ -131,6 +138,8 @@ class WordFilterer:
             Target object whose `variant_name` will be filtered and rewritten.
         filters : Iterable[str]
             POS tags to allow (spaCy `Token.pos_` values).
+        product_token_set : TokenSet | None
+            Precomputed tokens of `product`; tokenized here when omitted.
 
         Side Effects
         ------------
@@ -142,7 +151,8 @@ class WordFilterer:
         - Tokens with digits and recognized units are always kept.
         - POS filtering applies only after the whitelist checks.
         """
-        product_token_set = TokenSet(good=product)
+        if product_token_set is None:
+            product_token_set = TokenSet(good=product)
         updated_tokens = []
         for i in range(len(product_token_set.variant_name_raw)):
             token = product_token_set.variant_name_raw[i]
@@ -151,9 +161,7 @@ class WordFilterer:
             if token_lower in ["for", "with"] or (token_lower in item.variant_name.lower()) or (token_lower in self.unit_convertor.get_units()) or len(numbers_in_token) > 0:
                 updated_tokens.append(token)
                 continue
-            token_lower_nlp = (nlp(token_lower))
-            token_lower_nlp = token_lower_nlp[0] if token_lower_nlp else None
-            if (token_lower_nlp and token_lower_nlp.pos_ in filters):
+            if self.get_tag(token_lower) in filters:
                 updated_tokens.append(token)
         product.variant_name = "".join(updated_tokens)
     
@@ -174,8 +182,7 @@ class WordFilterer:
         """
         if not word:
             return False
-        token = nlp(word)[0]
-        if token.pos_ in key_filters:
+        if self.get_tag(word) in key_filters:
             return True
         return False
     
@@ -196,8 +203,12 @@ class WordFilterer:
         """
         if not word:
             return None
-        token = nlp(word)[0]
-        return token.pos_
+        if word not in self.TAG_CACHE:
+            with self.TAG_LOCK:
+                if word not in self.TAG_CACHE:
+                    doc = nlp(word)
+                    self.TAG_CACHE[word] = doc[0].pos_ if doc else None
+        return self.TAG_CACHE[word]
 
 if __name__ == "__main__":
     # Example usage (left unchanged):
@@ -0,0 +1,57 @@
+"""
+Shared setup for the tests.
+
+The modules live flat in the repository root and keep their stores under
+./Operations relative to the working directory, so tests that write a store run
+from an empty directory (`store`). Tests that replay recorded data read the
+job lots committed in ./Operations/all_job_lots.pkl.
+"""
+
+import os
+import pickle
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# EbayRequestHandler and ItemNameExtractor check their credentials on import or
+# construction; no test talks to eBay or OpenAI.
+for name in ("EBAY_PROD_CLIENT_ID", "EBAY_PROD_CLIENT_SECRET", "EBAY_OAUTH_TOKEN", "OPENAI_API_KEY"):
+    os.environ.setdefault(name, "test")
+
+RECORDED_STORE = os.path.join(ROOT, "Operations", "all_job_lots.pkl")
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """
+    Run the test from an empty directory, with no loaded job lot index.
+    """
+    from JobLotIndex import JobLotIndex
+
+    monkeypatch.chdir(tmp_path)
+    JobLotIndex.loaded.clear()
+    JobLotIndex.read_to.clear()
+    JobLotIndex.covers.clear()
+    yield tmp_path
+    JobLotIndex.loaded.clear()
+    JobLotIndex.read_to.clear()
+    JobLotIndex.covers.clear()
+
+
+@pytest.fixture(scope="session")
+def recorded_job_lots():
+    job_lots = []
+    with open(RECORDED_STORE, "rb") as f:
+        while True:
+            try:
+                job_lots.append(pickle.load(f))
+            except EOFError:
+                break
+    return job_lots
+
+
+@pytest.fixture(scope="session")
+def recorded_items(recorded_job_lots):
+    return [item for job_lot in recorded_job_lots for item in job_lot.items]
@@ -0,0 +1,99 @@
+import EbayJobLotsCreator as module
+from JobLot import JobLot
+
+
+class FakeRequestHandler:
+
+    def __init__(self, lots, page_size=None):
+        self.lots = lots
+        self.page_size = page_size or len(lots) or 1
+        self.pages_requested = 0
+
+
+    def iter_lots(self, parameter, filters=None, page_size=50, max_results=None):
+        lots = self.lots[:max_results]
+        for start in range(0, len(lots), self.page_size):
+            self.pages_requested += 1
+            yield from lots[start:start + self.page_size]
+
+
+class FakeCurrencyConverter:
+
+    def convert(self, value, currency):
+        return float(value)
+
+
+def listing(number, created):
+    return {
+        "itemId": f"v1|{number}|0",
+        "title": f"job lot {number}",
+        "price": {"value": "10.00", "currency": "GBP"},
+        "shippingOptions": [{"shippingCost": {"value": "1.00", "currency": "GBP"}}],
+        "itemCreationDate": created,
+    }
+
+
+def make_creator(monkeypatch, lots, failing=(), page_size=None):
+    monkeypatch.setattr(module, "EbayRequestHandler", lambda: FakeRequestHandler(lots, page_size))
+    creator = module.EbayJobLotsCreator()
+    creator.currency_converter = FakeCurrencyConverter()
+
+    def fetch_details(lot):
+        if lot["itemId"] in failing:
+            raise Exception("description unavailable")
+        # Priced so its index key matches the one `filter_new` checks.
+        job_lot = JobLot(
+            "ebay", lot["itemId"], lot["title"], "url",
+            buy_listing_price=10.0, postage_price=1.0, rating=1.0, accuracy_score=1.0,
+        )
+        job_lot.search = lot["search"]
+        return job_lot, None
+
+    creator.fetch_details = fetch_details
+    creator.extract_items = lambda lot_and_image: lot_and_image[0]
+    creator.price_items = lambda job_lot, lot_processor=None: job_lot
+    return creator
+
+
+LOTS = [
+    listing(3, "2026-10-03T00:00:00.000Z"),
+    listing(2, "2026-10-02T00:00:00.000Z"),
+    listing(1, "2026-10-01T00:00:00.000Z"),
+]
+
+
+def test_watermark_advances_to_newest_persisted_lot(store, monkeypatch):
+    creator = make_creator(monkeypatch, LOTS)
+    creator.file_handler.update_search_watermarks({"lipstick": "2026-09-01T00:00:00.000Z"})
+
+    creator.create_pipeline(["lipstick"], incremental=True)
+
+    assert creator.file_handler.get_search_watermarks() == {"lipstick": "2026-10-03T00:00:00.000Z"}
+
+
+def test_watermark_held_back_to_lot_dropped_by_failing_stage(store, monkeypatch):
+    creator = make_creator(monkeypatch, LOTS, failing={"v1|2|0"})
+    creator.file_handler.update_search_watermarks({"lipstick": "2026-09-01T00:00:00.000Z"})
+
+    creator.create_pipeline(["lipstick"], incremental=True)
+
+    assert creator.file_handler.get_search_watermarks() == {"lipstick": "2026-10-02T00:00:00.000Z"}
+    assert sorted(job_lot.id for job_lot in creator.file_handler.load_object("./Operations/all_job_lots.pkl")) == ["v1|1|0", "v1|3|0"]
+
+    # The next run finds the dropped lot again; the stored ones are skipped.
+    rerun = make_creator(monkeypatch, LOTS[:2])
+    assert [lot["itemId"] for lot in rerun.discover_new("lipstick")] == ["v1|2|0"]
+
+
+def test_discover_new_yields_lots_as_pages_arrive(store, monkeypatch):
+    creator = make_creator(monkeypatch, LOTS, page_size=1)
+    creator.file_handler.update_search_watermarks({"lipstick": "2026-09-01T00:00:00.000Z"})
+
+    lots = creator.discover_new("lipstick")
+    assert next(lots)["itemId"] == "v1|3|0"
+    assert creator.ebay_request_handler.pages_requested == 1
+    assert creator.pending_watermarks == {}
+
+    # The watermark is only moved once the search has been read to the end.
+    assert [lot["itemId"] for lot in lots] == ["v1|2|0", "v1|1|0"]
+    assert creator.pending_watermarks == {"lipstick": "2026-10-03T00:00:00.000Z"}
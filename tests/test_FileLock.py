@@ -0,0 +1,34 @@
+import threading
+from FileHandler import FileHandler
+from FileLock import stress_test
+
+
+def test_concurrent_writer_processes_store_each_lot_once():
+    result = stress_test(workers=4, lots=60)
+
+    assert result["failed_workers"] == 0
+    for stream in ("all_job_lots.pkl", "working_job_lots.pkl", "job_lot_index.pkl"):
+        assert result[stream]["duplicates"] == 0, stream
+        assert result[stream]["missing"] == 0, stream
+
+
+def test_iter_objects_does_not_block_writers_while_consumed(store):
+    file_handler = FileHandler()
+    filename = "./Operations/working_job_lots.pkl"
+    file_handler.write_object(filename, [1, 2, 3])
+
+    objects = file_handler.iter_objects(filename)
+    assert next(objects) == 1
+
+    # Another thread writes while the generator is suspended mid-stream.
+    writer = threading.Thread(target=lambda: (
+        file_handler.commit_objects(filename, [4]),
+        file_handler.write_object(filename, [5]),
+    ))
+    writer.start()
+    writer.join(timeout=10)
+    assert not writer.is_alive()
+
+    # The reader finishes the stream as it was when iteration started.
+    assert list(objects) == [2, 3]
+    assert list(file_handler.iter_objects(filename)) == [5]
@@ -0,0 +1,56 @@
+from Item import Item
+from ItemProcessor import ItemProcessor
+
+
+class FakeRequestHandler:
+
+    def __init__(self, results):
+        self.results = results
+        self.searches = []
+
+
+    def iter_items(self, name, params=None, page_size=50, max_results=None):
+        self.searches.append((name, params, max_results))
+        yield from self.results[:max_results]
+
+
+def listing(number):
+    return {"itemId": f"v1|{number}|0", "title": f"Rose Body Butter {number}"}
+
+
+def params():
+    return {
+        "filter": "filter=",
+        "buyingOptions": "buyingOptions:{FIXED_PRICE}",
+        "conditions": "conditions:{NEW}",
+        "deliveryCountry": "deliveryCountry:GB",
+        "itemLocationCountry": "itemLocationCountry:GB",
+    }
+
+
+def test_fetch_listings_takes_max_listings_per_search():
+    handler = FakeRequestHandler([listing(number) for number in range(60)])
+    item_processor = ItemProcessor(ebay_request_handler=handler)
+    item_processor.MAX_LISTINGS = 25
+    item = Item("Rose Body Butter", brand_name="Rose", variant_name="Body Butter", quantity=1)
+
+    listings = item_processor.fetch_listings(item, params())
+
+    assert len(listings) == 25
+    assert handler.searches == [(
+        "q=Rose Body Butter",
+        "filter=,buyingOptions:{FIXED_PRICE},conditions:{NEW},deliveryCountry:GB,itemLocationCountry:GB",
+        25,
+    )]
+
+
+def test_fetch_listings_widens_a_search_with_few_results():
+    handler = FakeRequestHandler([listing(1)])
+    item = Item("Rose Body Butter", brand_name="Rose", variant_name="Body Butter", quantity=1)
+
+    listings = ItemProcessor(ebay_request_handler=handler).fetch_listings(item, params())
+
+    # One listing per search: the third search brings the total to 3, so the fourth is skipped.
+    assert len(handler.searches) == 3
+    assert len(listings) == 3
+    assert all(max_results == ItemProcessor.MAX_LISTINGS for _, _, max_results in handler.searches)
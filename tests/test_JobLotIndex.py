@@ -0,0 +1,59 @@
+from FileHandler import FileHandler
+from JobLot import JobLot
+from JobLotIndex import JobLotIndex
+
+STORE = "./Operations/all_job_lots.pkl"
+
+
+def job_lot(number):
+    return JobLot("Job Lot", f"v1|{number}|0", f"Lot {number}", "", buy_listing_price=10.0, postage_price=1.0)
+
+
+def new_process():
+    JobLotIndex.loaded.clear()
+    JobLotIndex.read_to.clear()
+    JobLotIndex.covers.clear()
+
+
+def count_rebuilds(monkeypatch):
+    rebuilds = []
+    read_store = JobLotIndex.read_store
+    monkeypatch.setattr(JobLotIndex, "read_store", lambda self: rebuilds.append(1) or read_store(self))
+    return rebuilds
+
+
+def test_appended_lots_are_indexed_without_a_rebuild(store, monkeypatch):
+    file_handler = FileHandler()
+    file_handler.commit_objects(STORE, [job_lot(1), job_lot(2)])
+    assert JobLotIndex().contains("v1|1|0", 10.0, 1.0)
+
+    # Commits that add no keys, and lots appended by a process that did not
+    # record them, only cost a read of the new tail.
+    rebuilds = count_rebuilds(monkeypatch)
+    file_handler.commit_objects(STORE, [])
+    file_handler.commit_objects(STORE, [job_lot(3)])
+    new_process()
+    index = JobLotIndex()
+    assert index.contains("v1|3|0", 10.0, 1.0)
+    assert len(index.keys) == 3
+
+    file_handler.commit_objects(STORE, [job_lot(4)])
+    assert ("v1|4|0", 10.0, 1.0) in index.refresh()
+    new_process()
+    assert len(JobLotIndex().keys) == 4
+    assert rebuilds == []
+
+
+def test_rewritten_store_rebuilds_the_index(store, monkeypatch):
+    file_handler = FileHandler()
+    file_handler.commit_objects(STORE, [job_lot(1), job_lot(2), job_lot(3)])
+    index = JobLotIndex()
+    assert len(index.keys) == 3
+
+    rebuilds = count_rebuilds(monkeypatch)
+    file_handler.remove_object(STORE, "Lot 2")
+    assert not ("v1|2|0", 10.0, 1.0) in index.refresh()
+    assert len(rebuilds) == 1
+    new_process()
+    assert len(JobLotIndex().keys) == 2
+    assert len(rebuilds) == 1
@@ -0,0 +1,42 @@
+import threading
+from Pipeline import Pipeline, Stage
+
+
+def test_fan_out_outputs_move_on_while_the_generator_runs():
+    first_done = threading.Event()
+
+    def split(n):
+        yield 0
+        # Only reached once the next stage has handled the first output.
+        assert first_done.wait(timeout=5)
+        yield from range(1, n)
+
+    def square(n):
+        if n == 0:
+            first_done.set()
+        return n * n
+
+    pipeline = Pipeline([
+        Stage("split", split, fan_out=True),
+        Stage("square", square, concurrency=2),
+    ])
+    results = pipeline.run([4])
+
+    assert sorted(results) == [0, 1, 4, 9]
+    assert pipeline.report()[0]["failed"] == 0
+
+
+def test_failing_fan_out_keeps_outputs_already_yielded():
+    def pages(n):
+        yield from range(n)
+        raise Exception("page 2 failed")
+
+    pipeline = Pipeline([
+        Stage("pages", pages, fan_out=True),
+        Stage("keep", lambda n: n),
+    ])
+    results = pipeline.run([3])
+
+    assert sorted(results) == [0, 1, 2]
+    split = pipeline.report()[0]
+    assert (split["processed"], split["failed"], split["emitted"]) == (1, 1, 3)
@@ -0,0 +1,8 @@
+from ProductCalculator import compare_no_match_batch
+
+
+def test_no_match_batch_scores_like_scalar(recorded_items):
+    report = compare_no_match_batch(recorded_items)
+
+    assert report["products"] > 0
+    assert report["mismatches"] == 0
@@ -0,0 +1,37 @@
+import pytest
+from Item import Item
+from Product import Product
+from ProductCleaner import ProductCleaner
+
+
+# Listing variant names -> (pack divisor, variant name with the quantity words
+# removed), scanned against a "Body Butter 50ml" item.
+QUANTITY_CASES = [
+    ("2 x 3 pack shampoo", 3, "shampoo"),
+    ("12 Pack Of 3 x 10ml", 3, ""),
+    ("5 x 2 pack face wipes", 5, "face wipes"),
+    ("2 pack of 6 masks", 6, "masks"),
+    ("Pack of 2 x 50ml cream", 2, "cream"),
+    ("6 pack x 50ml shower gel", 6, "shower gel"),
+    ("Shower gel 6 pack", 6, "Shower gel"),
+    ("Hand cream x 3", 3, "Hand cream"),
+    ("3 Lip Gloss", 3, "Lip Gloss"),
+    ("Body Butter 50ml", 1, "Body Butter 50ml"),
+    ("Rose Body Butter 200ml Pack of 1", 1, "Rose Body Butter 200ml"),
+    # Names without a quantity are left exactly as they were.
+    (
+        "Lustreglass_Lipstick_Lipglass_Spite_Dare You_Warm Teddy_540_565_Fire Roasted", 1,
+        "Lustreglass_Lipstick_Lipglass_Spite_Dare You_Warm Teddy_540_565_Fire Roasted",
+    ),
+    ("Gift_Set 6 pack_Travel", 6, "Gift_Set  _Travel"),
+]
+
+
+@pytest.mark.parametrize("variant_name, divisor, name", QUANTITY_CASES)
+def test_adjust_quantities(variant_name, divisor, name):
+    item = Item("Body Butter 50ml", brand_name="brand", variant_name="Body Butter 50ml", quantity=1)
+    product = Product(variant_name, "", variant_name=variant_name)
+
+    got_divisor = ProductCleaner().adjust_quantities(item, product)
+
+    assert (got_divisor, product.variant_name) == (divisor, name)
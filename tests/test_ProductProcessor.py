@@ -0,0 +1,9 @@
+from ProductProcessor import ProductProcessor, compare_early_exit
+
+
+def test_early_exit_scores_like_full_scoring(recorded_items):
+    recorded_pairs = [(item, product) for item in recorded_items for product in item.products]
+    report = compare_early_exit(recorded_pairs[:500])
+
+    assert report["early_exits"] > 0
+    assert report["max_drift"] <= ProductProcessor.EARLY_EXIT_MAX_DEVIATION
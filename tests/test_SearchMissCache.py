@@ -0,0 +1,53 @@
+import os
+from collections import defaultdict
+from datetime import date
+from Item import Item
+from Product import Product
+from SearchMissCache import SearchMissCache
+
+
+def item(accuracies=(), sell_price=0.0):
+    item = Item("Rose Body Butter 200ml", brand_name="Rose", variant_name="Body Butter 200ml", quantity=1, sell_price=sell_price)
+    item.products = [Product(f"listing {n}", f"https://www.ebay.co.uk/itm/{n}", accuracy_score=accuracy) for n, accuracy in enumerate(accuracies)]
+    return item
+
+
+def test_only_empty_or_unrelated_searches_are_misses():
+    assert SearchMissCache.missed(item())
+    assert SearchMissCache.missed(item([0, 0.0, 0]))
+    # Low scores still price the item, so the search was not a miss.
+    assert not SearchMissCache.missed(item([0.6]))
+    assert not SearchMissCache.missed(item([0, 0], sell_price=5.67))
+
+
+def test_full_search_records_a_miss_and_a_priced_search_clears_it(store):
+    cache = SearchMissCache()
+    today = date(2026, 10, 18)
+    key = cache.key(item())
+
+    cache.record(item([0.6]), day=today)
+    cache.searched(key, 4)
+    cache.record(item([0.6]), day=today)
+    assert not cache.is_miss(key, today=today)
+
+    cache.searched(key, 4)
+    cache.record(item([0]), day=today)
+    assert cache.is_miss(key, today=today)
+    assert cache.stats["calls_avoided"] == 3
+
+    cache.record(item([0.6]), day=today)
+    assert not cache.is_miss(key, today=today)
+    assert not os.path.exists(f"{cache.cache_path}.tmp")
+
+
+def test_no_false_misses_on_recorded_items(recorded_items):
+    searches = defaultdict(list)
+    for recorded in recorded_items:
+        searches[SearchMissCache.key(recorded)].append(recorded)
+    misses = {key for key, items in searches.items() if any(map(SearchMissCache.missed, items))}
+
+    # A false miss is a key recorded as a miss that a search did price, either
+    # the same search or another search of the same key.
+    false_misses = {key for key in misses if any(recorded.sell_price > 0 for recorded in searches[key])}
+    assert len(misses) > len(searches) // 4
+    assert false_misses == set()
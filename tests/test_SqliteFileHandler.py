@@ -0,0 +1,30 @@
+from SqliteFileHandler import SqliteFileHandler
+
+ALL = "./Operations/all_job_lots.pkl"
+
+
+def test_iter_objects_loads_one_batch_at_a_time(store, recorded_job_lots, monkeypatch):
+    file_handler = SqliteFileHandler()
+    file_handler.commit_objects(ALL, recorded_job_lots[:5])
+    monkeypatch.setattr(file_handler, "ITER_BATCH_SIZE", 2)
+
+    queries = []
+    query_job_lots = file_handler.query_job_lots
+    monkeypatch.setattr(file_handler, "query_job_lots", lambda *args, **kwargs: queries.append(args) or query_job_lots(*args, **kwargs))
+
+    job_lots = file_handler.iter_objects(ALL)
+    first = next(job_lots)
+    assert len(queries) == 1
+    assert str(first.id) == str(recorded_job_lots[0].id)
+    assert len(first.items) == len(recorded_job_lots[0].items)
+
+    # Lots committed while iterating are left for the next read.
+    file_handler.commit_objects(ALL, recorded_job_lots[5:6])
+    rest = list(job_lots)
+    assert [str(job_lot.id) for job_lot in rest] == [str(job_lot.id) for job_lot in recorded_job_lots[1:5]]
+    assert len(queries) == 3
+    assert len(list(file_handler.iter_objects(ALL))) == 6
+
+
+def test_iter_objects_of_empty_collection(store):
+    assert list(SqliteFileHandler().iter_objects(ALL)) == []